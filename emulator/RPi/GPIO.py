@@ -0,0 +1,44 @@
+"""
+라즈베리파이 없이 실행하기 위한 RPi.GPIO 모듈 대체입니다. (PYTHONPATH=emulator)
+
+GPIO 동작은 sensors/fake_gpio.py 를 그대로 사용하며, HC_SR04_PINS 의 (TRIG, ECHO) 핀마다
+가상 HC-SR04 를 연결합니다. ECHO 펄스 길이는 sensor_traces 로 생성한 거리 시계열을
+경과 시간에 맞춰 사용하므로 실제 센서와 같은 시간이 걸립니다.
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'sensors'))
+from fake_gpio import *  # noqa: F401,F403
+from fake_gpio import attach_hc_sr04
+from sensor_traces import generate_hc_sr04_trace
+
+
+# 가상 HC-SR04 를 연결할 (TRIG, ECHO) 핀 (hc_sr04_gspread.py 와 samples/hc_sr04_analysis.py 의 배선)
+HC_SR04_PINS = [(27, 17), (17, 27)]
+
+HC_SR04_TRACE_SECONDS = 24 * 60 * 60
+HC_SR04_TRACE_PERIOD  = 0.5      # 거리 시계열의 시간 간격 (초)
+HC_SR04_DROPOUT_RATE  = 0.02     # 반사파가 없는 측정의 비율 (ECHO 가 38ms 동안 HIGH)
+HC_SR04_ANOMALY_RATE  = 0.002    # 급격한 거리 변화가 시작될 확률
+EMULATOR_SEED         = int(os.environ.get('EMULATOR_SEED', '0'))
+
+
+def _distance_source(seed):
+    trace = generate_hc_sr04_trace(HC_SR04_TRACE_SECONDS, period=HC_SR04_TRACE_PERIOD, seed=seed,
+                                   dropout_rate=HC_SR04_DROPOUT_RATE, anomaly_rate=HC_SR04_ANOMALY_RATE,
+                                   anomaly_length=6)
+    distances = trace['distance'].tolist()
+    start = time.monotonic()
+
+    def distance():
+        index = int((time.monotonic() - start) / HC_SR04_TRACE_PERIOD) % len(distances)
+        value = distances[index]
+        # NaN(dropout) 이면 물체 없음
+        return None if value != value else value
+    return distance
+
+
+for _number, (_trigger, _echo) in enumerate(HC_SR04_PINS):
+    attach_hc_sr04(_trigger, _echo, _distance_source(EMULATOR_SEED + _number))
@@ -0,0 +1,89 @@
+"""
+라즈베리파이 없이 실행하기 위한 adafruit_dht 모듈 대체입니다. (PYTHONPATH=emulator)
+
+실제 라이브러리처럼 temperature / humidity 를 읽을 때 measure() 를 호출하며,
+- 한 번 읽는 데 DHT11 약 23ms (시작 신호 18ms + 데이터 40비트), DHT22 약 6ms 가 걸리고
+- DHT_FAILURE_RATE 확률로 RuntimeError 가 발생하며
+- 실제 라이브러리처럼 모델과 상관없이 마지막 읽기 후 2초 안에 다시 읽으면
+  센서를 읽지 않고 이전 값을 그대로 돌려줍니다. (_last_called 도 바뀌지 않음)
+값은 sensor_traces 로 생성한 하루 주기의 온습도 시계열을 경과 시간에 맞춰 사용합니다.
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sensors'))
+from sensor_traces import generate_dht11_trace
+
+
+DHT_FAILURE_RATE  = 0.15     # 읽기 실패 확률 (실제 DHT11 은 10~20% 정도)
+DHT_TRACE_SECONDS = 24 * 60 * 60
+EMULATOR_SEED     = int(os.environ.get('EMULATOR_SEED', '0'))
+
+FAILURE_MESSAGES = (
+    "Checksum did not validate. Try again.",
+    "A full buffer was not returned. Try again.",
+    "Received unplausible data. Try again.",
+)
+
+
+class DHTBase:
+    min_interval = 2.0
+    read_seconds = 0.006
+    quantize = False
+
+    def __init__(self, pin, use_pulseio=True):
+        self.pin = pin
+        self._temperature = None
+        self._humidity = None
+        self._last_called = 0
+        self._random = random.Random(EMULATOR_SEED + getattr(pin, 'id', 0))
+        trace = generate_dht11_trace(DHT_TRACE_SECONDS, period=1.0, seed=EMULATOR_SEED,
+                                     quantize=self.quantize)
+        self._trace_temperature = trace['temperature'].tolist()
+        self._trace_humidity = trace['humidity'].tolist()
+        self._start = time.monotonic()
+
+    def measure(self):
+        now = time.monotonic()
+        # 최소 간격 안에서는 이전 값을 그대로 사용 (센서를 읽지 않음)
+        if self._last_called and now - self._last_called < self.min_interval:
+            return
+        self._last_called = now
+        time.sleep(self.read_seconds)
+        if self._random.random() < DHT_FAILURE_RATE:
+            raise RuntimeError(self._random.choice(FAILURE_MESSAGES))
+        index = int(now - self._start) % len(self._trace_temperature)
+        if self.quantize:
+            self._temperature = int(self._trace_temperature[index])
+            self._humidity = int(self._trace_humidity[index])
+        else:
+            self._temperature = round(self._trace_temperature[index], 1)
+            self._humidity = round(self._trace_humidity[index], 1)
+
+    @property
+    def temperature(self):
+        self.measure()
+        return self._temperature
+
+    @property
+    def humidity(self):
+        self.measure()
+        return self._humidity
+
+    def exit(self):
+        pass
+
+
+class DHT11(DHTBase):
+    read_seconds = 0.023
+    quantize = True
+
+
+class DHT22(DHTBase):
+    read_seconds = 0.006
+
+
+class DHT21(DHT22):
+    pass
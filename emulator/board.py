@@ -0,0 +1,53 @@
+"""
+라즈베리파이 없이 실행하기 위한 board 모듈 대체입니다. (PYTHONPATH=emulator)
+"""
+
+
+class Pin:
+    def __init__(self, bcm_id):
+        self.id = bcm_id
+
+    def __repr__(self):
+        return f"board.D{self.id}"
+
+
+# BCM 번호
+D0 = Pin(0)
+D1 = Pin(1)
+D2 = Pin(2)
+D3 = Pin(3)
+D4 = Pin(4)
+D5 = Pin(5)
+D6 = Pin(6)
+D7 = Pin(7)
+D8 = Pin(8)
+D9 = Pin(9)
+D10 = Pin(10)
+D11 = Pin(11)
+D12 = Pin(12)
+D13 = Pin(13)
+D14 = Pin(14)
+D15 = Pin(15)
+D16 = Pin(16)
+D17 = Pin(17)
+D18 = Pin(18)
+D19 = Pin(19)
+D20 = Pin(20)
+D21 = Pin(21)
+D22 = Pin(22)
+D23 = Pin(23)
+D24 = Pin(24)
+D25 = Pin(25)
+D26 = Pin(26)
+D27 = Pin(27)
+
+SDA  = D2
+SCL  = D3
+MOSI = D10
+MISO = D9
+SCLK = D11
+SCK  = D11
+TXD  = D14
+RXD  = D15
+
+board_id = 'RASPBERRY_PI_4B_EMULATOR'
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+dht11_analysis 의 다음 온도 예측: 매 샘플 LinearRegression 재학습 vs OnlineLinearRegression 비교
+
+    cd samples
+    python bench_regression.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sensors'))
+from sensor_traces import generate_dht11_trace
+from online_regression import OnlineLinearRegression
+
+
+# 벤치마크 설정
+BENCH_SAMPLES    = 20000               # 생성할 샘플 수 (2초 간격 기준 약 11시간)
+BENCH_CHECKS     = (1000, 5000, 20000)  # 이 시점의 샘플 하나당 학습 + 예측 시간을 측정
+BENCH_REPEAT     = 20
+BENCH_WINDOW     = 3600                # 슬라이딩 윈도우 크기 (dht11_analysis 의 BUFFER_CAPACITY)
+
+
+def make_data(count):
+    trace = generate_dht11_trace(count * 2.0, period=2.0, seed=0, cycle_seconds=3600)
+    temperature, humidity = trace['temperature'], trace['humidity']
+    X = np.column_stack((temperature, humidity))
+    return X[:-1], temperature[1:]
+
+
+def refit_cost(X, y, n):
+    # 기존 방식: 지금까지의 전체 데이터로 다시 학습하고 예측
+    start = time.perf_counter()
+    for _ in range(BENCH_REPEAT):
+        model = LinearRegression().fit(X[:n], y[:n])
+        model.predict(X[n:n + 1])
+    return (time.perf_counter() - start) / BENCH_REPEAT
+
+
+def online_run(X, y, window=None):
+    model = OnlineLinearRegression(X.shape[1], window=window)
+    predictions = np.empty(len(y))
+    start = time.perf_counter()
+    for i in range(len(y)):
+        model.update(X[i], y[i])
+        predictions[i] = model.predict(X[i + 1:i + 2])[0] if i + 1 < len(y) else np.nan
+    return (time.perf_counter() - start) / len(y), predictions
+
+
+def max_difference(X, y, predictions, window=None, step=997):
+    worst = 0.0
+    for i in range(10, len(y) - 1, step):
+        start = 0 if window is None else max(0, i + 1 - window)
+        model = LinearRegression().fit(X[start:i + 1], y[start:i + 1])
+        worst = max(worst, abs(model.predict(X[i + 1:i + 2])[0] - predictions[i]))
+    return worst
+
+
+def main():
+    X, y = make_data(BENCH_SAMPLES)
+    print(f"샘플 {len(y)}개, 특성 {X.shape[1]}개")
+    print("-" * 60)
+    for n in BENCH_CHECKS:
+        n = min(n, len(y) - 1)
+        print(f"refit (전체 {n:6d}개)     샘플당 {refit_cost(X, y, n) * 1e3:8.3f} ms")
+
+    for window in (None, BENCH_WINDOW):
+        per_sample, predictions = online_run(X, y, window)
+        label = '전체' if window is None else f'윈도우 {window}'
+        print(f"online ({label:>10})   샘플당 {per_sample * 1e3:8.3f} ms  "
+              f"refit 과의 최대 예측 차이 {max_difference(X, y, predictions, window):.2e}")
+
+
+if __name__ == '__main__':
+    main()
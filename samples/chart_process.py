@@ -0,0 +1,195 @@
+import os
+import signal
+import time
+import multiprocessing
+
+import numpy as np
+
+from ring_buffer import ColumnarRingBuffer
+
+
+# 차트 표시 방식
+CHART_INLINE    = 'inline'      # 수집 / 예측과 같은 프로세스에서 그림 (기존 방식)
+CHART_PROCESS   = 'process'     # 별도 렌더링 프로세스에서 그림. 수집 루프는 공유 메모리에 기록만 함
+CHART_HEADLESS  = 'headless'    # 차트를 그리지 않음 (모니터 없는 라즈베리파이 등)
+
+# 렌더링 프로세스가 공유 메모리에서 새 샘플을 확인하는 최대 빈도 (초당 횟수)
+CHART_PROCESS_FPS = 2.0
+
+
+class SharedSampleRing:
+    """
+    프로세스 사이에서 공유하는 고정 크기 샘플 링 버퍼입니다. (multiprocessing RawArray, 잠금 없음)
+
+    기록하는 쪽(수집 프로세스)은 한 명뿐이며, 값을 쓴 뒤 마지막에 샘플 수(total)를 늘립니다.
+    append() 는 배열에 값을 한 줄 쓰는 것뿐이라 렌더링 프로세스가 느려도 절대 기다리지 않습니다.
+    읽는 쪽은 복사 전후의 total 을 비교해, 복사하는 동안 덮어써진 경우에만 다시 읽습니다.
+    total 은 줄어들지 않으며, clear() 는 표시할 첫 샘플 위치(start)만 total 로 옮깁니다.
+    """
+
+    def __init__(self, capacity, columns, context=multiprocessing):
+        self.capacity = capacity
+        self.columns = list(columns)
+        self._data = context.RawArray('d', capacity * len(self.columns))
+        self._total = context.RawValue('q', 0)
+        self._start = context.RawValue('q', 0)
+        self.data = np.frombuffer(self._data, dtype=np.float64).reshape(capacity, len(self.columns))
+
+    @property
+    def total(self):
+        return self._total.value
+
+    @property
+    def state(self):
+        """
+        (start, total). 값이 바뀌었을 때만 다시 그리면 됩니다.
+        """
+        return self._start.value, self._total.value
+
+    def append(self, values):
+        total = self._total.value
+        self.data[total % self.capacity] = values
+        self._total.value = total + 1
+
+    def clear(self):
+        self._start.value = self._total.value
+
+    def window(self, n, retries=3):
+        """
+        최근 n 개 샘플을 {열 이름: 배열(복사본)} 으로 반환합니다. 계속 덮어써지면 None
+        다음에 기록될 칸은 비워 두므로 한 번에 최대 capacity - 1 개까지 읽습니다.
+        """
+        for _ in range(retries):
+            start = self._start.value
+            total = self._total.value
+            count = min(n, total - start, self.capacity - 1)
+            rows = self.data[np.arange(total - count, total) % self.capacity]
+            # 기록 중인 샘플(total 번째)도 읽은 첫 줄을 덮어쓰지 않았어야 하므로 capacity 와 같아도 안 됨
+            if self._start.value == start and self._total.value - (total - count) < self.capacity:
+                return {name: rows[:, i] for i, name in enumerate(self.columns)}
+        return None
+
+
+def _render_loop(ring, chart_kwargs, frame_fn, window, max_fps, final, stop, parent_pid):
+    """
+    렌더링 프로세스 본체: 새 샘플이 있을 때만 차트를 갱신하고, 그 사이에는 GUI 이벤트를 처리합니다.
+    """
+    # Ctrl+C 는 수집 프로세스가 처리하고, 종료는 stop / final 이벤트로 전달받음
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import matplotlib.pyplot as plt
+    from live_chart import LiveChart
+
+    plt.ion()
+    chart = LiveChart(max_fps=max_fps, **chart_kwargs)
+    seen = None
+    while not stop.is_set() and os.getppid() == parent_pid and plt.fignum_exists(chart.fig.number):
+        last = final.is_set()
+        state = ring.state
+        if state != seen:
+            data = ring.window(window)
+            if data is not None:
+                chart.update(*frame_fn(data))
+                seen = state
+        if last:
+            # 수집이 끝났으면 마지막 데이터로 한 번 더 그리고, 창을 닫을 때까지 표시
+            chart.render()
+            plt.ioff()
+            plt.show()
+            break
+        chart.fig.canvas.start_event_loop(1.0 / max_fps)
+
+
+class ChartOutput:
+    """
+    분석 샘플의 실시간 차트 출력입니다. mode 에 따라 같은 publish() 호출로 다르게 동작합니다.
+
+    - CHART_INLINE: 현재 프로세스에서 LiveChart 로 그립니다.
+    - CHART_PROCESS: 샘플을 SharedSampleRing 에 기록하고, 별도 프로세스가 자기 속도로 읽어서 그립니다.
+      화면이 느리거나 창을 드래그해도 수집 / 예측 주기에 영향이 없습니다.
+    - CHART_HEADLESS: 아무것도 그리지 않습니다.
+
+    frame_fn(window) 는 {열 이름: 배열} 을 받아 LiveChart.update() 의 인자 (x, ys, 마커, 문구) 를 반환합니다.
+    CHART_PROCESS 는 fork 로 렌더링 프로세스를 만들므로(샘플 스크립트를 다시 import 하지 않기 위해)
+    fork 를 지원하지 않는 OS 에서는 CHART_INLINE 으로 동작합니다.
+    """
+
+    def __init__(self, mode, columns, chart_kwargs, frame_fn, window, max_fps=CHART_PROCESS_FPS):
+        if mode not in (CHART_INLINE, CHART_PROCESS, CHART_HEADLESS):
+            raise ValueError(f"알 수 없는 차트 모드: {mode}")
+        if mode == CHART_PROCESS and 'fork' not in multiprocessing.get_all_start_methods():
+            print("이 OS 에서는 별도 렌더링 프로세스를 사용할 수 없어 같은 프로세스에서 차트를 그립니다.")
+            mode = CHART_INLINE
+        self.mode = mode
+        self.columns = list(columns)
+        self.frame_fn = frame_fn
+        self.window = window
+        self.published = 0
+        self.publish_seconds = 0.0
+        self.chart = None
+        self.process = None
+
+        if mode == CHART_INLINE:
+            import matplotlib.pyplot as plt
+            from live_chart import LiveChart
+            plt.ion()
+            self.buffer = ColumnarRingBuffer(window, self.columns)
+            self.chart = LiveChart(max_fps=max_fps, **chart_kwargs)
+        elif mode == CHART_PROCESS:
+            context = multiprocessing.get_context('fork')
+            # 렌더링 프로세스가 잠깐 멈춰도 읽을 구간이 덮어써지지 않도록 여유 있게 잡음
+            self.ring = SharedSampleRing(window * 4, self.columns, context)
+            self.final = context.Event()
+            self.stop = context.Event()
+            self.process = context.Process(target=_render_loop, daemon=True,
+                                           args=(self.ring, chart_kwargs, frame_fn, window, max_fps,
+                                                 self.final, self.stop, os.getpid()))
+            self.process.start()
+
+    def publish(self, **values):
+        """
+        샘플 하나를 차트로 보냅니다. 지정하지 않은 열은 NaN 입니다.
+        """
+        started = time.perf_counter()
+        if self.mode == CHART_INLINE:
+            self.buffer.append(**values)
+            self.chart.update(*self.frame_fn(self.buffer.window()))
+        elif self.mode == CHART_PROCESS:
+            self.ring.append([values.get(name, np.nan) for name in self.columns])
+        self.published += 1
+        self.publish_seconds += time.perf_counter() - started
+
+    def clear(self):
+        """
+        차트에 표시된 샘플을 모두 지웁니다.
+        """
+        if self.mode == CHART_INLINE:
+            self.buffer = ColumnarRingBuffer(self.window, self.columns)
+            self.chart.update(*self.frame_fn(self.buffer.window()))
+        elif self.mode == CHART_PROCESS:
+            self.ring.clear()
+
+    def close(self, keep_open=False):
+        """
+        keep_open 이면 마지막 차트를 창을 닫을 때까지 표시한 뒤 반환합니다.
+        """
+        if self.mode == CHART_INLINE:
+            import matplotlib.pyplot as plt
+            plt.ioff()
+            if keep_open:
+                self.chart.render()
+                plt.show()
+        elif self.mode == CHART_PROCESS and self.process is not None:
+            if keep_open:
+                self.final.set()
+                self.process.join()
+            else:
+                self.stop.set()
+                self.process.join(timeout=2)
+            self.process = None
+
+    def report(self):
+        mean = self.publish_seconds / self.published if self.published else 0.0
+        text = f"차트({self.mode}) 샘플 {self.published}개, 수집 루프에서 쓴 시간 샘플당 평균 {mean * 1000:.3f} ms"
+        if self.chart is not None:
+            text += "\n" + self.chart.report()
+        return text
@@ -1,14 +1,38 @@
 # -*- coding: utf-8 -*-
+import os
+import sys
 import time
 import random
-import pandas as pd
-from sklearn.linear_model import LinearRegression
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 
+# sensors 폴더의 공용 모듈 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sensors'))
+from sampling import PeriodicSampler
+from ring_buffer import ColumnarRingBuffer
+from online_regression import OnlineLinearRegression
+from forecasting import MultiHorizonForecaster, FORECAST_HORIZONS
+from chart_process import ChartOutput, CHART_INLINE, CHART_PROCESS, CHART_HEADLESS
+
 SIMULATION = False
 
+# 메모리에 보관할 최근 샘플 수 (2초 간격 기준 약 2시간). 넘으면 오래된 샘플부터 덮어씁니다.
+BUFFER_CAPACITY = 3600
+# 차트에 표시할 최근 샘플 수
+PLOT_SAMPLES = 300
+# 차트를 다시 그리는 최대 빈도 (초당 횟수). 샘플 주기와 별개이며, 늦춰도 수집 / 예측에는 영향 없음
+CHART_MAX_FPS = 2.0
+# 차트 표시 방식: CHART_PROCESS (별도 렌더링 프로세스), CHART_INLINE (같은 프로세스), CHART_HEADLESS (그리지 않음)
+CHART_MODE = CHART_PROCESS
+
+# 차트로 보내는 열과 차트 모양
+CHART_COLUMNS = ['sample', 'temperature', 'humidity', 'predicted'] + [f'forecast_{h}' for h in FORECAST_HORIZONS]
+CHART = dict(title='DHT11 센서 데이터 및 AI 온도 예측', xlabel='시간 경과 (샘플 번호)', ylabel='값',
+             series=[('온도 (°C)', dict(marker='o', linestyle='-')),
+                     ('습도 (%)', dict(marker='s', linestyle='--'))],
+             prediction_label='AI 예측 온도')
+
 # --- DHT11 센서 설정 ---
 import board
 import adafruit_dht
@@ -55,25 +79,23 @@ def read_dht11_sensor():
         hum = 50 + (10 * (1 + np.cos(time.time() / 90))) + random.uniform(-1, 1)
         return round(temp, 1), round(hum, 1)
 
-def update_plot(df, predicted_temp=None):
-    plt.clf() # 이전 차트 지우기
-    
-    # 시간 경과에 따른 온도와 습도 변화
-    plt.plot(df.index, df['temperature'], marker='o', linestyle='-', label='온도 (°C)')
-    plt.plot(df.index, df['humidity'], marker='s', linestyle='--', label='습도 (%)')
-    
-    # AI 예측값 표시 (예측이 시작되었을 경우)
-    if predicted_temp is not None and not df.empty:
-        # 예측값은 다음 시간 단계에 대한 것이므로 마지막 인덱스 + 1 위치에 표시
-        plt.plot(df.index[-1] + 1, predicted_temp, 'r*', markersize=10, label=f'AI 예측 온도 ({predicted_temp:.2f}°C)')
-
-    plt.title('DHT11 센서 데이터 및 AI 온도 예측')
-    plt.xlabel('시간 경과 (샘플 번호)')
-    plt.ylabel('값')
-    plt.legend() # 범례 표시
-    plt.grid(True)
-    plt.tight_layout() # 레이아웃 최적화
-    plt.pause(0.01) # 차트를 업데이트하고 잠시 대기
+def chart_frame(window):
+    """
+    차트로 보낸 최근 샘플({열 이름: 배열})을 LiveChart.update() 인자로 바꿉니다. (렌더링 프로세스에서도 호출)
+    """
+    x = window['sample']
+    ys = [window['temperature'], window['humidity']]
+    if not len(x):
+        return x, ys, None, ""
+
+    # 예측값은 다음 시간 단계에 대한 것이므로 마지막 샘플 번호 + horizon 위치에 표시 (+1 은 온라인 회귀 예측)
+    points = {h: window[f'forecast_{h}'][-1] for h in FORECAST_HORIZONS}
+    predicted_temp = window['predicted'][-1]
+    if not np.isnan(predicted_temp):
+        points[1] = predicted_temp
+    horizons = [h for h in sorted(points) if not np.isnan(points[h])]
+    message = "" if np.isnan(predicted_temp) else f"AI 예측 온도 ({predicted_temp:.2f}°C)"
+    return x, ys, ([x[-1] + h for h in horizons], [points[h] for h in horizons]), message
 
 def main():
     """
@@ -84,70 +106,83 @@ def main():
     print("매 2초마다 데이터를 수집하여 다음 온도를 예측하고 차트를 업데이트합니다.")
     print("-" * 50)
     
-    # 데이터를 저장할 pandas DataFrame 생성
+    # 데이터를 저장할 고정 크기 링 버퍼 생성 (DataFrame 은 필요할 때만 만듦)
     columns = ['timestamp', 'temperature', 'humidity', 'next_temp']
-    data_df = pd.DataFrame(columns=columns)
+    buffer = ColumnarRingBuffer(BUFFER_CAPACITY, columns)
     
     # AI 모델 초기화 (선형 회귀)
-    model = LinearRegression()
+    # 샘플마다 (이전 온도, 이전 습도) -> 현재 온도 한 쌍만 추가하는 온라인 학습이며,
+    # 버퍼와 같은 최근 샘플 범위로 LinearRegression().fit 한 것과 같은 예측을 합니다.
+    model = OnlineLinearRegression(2, window=BUFFER_CAPACITY - 1)
     # 모델 훈련에 필요한 최소 데이터 개수
     min_data_for_training = 10 
-    # 실시간 차트 설정
-    plt.ion() # 인터랙티브 모드 켜기
-    fig = plt.figure(figsize=(10, 6))
+    # +1 / +5 / +30 샘플 뒤의 온도를 lag / 이동 통계 특성으로 함께 예측
+    forecaster = MultiHorizonForecaster()
+    # 실시간 차트 설정 (figure 와 선은 한 번만 만들고, 이후에는 데이터만 바꿔서 blitting)
+    # CHART_PROCESS 이면 별도 프로세스에서 그리므로 창이 느려도 2초 수집 주기에 영향이 없음
+    chart = ChartOutput(CHART_MODE, CHART_COLUMNS, CHART, chart_frame, PLOT_SAMPLES, max_fps=CHART_MAX_FPS)
+
+    # 학습 / 차트 시간과 상관없이 2초 간격의 절대 시각에 맞춰 수집
+    sampler = PeriodicSampler(2)
 
     try:
         while True:
+            sampler.wait()
             # 1. 데이터 수집
             temperature, humidity = read_dht11_sensor()
             last_prediction = None
+            forecasts = {}
             
             if temperature is not None and humidity is not None:
                 timestamp = time.time()
                 print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 현재 상태: 온도={temperature}°C, 습도={humidity}%")
                 
-                if not data_df.empty:
-                    data_df.loc[data_df.index[-1], 'next_temp'] = temperature
+                # 2. AI 모델 훈련 및 예측
+                # 이전 샘플의 다음 온도가 정해졌으므로 그 한 쌍만 모델에 추가 (O(특성 수²))
+                if len(buffer):
+                    buffer.set('next_temp', temperature)
+                    model.update((buffer.column('temperature', 1)[0], buffer.column('humidity', 1)[0]), temperature)
 
-                new_row = {'timestamp': timestamp, 'temperature': temperature, 'humidity': humidity, 'next_temp': np.nan}
-                data_df = pd.concat([data_df, pd.DataFrame([new_row])], ignore_index=True)
+                buffer.append(timestamp=timestamp, temperature=temperature, humidity=humidity)
 
-                # 2. AI 모델 훈련 및 예측
-                train_data = data_df.dropna()
-                
-                if len(train_data) >= min_data_for_training:
-                    X_train = train_data[['temperature', 'humidity']]
-                    y_train = train_data['next_temp']
-                    model.fit(X_train, y_train)
-                    
+                if len(model) >= min_data_for_training:
                     current_features = np.array([[temperature, humidity]])
                     predicted_temp = model.predict(current_features)[0]
                     last_prediction = predicted_temp
                     
                     print(f">> AI 예측: 다음 온도는 약 {predicted_temp:.2f}°C 로 예상됩니다.")
-                
+
                 else:
-                    print(f"데이터 수집 중... ({len(train_data)}/{min_data_for_training})")
+                    print(f"데이터 수집 중... ({len(model)}/{min_data_for_training})")
+
+                if len(buffer) >= forecaster.min_samples():
+                    forecasts = forecaster.fit_predict(buffer.column('temperature'), buffer.column('humidity'))
+                    text = ", ".join(f"+{h}: {value:.2f}°C" for h, value in forecasts.items())
+                    print(f">> 다중 시점 예측 ({forecaster.last_seconds * 1000:.1f} ms): {text}")
 
-                # 3. 실시간 차트 업데이트
-                update_plot(data_df, last_prediction)
+                # 3. 실시간 차트 업데이트 (샘플 하나만 보내며, 그리기 / 빈도 제한은 chart 에서 처리)
+                values = {f'forecast_{h}': value for h, value in forecasts.items()}
+                chart.publish(sample=buffer.total - 1, temperature=temperature, humidity=humidity,
+                              predicted=np.nan if last_prediction is None else last_prediction, **values)
 
             else:
                 print("센서로부터 데이터를 읽어오지 못했습니다.")
             
             print("-" * 50)
-            time.sleep(2)
 
     except KeyboardInterrupt:
         print("\n프로그램을 종료합니다.")
+        print(sampler.report())
+        print(forecaster.report())
+        print(chart.report())
         print("수집된 데이터:")
-        print(data_df)
+        print(buffer.to_dataframe())
     finally:
-        plt.ioff() # 인터랙티브 모드 끄기
-        if not data_df.empty:
+        # 프로그램 종료 전 최종 차트 보여주기
+        keep_open = len(buffer) > 0 and CHART_MODE != CHART_HEADLESS
+        if keep_open:
             print("\n최종 차트를 표시합니다. 창을 닫으면 프로그램이 종료됩니다.")
-            update_plot(data_df)
-            plt.show() # 프로그램 종료 전 최종 차트 보여주기
+        chart.close(keep_open=keep_open)
 
 if __name__ == '__main__':
     main()
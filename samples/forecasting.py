@@ -0,0 +1,116 @@
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# 예측할 시점 (샘플 수 뒤, 2초 간격이면 2초 / 10초 / 1분 뒤)
+FORECAST_HORIZONS = (1, 5, 30)
+# 최근 몇 개 샘플의 온도 / 습도를 그대로 특성으로 쓸지
+FORECAST_LAGS     = 5
+# 온도의 이동 평균 / 표준편차를 계산할 구간 (샘플 수)
+FORECAST_ROLLING  = (5, 30)
+# 한 번의 학습 + 예측에 허용하는 시간 (초). 샘플 주기(2초) 안에 끝나야 함
+FORECAST_BUDGET   = 2.0
+
+
+def build_features(temperature, humidity, lags=FORECAST_LAGS, rolling=FORECAST_ROLLING):
+    """
+    버퍼 전체의 특성 행렬을 한 번에 만듭니다. (Python 루프 없이 sliding_window_view 사용)
+
+    행 i 는 시점 start + i 의 특성이며, start 는 가장 긴 구간을 채울 수 있는 첫 시점입니다.
+    특성: 온도 lag 0..lags-1, 습도 lag 0..lags-1, 구간별 온도 이동 평균 / 표준편차
+    반환값: (특성 행렬, start)
+    """
+    temperature = np.asarray(temperature, dtype=np.float64)
+    humidity = np.asarray(humidity, dtype=np.float64)
+    longest = max((lags,) + tuple(rolling))
+    n = len(temperature) - longest + 1
+    if n <= 0:
+        return np.empty((0, 2 * lags + 2 * len(rolling))), longest - 1
+
+    # sliding_window_view 는 복사 없는 view 이며, 각 행은 [t - w + 1, ..., t] 입니다.
+    parts = [
+        sliding_window_view(temperature, lags)[-n:, ::-1],
+        sliding_window_view(humidity, lags)[-n:, ::-1],
+    ]
+    for window in rolling:
+        view = sliding_window_view(temperature, window)[-n:]
+        parts.append(view.mean(axis=1)[:, None])
+        parts.append(view.std(axis=1)[:, None])
+    return np.hstack(parts), longest - 1
+
+
+class MultiHorizonForecaster:
+    """
+    여러 시점(horizon)의 온도를 한 번에 예측하는 모델입니다.
+
+    - fit(): 시점마다 최소제곱 선형 모델을 따로 학습하고, 계수를 [특성 + 1, 시점] 행렬 하나로 모읍니다.
+    - predict(): 마지막 특성 행과 계수 행렬의 곱 한 번으로 모든 시점을 예측합니다.
+    - 학습 / 예측에 걸린 시간을 기록하며 report() 로 확인할 수 있습니다.
+    """
+
+    def __init__(self, horizons=FORECAST_HORIZONS, lags=FORECAST_LAGS, rolling=FORECAST_ROLLING,
+                 budget=FORECAST_BUDGET):
+        self.horizons = tuple(horizons)
+        self.lags = lags
+        self.rolling = tuple(rolling)
+        self.budget = budget
+        self.coef = None
+
+        self.runs = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+        self.over_budget = 0
+
+    def min_samples(self):
+        """
+        모든 시점을 학습하는 데 필요한 최소 샘플 수
+        """
+        return max((self.lags,) + self.rolling) + max(self.horizons) + 2
+
+    def fit(self, temperature, humidity):
+        features, start = build_features(temperature, humidity, self.lags, self.rolling)
+        design = np.hstack((features, np.ones((len(features), 1))))
+        target = np.asarray(temperature, dtype=np.float64)
+        coef = np.zeros((design.shape[1], len(self.horizons)))
+        for j, horizon in enumerate(self.horizons):
+            # 시점 start + i 의 특성으로 start + i + horizon 의 온도를 예측
+            rows = len(design) - horizon
+            if rows <= 0:
+                continue
+            coef[:, j] = np.linalg.lstsq(design[:rows], target[start + horizon:start + horizon + rows],
+                                         rcond=None)[0]
+        self.coef = coef
+        return features
+
+    def predict(self, features):
+        """
+        특성 행(들)에 대한 모든 시점의 예측값을 [행, 시점] 배열로 반환합니다.
+        """
+        features = np.atleast_2d(features)
+        return features @ self.coef[:-1] + self.coef[-1]
+
+    def fit_predict(self, temperature, humidity):
+        """
+        버퍼 전체로 학습한 뒤 마지막 시점 기준의 예측값 {horizon: 값} 을 반환합니다. (시간 기록 포함)
+        """
+        started = time.perf_counter()
+        features = self.fit(temperature, humidity)
+        predictions = self.predict(features[-1])[0]
+        elapsed = time.perf_counter() - started
+
+        self.runs += 1
+        self.total_seconds += elapsed
+        self.last_seconds = elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+        if elapsed > self.budget:
+            self.over_budget += 1
+        return dict(zip(self.horizons, predictions.tolist()))
+
+    def report(self):
+        mean = self.total_seconds / self.runs if self.runs else 0.0
+        return (f"다중 시점 예측 {self.runs}회: 평균 {mean * 1000:.1f} ms, 최대 {self.max_seconds * 1000:.1f} ms, "
+                f"예산({self.budget:.1f}s) 초과 {self.over_budget}회")
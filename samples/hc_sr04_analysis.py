@@ -2,10 +2,15 @@ import RPi.GPIO as GPIO
 import time
 import numpy as np
 from sklearn.ensemble import IsolationForest
-import collections
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import matplotlib.font_manager as fm # 폰트 관리 모듈
+import os
+import sys
+
+# sensors 폴더의 공용 모듈 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sensors'))
+from hc_sr04_timing import HCSR04Ranger, EDGE
+from chart_process import ChartOutput, CHART_INLINE, CHART_PROCESS, CHART_HEADLESS
 
 # --- 시뮬레이션 모드 설정 ---
 # True로 설정하면 실제 HC-SR04 센서 없이 거리 데이터를 시뮬레이션합니다.
@@ -34,46 +39,16 @@ else:
 GPIO_TRIGGER = 17
 GPIO_ECHO = 27
 
-if not SIMULATION_MODE: # 시뮬레이션 모드가 아닐 때만 GPIO 설정
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setup(GPIO_TRIGGER, GPIO.OUT)
-    GPIO.setup(GPIO_ECHO, GPIO.IN)
+# ECHO 펄스 측정 방식 (EDGE: 엣지 콜백, POLL: GPIO.input() 반복 호출)
+TIMING_BACKEND = EDGE
 
 def get_distance():
     if SIMULATION_MODE:
         return simulate_distance()
     else:
-        GPIO.output(GPIO_TRIGGER, False)
-        time.sleep(0.000002)
-        
-        GPIO.output(GPIO_TRIGGER, True)
-        time.sleep(0.00001)
-        GPIO.output(GPIO_TRIGGER, False)
-
-        # ECHO 핀이 HIGH가 될 때까지 대기합니다 (초음파 발사 시작).
-        # 타임아웃을 추가하여 센서가 반응하지 않을 때 무한 루프에 빠지는 것을 방지합니다.
-        timeout_start = time.time()
-        while GPIO.input(GPIO_ECHO) == 0:
-            start_time = time.time()
-            if time.time() - timeout_start > 0.1: # 0.1초 이상 대기하면 타임아웃
-                return None # 오류 처리 또는 무한 루프 방지
-                
-        # ECHO 핀이 LOW가 될 때까지 대기합니다 (초음파 수신 완료).
-        timeout_end = time.time()
-        while GPIO.input(GPIO_ECHO) == 1:
-            end_time = time.time()
-            if time.time() - timeout_end > 0.1: # 0.1초 이상 대기하면 타임아웃
-                return None # 오류 처리 또는 무한 루프 방지
-
-        # 펄스 지속 시간 (초음파가 왕복하는 데 걸린 시간)을 계산합니다.
-        pulse_duration = end_time - start_time
-        distance = (pulse_duration * 34300) / 2
-        
-        # HC-SR04의 유효 측정 범위(2cm ~ 400cm)를 벗어나는 값은 필터링합니다.
-        if 2 <= distance <= 400:
-            return distance
-        else:
-            return None
+        # 펄스 지속 시간 (초음파가 왕복하는 데 걸린 시간)으로 거리를 계산합니다.
+        # HC-SR04의 유효 측정 범위(2cm ~ 400cm)를 벗어나면 None
+        return ranger.get_distance()
 
 def simulate_distance():
     #HC-SR04 센서 데이터를 시뮬레이션하는 함수
@@ -117,50 +92,41 @@ TRAINING_COLLECTION_INTERVAL = 0.5
 model = IsolationForest(contamination=0.05, random_state=42)
 
 # --- 차트 설정 ---
-# 시계열 데이터를 저장할 deque (최근 50개 데이터 포인트)
+# 차트에 표시할 최근 데이터 포인트 수
 PLOT_BUFFER_SIZE = 50
-time_data = collections.deque(maxlen=PLOT_BUFFER_SIZE)
-distance_plot_data = collections.deque(maxlen=PLOT_BUFFER_SIZE)
-anomaly_points_x = collections.deque(maxlen=PLOT_BUFFER_SIZE)
-anomaly_points_y = collections.deque(maxlen=PLOT_BUFFER_SIZE)
-
-# matplotlib 인터랙티브 모드 켜기
-plt.ion()
-fig, ax = plt.subplots(figsize=(10, 6)) # 차트 크기 설정
-line, = ax.plot([], [], 'b-', label='거리 (cm)') # 거리 그래프 라인 (한글화)
-# 이상치 표시를 위한 설정: 빨간색, 삼각형 마커, 큰 크기, 검은색 테두리
-anomaly_scatter = ax.scatter([], [], color='red', marker='^', s=100, edgecolor='black', label='이상 감지') # 이상치 표시 (한글화)
-
-ax.set_title('HC-SR04 거리 측정 및 이상 감지', fontsize=16) # 제목 한글화 및 크기
-ax.set_xlabel('시간 (초)', fontsize=12) # X축 레이블 한글화 및 크기
-ax.set_ylabel('거리 (cm)', fontsize=12) # Y축 레이블 한글화 및 크기
-ax.legend(fontsize=10) # 범례 한글화 및 크기
-ax.grid(True) # 그리드 표시
-plt.show(block=False) # 차트를 블록하지 않고 표시
+# 차트 표시 방식: CHART_PROCESS (별도 렌더링 프로세스), CHART_INLINE (같은 프로세스), CHART_HEADLESS (그리지 않음)
+# CHART_PROCESS 이면 창이 느려도 측정 / 이상 감지 주기에 영향이 없습니다.
+CHART_MODE = CHART_PROCESS
+# 차트를 다시 그리는 최대 빈도 (초당 횟수)
+CHART_MAX_FPS = 2.0
+
+CHART = dict(title='HC-SR04 거리 측정 및 이상 감지', xlabel='시간 (초)', ylabel='거리 (cm)',
+             series=[('거리 (cm)', dict(color='b', linestyle='-'))],
+             # 이상치 표시를 위한 설정: 빨간색, 삼각형 마커, 큰 크기, 검은색 테두리
+             prediction_label='이상 감지',
+             prediction_style=dict(color='red', marker='^', markersize=10, markeredgecolor='black',
+                                   linestyle='none'),
+             # X축은 마지막 시간 뒤에 1초 이상 여유, Y축은 센서 유효 범위(2~400cm)를 고려하여 0~400 안에서 ±10cm
+             x_pad=1, y_margin=10, y_clamp=(0, 400))
+
+def chart_frame(window):
+    # 차트로 보낸 최근 데이터에서 거리 그래프와 이상치 위치를 만듦 (렌더링 프로세스에서도 호출)
+    time_data = window['time']
+    distance_data = window['distance']
+    anomaly = window['anomaly'] > 0
+    return time_data, [distance_data], (time_data[anomaly], distance_data[anomaly]), ""
+
+# 렌더링 프로세스는 GPIO 를 열기 전에 만듦 (GPIO 이벤트 스레드가 생기기 전에 fork)
+chart = ChartOutput(CHART_MODE, ['time', 'distance', 'anomaly'], CHART, chart_frame, PLOT_BUFFER_SIZE,
+                    max_fps=CHART_MAX_FPS)
+
+ranger = None
+if not SIMULATION_MODE: # 시뮬레이션 모드가 아닐 때만 GPIO 설정
+    ranger = HCSR04Ranger(GPIO_TRIGGER, GPIO_ECHO, backend=TIMING_BACKEND, gpio=GPIO).open()
 
 # 시작 시간 기록 (차트의 X축 시간 계산용)
 start_overall_time = time.time()
 
-def update_plot(frame):
-    # X축 시간 데이터를 업데이트
-    if time_data:
-        ax.set_xlim(min(time_data), max(time_data) + 1)
-    
-    # Y축 범위는 센서 측정 범위에 따라 동적으로 설정
-    if distance_plot_data:
-        min_dist = min(distance_plot_data)
-        max_dist = max(distance_plot_data)
-        # 센서 유효 범위(2~400cm)를 고려하여 y축 범위 설정
-        ax.set_ylim(max(0, min_dist - 10), min(400, max_dist + 10)) 
-
-    line.set_data(list(time_data), list(distance_plot_data))
-    anomaly_scatter.set_offsets(np.c_[list(anomaly_points_x), list(anomaly_points_y)])
-
-    fig.canvas.draw_idle() # 차트 업데이트 요청
-    fig.canvas.flush_events() # 이벤트 처리 (차트 반응성 향상)
-
-    return line, anomaly_scatter
-
 print("-------------------------------------------------")
 print("AI 분석을 위한 '정상' 데이터 수집을 시작합니다.")
 print(f"총 {NUM_TRAINING_SAMPLES}개의 샘플을 수집합니다.")
@@ -178,16 +144,14 @@ try:
         if distance is not None:
             normal_data.append([distance])
             
-            # 차트 업데이트를 위한 데이터 추가
+            # 차트 업데이트를 위한 데이터 추가 (수집 중에도 차트 업데이트)
             current_time = time.time() - start_overall_time
-            time_data.append(current_time)
-            distance_plot_data.append(distance)
+            chart.publish(time=current_time, distance=distance, anomaly=0)
             
             print(f"수집 중: {len(normal_data)}/{NUM_TRAINING_SAMPLES} - 거리: {distance:.2f} cm")
         else:
             print("데이터 수집 실패. 재시도합니다.")
         
-        update_plot(None) # 수집 중에도 차트 업데이트
         time.sleep(TRAINING_COLLECTION_INTERVAL)
 
     # 수집된 정상 데이터를 사용하여 Isolation Forest 모델을 훈련
@@ -198,21 +162,13 @@ try:
     print("-------------------------------------------------")
 
     # 훈련이 끝나면 차트 데이터 초기화 (이상 감지 데이터만 보기 위함)
-    time_data.clear()
-    distance_plot_data.clear()
-    anomaly_points_x.clear()
-    anomaly_points_y.clear()
+    chart.clear()
 
 
     print("\n-------------------------------------------------")
     print("실시간 이상 감지 시작!")
     print("-------------------------------------------------")
 
-    # matplotlib 애니메이션 설정 (차트가 주기적으로 업데이트되도록)
-    # interval은 밀리초 단위 (예: 500ms마다 업데이트)
-    ani = animation.FuncAnimation(fig, update_plot, interval=500, blit=True, cache_frame_data=False)
-
-
     # 3. 실시간 이상 감지 루프
     while True:
         current_distance = get_distance()
@@ -225,17 +181,14 @@ try:
             # predict() 메서드는 1 (정상) 또는 -1 (이상치)를 반환
             prediction = model.predict(current_sample)
             
-            # 차트 업데이트를 위한 데이터 추가
+            # 차트 업데이트를 위한 데이터 추가 (다시 그리는 빈도는 CHART_MAX_FPS 로 제한됨)
             current_time = time.time() - start_overall_time
-            time_data.append(current_time)
-            distance_plot_data.append(current_distance)
+            chart.publish(time=current_time, distance=current_distance, anomaly=int(prediction[0] == -1))
             
             if prediction == -1:
                 # 이상치로 감지된 경우
                 print(f"[!] 이상 감지: 현재 거리 {current_distance:.2f} cm. 비정상적인 움직임이 감지되었습니다!")
-                # 이상치 포인트를 차트에 추가: 빨간색 삼각형으로 명확하게 표시
-                anomaly_points_x.append(current_time)
-                anomaly_points_y.append(current_distance)
+                # 이상치 포인트는 차트에 빨간색 삼각형으로 명확하게 표시 (anomaly=1)
             else:
                 # 정상으로 감지된 경우
                 print(f"정상: 현재 거리 {current_distance:.2f} cm")
@@ -252,3 +205,6 @@ except Exception as e:
     print(f"오류 발생: {e}")
     if not SIMULATION_MODE: # 실제 GPIO를 사용했을 경우만 초기화
         GPIO.cleanup()
+finally:
+    print(chart.report())
+    chart.close()
@@ -0,0 +1,169 @@
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+# 차트를 다시 그리는 최대 빈도 (초당 횟수). 샘플 주기와 별개로 제한합니다.
+CHART_MAX_FPS   = 2.0
+# 축 범위를 넘을 때 늘려 두는 여유 (범위의 비율)
+CHART_MARGIN    = 0.1
+
+
+class LiveChart:
+    """
+    한 번 만든 figure 의 선(artist)만 set_data 로 바꿔서 그리는 실시간 차트입니다.
+
+    - 제목, 축, 범례, 격자는 처음 한 번만 그리고 배경으로 저장합니다. (blitting)
+    - 프레임마다 저장된 배경을 복원한 뒤 선과 예측 마커만 다시 그리므로,
+      프레임 비용은 표시하는 구간(window) 크기에만 비례하고 실행 시간과 상관없이 일정합니다.
+    - 데이터가 축 범위를 벗어날 때만 범위를 여유 있게 늘리고 전체를 다시 그립니다.
+    - update() 는 max_fps 보다 자주 호출되면 데이터만 저장하고 그리지 않습니다.
+    """
+
+    def __init__(self, title, xlabel, ylabel, series, max_fps=CHART_MAX_FPS, figsize=(10, 6),
+                 prediction_label=None, prediction_style=None, x_pad=None, y_margin=None, y_clamp=None):
+        """
+        series: [(범례 이름, plot 스타일 dict), ...]
+        prediction_label: 지정하면 예측(또는 이상 감지) 마커를 표시합니다. (스타일은 prediction_style)
+        x_pad: 마지막 x 뒤에 항상 남겨 둘 여백 (x 단위). 범위는 이 여백을 넘을 때만 여유를 두고 늘립니다.
+        y_margin: y 범위 위아래 여백 (값 단위). 없으면 데이터 범위의 CHART_MARGIN 비율
+        y_clamp: (최소, 최대) y 범위가 이 안을 벗어나지 않도록 제한 (예: 센서 측정 범위)
+        """
+        self.fig, self.ax = plt.subplots(figsize=figsize)
+        self.lines = [self.ax.plot([], [], label=label, animated=True, **style)[0]
+                      for label, style in series]
+        self.prediction = None
+        self.prediction_text = None
+        if prediction_label is not None:
+            style = prediction_style or dict(color='red', marker='*', markersize=10, linestyle='none')
+            self.prediction = self.ax.plot([], [], label=prediction_label, animated=True, **style)[0]
+            self.prediction_text = self.ax.text(0.01, 0.97, '', transform=self.ax.transAxes, va='top',
+                                                animated=True)
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.legend(loc='upper right')
+        self.ax.grid(True)
+        self.fig.tight_layout()
+
+        self.max_fps = max_fps
+        self.x_pad = x_pad
+        self.y_margin = y_margin
+        self.y_clamp = y_clamp
+        self.last_render = None
+        self.background = None
+        self.x = None
+        self.ys = None
+        self.prediction_points = None
+        self.prediction_message = ''
+        self.frames = 0
+        self.full_draws = 0
+        self.render_seconds = 0.0
+
+        self.blit = getattr(self.fig.canvas, 'supports_blit', False)
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        plt.show(block=False)
+        self._full_draw()
+
+    def _on_draw(self, event):
+        # 전체 그리기가 끝날 때마다 배경(움직이지 않는 부분)을 저장
+        if self.blit:
+            self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+
+    def _artists(self):
+        artists = list(self.lines)
+        if self.prediction is not None:
+            artists += [self.prediction, self.prediction_text]
+        return artists
+
+    def _draw_artists(self):
+        for artist in self._artists():
+            self.fig.draw_artist(artist)
+
+    def _full_draw(self):
+        self.full_draws += 1
+        self.fig.canvas.draw()
+        self.fig.canvas.flush_events()
+
+    def _expand_limits(self, x, ys, points):
+        """
+        데이터가 현재 축 범위를 벗어나면 범위를 늘리고 True 를 반환합니다.
+        """
+        changed = False
+        x_low, x_high = self.ax.get_xlim()
+        x_max = x[-1] if points is None or not len(points[0]) else max(x[-1], np.max(points[0]))
+        # x 는 한쪽으로만 늘어나므로 표시 구간 길이의 일부만큼 앞을 미리 비워 둠
+        headroom = (x[-1] - x[0]) * 0.25 or 1.0
+        pad = self.x_pad or 0
+        # 마지막 값 + x_pad 가 범위를 넘거나, 오래된 샘플이 빠져 x[0] 가 범위 시작보다 한참 앞으로 왔을 때만 다시 맞춤
+        if x[0] < x_low or x_max + pad > x_high or x[0] - x_low > headroom:
+            self.ax.set_xlim(x[0], x_max + pad + headroom)
+            changed = True
+
+        values = [y for y in ys if len(y)]
+        if points is not None and len(points[1]):
+            values.append(np.asarray(points[1]))
+        if values:
+            y_low = min(np.nanmin(v) for v in values)
+            y_high = max(np.nanmax(v) for v in values)
+            if self.y_clamp is not None:
+                y_low, y_high = np.clip([y_low, y_high], *self.y_clamp)
+            low, high = self.ax.get_ylim()
+            margin = self.y_margin if self.y_margin is not None else max(y_high - y_low, 1.0) * CHART_MARGIN
+            # 범위를 벗어나거나, 튀는 값이 구간에서 빠져 데이터가 축의 절반도 안 쓰면 다시 맞춤
+            outside = y_low < low or y_high > high
+            shrunk = max(y_high - y_low, 1.0) + 2 * margin < (high - low) * 0.5
+            if np.isfinite(y_low) and np.isfinite(y_high) and (outside or shrunk):
+                new_low, new_high = y_low - margin, y_high + margin
+                if self.y_clamp is not None:
+                    new_low, new_high = max(self.y_clamp[0], new_low), min(self.y_clamp[1], new_high)
+                self.ax.set_ylim(new_low, new_high)
+                changed = True
+        return changed
+
+    def update(self, x, ys, prediction_points=None, message=''):
+        """
+        x: 공통 x 값 배열, ys: 선마다 y 값 배열 (같은 길이)
+        prediction_points: (x 목록, y 목록) 예측 마커, message: 예측 설명 문자열
+        그렸으면 True, 빈도 제한으로 건너뛰었으면 False 를 반환합니다.
+        """
+        self.x = x
+        self.ys = ys
+        self.prediction_points = prediction_points
+        self.prediction_message = message
+        now = time.monotonic()
+        if self.last_render is not None and now - self.last_render < 1.0 / self.max_fps:
+            return False
+        self.last_render = now
+        self.render()
+        return True
+
+    def render(self):
+        if self.x is None:
+            return
+        started = time.perf_counter()
+        for line, y in zip(self.lines, self.ys):
+            line.set_data(self.x, y)
+        if self.prediction is not None:
+            points = self.prediction_points or ([], [])
+            self.prediction.set_data(points[0], points[1])
+            self.prediction_text.set_text(self.prediction_message)
+
+        expanded = len(self.x) > 0 and self._expand_limits(self.x, self.ys, self.prediction_points)
+        if expanded or self.background is None:
+            self._full_draw()
+        else:
+            canvas = self.fig.canvas
+            canvas.restore_region(self.background)
+            self._draw_artists()
+            canvas.blit(self.fig.bbox)
+            canvas.flush_events()
+        self.frames += 1
+        self.render_seconds += time.perf_counter() - started
+
+    def report(self):
+        mean = self.render_seconds / self.frames if self.frames else 0.0
+        return (f"차트 {self.frames}프레임 (전체 다시 그리기 {self.full_draws}회), "
+                f"프레임당 평균 {mean * 1000:.1f} ms")
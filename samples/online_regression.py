@@ -0,0 +1,122 @@
+import numpy as np
+
+
+class OnlineLinearRegression:
+    """
+    샘플마다 갱신하는 선형 회귀입니다. (충분 통계량 방식의 최소제곱)
+
+    전체 데이터를 다시 학습하지 않고 가중치 합, 합계, 곱의 합(X^T X, X^T y)만 갱신하므로
+    샘플 하나당 O(특성 수²) 이며, 같은 데이터로 LinearRegression().fit 한 결과와 같은 예측을 합니다.
+
+    - forgetting: 1 보다 작으면 오래된 샘플의 가중치를 샘플마다 forgetting 배씩 줄입니다. (지수 망각)
+    - window: 지정하면 최근 window 개 샘플만 사용합니다. (슬라이딩 윈도우)
+
+    계수는 scikit-learn 과 같이 평균을 뺀 뒤 최소 노름 해(lstsq)로 구하므로,
+    DHT11 처럼 값이 한동안 변하지 않아 특성이 선형 종속인 경우에도 같은 결과가 나옵니다.
+    """
+
+    def __init__(self, n_features, forgetting=1.0, window=None):
+        if not 0 < forgetting <= 1:
+            raise ValueError("forgetting 은 0 보다 크고 1 이하여야 합니다.")
+        if window is not None and forgetting != 1.0:
+            raise ValueError("window 와 forgetting 은 함께 사용할 수 없습니다.")
+        self.n_features = n_features
+        self.forgetting = forgetting
+        self.window = window
+        self.shift = None
+        self._reset_stats()
+        if window is not None:
+            # 윈도우에서 빠질 샘플을 기억하기 위한 링 버퍼
+            self.window_x = np.empty((window, n_features))
+            self.window_y = np.empty(window)
+            self.window_pos = 0
+            self.window_size = 0
+        self.coef_ = np.zeros(n_features)
+        self.intercept_ = 0.0
+        self._dirty = False
+
+    def _reset_stats(self):
+        p = self.n_features
+        self.n = 0.0
+        self.sum_x = np.zeros(p)
+        self.sum_y = 0.0
+        self.sum_xx = np.zeros((p, p))
+        self.sum_xy = np.zeros(p)
+
+    def _accumulate(self, dx, dy, weight):
+        self.n += weight
+        self.sum_x += weight * dx
+        self.sum_y += weight * dy
+        self.sum_xx += weight * np.outer(dx, dx)
+        self.sum_xy += weight * dx * dy
+
+    def update(self, x, y):
+        """
+        샘플 (x, y) 하나를 추가합니다.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if self.shift is None:
+            # 첫 샘플을 기준으로 값을 옮겨 합계가 커지면서 생기는 정밀도 손실을 줄임
+            self.shift = (x.copy(), float(y))
+        dx = x - self.shift[0]
+        dy = float(y) - self.shift[1]
+
+        if self.forgetting != 1.0:
+            f = self.forgetting
+            self.n *= f
+            self.sum_x *= f
+            self.sum_y *= f
+            self.sum_xx *= f
+            self.sum_xy *= f
+
+        if self.window is not None:
+            pos = self.window_pos
+            if self.window_size == self.window:
+                self._accumulate(self.window_x[pos], self.window_y[pos], -1.0)
+            else:
+                self.window_size += 1
+            self.window_x[pos] = dx
+            self.window_y[pos] = dy
+            self.window_pos = (pos + 1) % self.window
+            if self.window_size == self.window and self.window_pos == 0:
+                # 한 바퀴마다 윈도우로 통계량을 다시 계산해 빼기 누적 오차를 없앰
+                self._recompute()
+                self._dirty = True
+                return
+        self._accumulate(dx, dy, 1.0)
+        self._dirty = True
+
+    def _recompute(self):
+        self._reset_stats()
+        x = self.window_x[:self.window_size]
+        y = self.window_y[:self.window_size]
+        self.n = float(self.window_size)
+        self.sum_x = x.sum(axis=0)
+        self.sum_y = float(y.sum())
+        self.sum_xx = x.T @ x
+        self.sum_xy = x.T @ y
+
+    def __len__(self):
+        return self.window_size if self.window is not None else int(round(self.n))
+
+    def _solve(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        if self.n <= 0:
+            return
+        mean_x = self.sum_x / self.n
+        mean_y = self.sum_y / self.n
+        cov_xx = self.sum_xx / self.n - np.outer(mean_x, mean_x)
+        cov_xy = self.sum_xy / self.n - mean_x * mean_y
+        coef = np.linalg.lstsq(cov_xx, cov_xy, rcond=None)[0]
+        self.coef_ = coef
+        self.intercept_ = (mean_y + self.shift[1]) - (mean_x + self.shift[0]) @ coef
+
+    def predict(self, X):
+        """
+        X: [샘플, 특성] 배열 (또는 특성 하나짜리 1차원 배열)
+        """
+        self._solve()
+        X = np.asarray(X, dtype=np.float64)
+        return X @ self.coef_ + self.intercept_
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class ColumnarRingBuffer:
+    """
+    고정 크기의 열 단위 링 버퍼입니다. (NumPy 배열, 샘플 하나 추가는 O(1))
+
+    각 열을 용량의 두 배 길이로 잡고 같은 값을 i 와 i + capacity 두 곳에 기록하므로,
+    최근 n 개 샘플은 항상 연속된 구간이 되어 복사 없이 view 로 꺼낼 수 있습니다.
+    용량을 넘으면 가장 오래된 샘플부터 덮어쓰므로 메모리 사용량이 일정합니다.
+
+        buffer = ColumnarRingBuffer(3600, ['timestamp', 'temperature', 'humidity', 'next_temp'])
+        buffer.append(timestamp=time.time(), temperature=23.0, humidity=50.0)
+        temps = buffer.column('temperature', 100)   # 최근 100개 (view)
+    """
+
+    def __init__(self, capacity, columns, dtype=np.float64, fill=np.nan):
+        if capacity <= 0:
+            raise ValueError("capacity 는 1 이상이어야 합니다.")
+        self.capacity = capacity
+        self.columns = list(columns)
+        self.index = {name: i for i, name in enumerate(self.columns)}
+        self.fill = fill
+        self.data = np.full((len(self.columns), 2 * capacity), fill, dtype=dtype)
+        self.head = 0       # 다음에 기록할 위치
+        self.size = 0       # 현재 저장된 샘플 수
+        self.total = 0      # 지금까지 추가된 샘플 수
+
+    def __len__(self):
+        return self.size
+
+    def append(self, values=None, **named):
+        """
+        샘플 하나를 추가합니다. values 는 열 순서의 시퀀스, 또는 열 이름=값 으로 지정합니다.
+        지정하지 않은 열은 fill 값(기본 NaN)이 됩니다.
+        """
+        pos = self.head
+        if values is not None:
+            row = values
+        else:
+            row = [named.get(name, self.fill) for name in self.columns]
+        self.data[:, pos] = row
+        self.data[:, pos + self.capacity] = row
+        self.head = (pos + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        self.total += 1
+
+    def set(self, column, value, age=1):
+        """
+        age 번째 최근 샘플(1 = 마지막 샘플)의 column 값을 바꿉니다.
+        """
+        if not 1 <= age <= self.size:
+            raise IndexError("버퍼에 해당 샘플이 없습니다.")
+        pos = (self.head - age) % self.capacity
+        i = self.index[column]
+        self.data[i, pos] = value
+        self.data[i, pos + self.capacity] = value
+
+    def _bounds(self, n):
+        n = self.size if n is None else min(n, self.size)
+        end = self.head + self.capacity
+        return end - n, end
+
+    def column(self, name, n=None):
+        """
+        최근 n 개(없으면 전체) 샘플의 열 값을 시간 순서대로 반환합니다. (복사 없는 view)
+        """
+        start, end = self._bounds(n)
+        return self.data[self.index[name], start:end]
+
+    def window(self, n=None):
+        """
+        최근 n 개 샘플을 {열 이름: view} 로 반환합니다.
+        """
+        start, end = self._bounds(n)
+        return {name: self.data[i, start:end] for name, i in self.index.items()}
+
+    def sample_numbers(self, n=None):
+        """
+        최근 n 개 샘플의 일련번호 (처음 추가된 샘플이 0)
+        """
+        count = self.size if n is None else min(n, self.size)
+        return np.arange(self.total - count, self.total)
+
+    def to_dataframe(self, n=None):
+        """
+        최근 n 개 샘플을 pandas DataFrame 으로 복사해서 반환합니다. (인덱스는 샘플 일련번호)
+        """
+        import pandas as pd
+        start, end = self._bounds(n)
+        return pd.DataFrame(self.data[:, start:end].T.copy(), columns=self.columns,
+                            index=self.sample_numbers(n))
@@ -0,0 +1,100 @@
+import os
+import time
+import tempfile
+
+from googlespreadsheet import GspreadSession, BufferedSheetWriter, update_gspread_sheet_data
+from gspread_uploader import BackgroundUploader
+from gspread_spool import SampleSpool, SpoolReplayer
+from gspread_fanin import FanInWriter
+from fake_gspread import FakeClient
+from sensor_traces import generate_dht11_trace, trace_rows
+
+
+# 벤치마크 설정
+BENCH_ROWS      = 300      # 업로더마다 기록할 행 수
+BENCH_LATENCY   = 0.02     # 요청 하나의 가짜 네트워크 지연 (초)
+SHEET_NAME      = 'dht11_sensor'
+
+
+def make_rows(count):
+    trace = generate_dht11_trace(count * 2.0, period=2.0, start='2025-06-16 15:00:00', seed=0)
+    return trace_rows(trace, ['temperature', 'humidity'])
+
+
+def per_cell(session, rows):
+    # 기존 방식: 열마다 update_cell 호출
+    worksheet = session.worksheet(SHEET_NAME)
+    for i, row in enumerate(rows):
+        for j, value in enumerate(row):
+            worksheet.update_cell(i + 1, j + 1, value)
+
+
+def per_row(session, rows):
+    for i, row in enumerate(rows):
+        update_gspread_sheet_data(SHEET_NAME, [i + 1, row], session=session)
+
+
+def buffered(session, rows):
+    writer = BufferedSheetWriter(SHEET_NAME, session=session)
+    for row in rows:
+        writer.add(row)
+    writer.close()
+
+
+def background(session, rows):
+    uploader = BackgroundUploader(SHEET_NAME, session=session, flush_seconds=0.05)
+    for row in rows:
+        uploader.put(row)
+    uploader.close()
+
+
+def spooled(session, rows):
+    path = os.path.join(tempfile.mkdtemp(), 'bench_spool.db')
+    spool = SampleSpool(path)
+    replayer = SpoolReplayer(spool, SHEET_NAME, session=session, flush_seconds=0.05)
+    for row in rows:
+        replayer.put(row)
+    replayer.close()
+    spool.close()
+
+
+def fanin(session, rows):
+    writer = FanInWriter(session=session, flush_seconds=0.05)
+    channel = writer.channel(SHEET_NAME)
+    for row in rows:
+        channel.put(row)
+    writer.close()
+
+
+def run(name, func, rows):
+    client = FakeClient(latency=BENCH_LATENCY)
+    session = GspreadSession(client_factory=lambda: client)
+    session.worksheet(SHEET_NAME)
+    client.stats.reset()
+
+    start = time.perf_counter()
+    func(session, rows)
+    elapsed = time.perf_counter() - start
+
+    stats = client.stats.snapshot()
+    written = len(session.worksheet(SHEET_NAME).get_all_values())
+    print(f"{name:<12} 요청 {stats['requests']:>5}  "
+          f"행당 요청 {stats['requests'] / len(rows):6.3f}  "
+          f"초당 행 {len(rows) / elapsed:9.1f}  기록된 행 {written}")
+
+
+def main():
+    rows = make_rows(BENCH_ROWS)
+    print(f"행 {BENCH_ROWS}개, 요청당 지연 {BENCH_LATENCY * 1000:.0f} ms")
+    print("-" * 70)
+    run('per_cell', per_cell, rows)
+    run('per_row', per_row, rows)
+    run('buffered', buffered, rows)
+    run('background', background, rows)
+    run('spool', spooled, rows)
+    run('fanin', fanin, rows)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,123 @@
+import datetime
+
+import numpy as np
+
+
+# 값이 변하지 않아도 이 시간(초)마다 한 번은 행을 보냄 (센서가 살아 있음을 표시)
+DEADBAND_HEARTBEAT_SECONDS = 300
+# 복원할 때 heartbeat 보다 이만큼 더 오래 행이 없으면 그 구간은 센서 / 업로드 중단으로 보고 NaN 으로 둠 (초)
+DEADBAND_HOLD_SLACK_SECONDS = 10
+
+
+class DeadbandEncoder:
+    """
+    채널별 deadband 인코더입니다.
+
+    어느 채널이든 마지막으로 보낸 값보다 threshold 를 넘게 변했거나,
+    마지막 전송 후 heartbeat_seconds 가 지났을 때만 행을 보냅니다.
+    threshold 를 센서 분해능(DHT11 은 1 단위)보다 작게 주면 값이 바뀔 때만 보내는 방식이 됩니다.
+    """
+
+    def __init__(self, thresholds, heartbeat_seconds=DEADBAND_HEARTBEAT_SECONDS):
+        self.thresholds = list(thresholds)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.last_values = [None] * len(self.thresholds)
+        self.last_emit = None
+        self.emitted = 0
+        self.suppressed = 0
+
+    def should_emit(self, values, when=None):
+        """
+        values 를 보내야 하면 True 를 반환하고 기준값을 갱신합니다.
+        """
+        when = when or datetime.datetime.now()
+        emit = self.last_emit is None
+        if not emit and (when - self.last_emit).total_seconds() >= self.heartbeat_seconds:
+            emit = True
+        if not emit:
+            for value, last, threshold in zip(values, self.last_values, self.thresholds):
+                if value is None:
+                    continue
+                if last is None or abs(float(value) - last) > threshold:
+                    emit = True
+                    break
+        if emit:
+            self.last_emit = when
+            self.last_values = [last if value is None else float(value)
+                                for value, last in zip(values, self.last_values)]
+            self.emitted += 1
+        else:
+            self.suppressed += 1
+        return emit
+
+
+class DeadbandStage:
+    """
+    DeadbandEncoder 를 통과한 행만 uploader 로 보내는 단계입니다. (put / close 제공)
+    종료할 때는 마지막으로 걸러진 행을 보내 시계열의 끝을 맞춥니다.
+    """
+
+    def __init__(self, uploader, thresholds, heartbeat_seconds=DEADBAND_HEARTBEAT_SECONDS):
+        self.uploader = uploader
+        self.encoder = DeadbandEncoder(thresholds, heartbeat_seconds)
+        self.pending = None
+
+    def put(self, row, when=None):
+        """
+        row = [시간 문자열, 값1, 값2, ...]
+        """
+        if self.encoder.should_emit(row[1:], when):
+            self.pending = None
+            return self.uploader.put(row)
+        self.pending = row
+        return True
+
+    def close(self, timeout=None):
+        if self.pending is not None:
+            self.uploader.put(self.pending)
+            self.pending = None
+        return self.uploader.close(timeout)
+
+
+def reconstruct(timestamps, values, grid,
+                max_hold_seconds=DEADBAND_HEARTBEAT_SECONDS + DEADBAND_HOLD_SLACK_SECONDS):
+    """
+    deadband 로 걸러진 시계열을 grid 시각에 대해 복원합니다. (sample-and-hold)
+
+    timestamps: 보낸 행의 시각 (datetime64, 오름차순)
+    values: 보낸 행의 값 (1차원 또는 [행, 채널] 배열)
+    grid: 복원할 시각 (datetime64)
+    첫 행보다 이른 시각은 NaN 이 되며, 복원 오차는 채널별 threshold 이내입니다.
+    값이 그대로여도 heartbeat 마다 행을 보내므로, 마지막 행 뒤 max_hold_seconds 가 지난 시각은
+    센서 / 업로드 중단 구간으로 보고 NaN 으로 둡니다. (None 이면 다음 행까지 계속 유지)
+    """
+    timestamps = np.asarray(timestamps)
+    values = np.asarray(values, dtype=np.float64)
+    grid = np.asarray(grid)
+    idx = np.searchsorted(timestamps, grid, side='right') - 1
+    result = values[np.clip(idx, 0, None)]
+    missing = idx < 0
+    if max_hold_seconds is not None and len(timestamps):
+        held = grid - timestamps[np.clip(idx, 0, None)]
+        missing |= held > np.timedelta64(int(max_hold_seconds * 1000), 'ms')
+    result[missing] = np.nan
+    return result
+
+
+def reconstruct_arrays(arrays, period_seconds, value_columns, time_column='timestamp',
+                       heartbeat_seconds=DEADBAND_HEARTBEAT_SECONDS):
+    """
+    gspread_reader 의 {열 이름: 배열} 결과를 period_seconds 간격의 고른 시계열로 복원합니다.
+    heartbeat 는 샘플 시각에 맞춰 나가므로, heartbeat_seconds 에 한 주기 (최소 DEADBAND_HOLD_SLACK_SECONDS)
+    를 더한 것보다 긴 빈 구간은 NaN 입니다.
+    """
+    timestamps = arrays[time_column]
+    if len(timestamps) == 0:
+        return {time_column: timestamps, **{name: arrays[name] for name in value_columns}}
+    step = np.timedelta64(int(period_seconds), 's')
+    grid = np.arange(timestamps[0], timestamps[-1] + step, step)
+    max_hold = heartbeat_seconds + max(DEADBAND_HOLD_SLACK_SECONDS, period_seconds)
+    restored = {time_column: grid}
+    for name in value_columns:
+        restored[name] = reconstruct(timestamps, arrays[name], grid, max_hold)
+    return restored
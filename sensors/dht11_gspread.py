@@ -5,10 +5,48 @@ import random
 import numpy as np
 import adafruit_dht
 
-from googlespreadsheet import update_gspread_sheet_data, delete_gspread_sheet_data
+from googlespreadsheet import delete_gspread_sheet_data, ensure_gspread_worksheet
+from gspread_uploader import create_uploader, DROP_OLDEST
+from gspread_spool import SampleSpool
+from gspread_fanin import FanInWriter
+from rollup import RollupStage, rollup_header
+from deadband import DeadbandStage
+from sampling import PeriodicSampler
+from dht_manager import DHTReadManager, DHT11_MIN_INTERVAL
 
 SIMULATION = False
 
+# 업로드 큐가 가득 찼을 때의 처리 방식 (BLOCK / DROP_OLDEST / AGGREGATE)
+UPLOAD_POLICY = DROP_OLDEST
+
+# True 이면 시작할 때 시트를 지우지 않고 마지막 행 다음부터 이어서 기록합니다.
+# False 이면 기존처럼 시작할 때 시트를 초기화합니다.
+RESUME_APPEND = True
+
+# 워크시트 파티션 방식 ('day': 하루에 시트 하나, 'rows': N 행마다 시트 하나, None: 고정 시트)
+# 장기간 실행하면 시트 하나가 계속 커지므로 파티션을 사용하는 것이 좋습니다.
+PARTITION_MODE = None
+
+# 설정하면 ROLLUP_SECONDS 구간별 min / mean / max / count 를 '<시트>_<초>s' 시트에 업로드합니다.
+# (None 이면 집계하지 않음) UPLOAD_RAW 가 False 이면 원본 행은 업로드하지 않습니다.
+ROLLUP_SECONDS = None
+UPLOAD_RAW = True
+
+# 원본 행을 값이 임계값보다 크게 바뀌었을 때만 업로드 (None 이면 모든 행 업로드)
+# 예: DEADBAND_THRESHOLDS = [0.5, 0.5]  # [온도, 습도] (DHT11 은 1 단위이므로 값이 바뀔 때만 전송)
+DEADBAND_THRESHOLDS = None
+
+# 측정값을 먼저 기록할 로컬 스풀 파일 (None 이면 스풀 없이 메모리 큐로 업로드)
+# 네트워크가 끊겨도 측정값이 보존되며, 복구되면 한꺼번에 업로드됩니다.
+SPOOL_PATH = 'dht11_spool.db'
+
+# 센서 읽기 실패 시 같은 샘플 구간 안에서 재시도하고, 그래도 실패하면 마지막 정상값을 사용합니다.
+# DHT_MIN_INTERVAL: 센서 최소 읽기 간격 (adafruit_dht 는 DHT11 / DHT22 모두 2초 안에는 이전 값을 돌려줌)
+# UPLOAD_CACHED: True 이면 새로 읽지 못한 샘플에 마지막 정상값(DHT_CACHE_MAX_AGE 초 이내)을 업로드
+DHT_MIN_INTERVAL = DHT11_MIN_INTERVAL
+DHT_CACHE_MAX_AGE = 30
+UPLOAD_CACHED = False
+
 # DHT22 센서를 GPIO4 (Board D4)에 연결했다고 가정합니다.
 # DHT11을 사용하는 경우:
 try:
@@ -50,21 +88,61 @@ def read_dht11_sensor():
 def main():
     
     sheet_name = 'dht11_sensor'
-    # Sheet 초기화
-    delete_gspread_sheet_data(sheet_name)
+    # RESUME_APPEND 이면 시트를 그대로 둠 (업로드는 append_rows 이므로 서버가 마지막 행 다음에 추가함)
+    if not PARTITION_MODE and not RESUME_APPEND:
+        # Sheet 초기화
+        delete_gspread_sheet_data(sheet_name)
+    # 업로드는 별도 스레드에서 처리하여 센서 측정 주기가 네트워크에 밀리지 않도록 함
+    # 스풀은 원본 / 집계 업로더가 함께 사용하며, 종료할 때 업로더를 멈춘 뒤 닫음
+    spool = SampleSpool(SPOOL_PATH) if SPOOL_PATH and not PARTITION_MODE else None
+    # 파티션 모드에서는 원본 / 집계 writer 가 FanInWriter 하나를 함께 써서 인덱스 시트를 한 곳에서 갱신
+    fanin = FanInWriter() if PARTITION_MODE else None
+    raw_uploader = None
+    if not ROLLUP_SECONDS or UPLOAD_RAW:
+        raw_uploader = create_uploader(sheet_name, PARTITION_MODE, spool, UPLOAD_POLICY, fanin)
+        if DEADBAND_THRESHOLDS:
+            raw_uploader = DeadbandStage(raw_uploader, DEADBAND_THRESHOLDS)
+    uploader = raw_uploader
+    if ROLLUP_SECONDS:
+        # 센서 값과 업로더 사이에서 구간 집계
+        rollup_sheet = f'{sheet_name}_{ROLLUP_SECONDS}s'
+        # 파티션 모드에서는 파티션 시트에만 기록하므로 기본 집계 시트를 만들지 않음
+        if not PARTITION_MODE:
+            ensure_gspread_worksheet(rollup_sheet, header=rollup_header(['temperature', 'humidity']))
+        rollup_uploader = create_uploader(rollup_sheet, PARTITION_MODE, spool, UPLOAD_POLICY, fanin)
+        uploader = RollupStage({ROLLUP_SECONDS: rollup_uploader}, raw_uploader, num_values=2)
     
-    count = 0 
-    while True:
-        try:
-            now = datetime.datetime.now()
-            t_time = now.strftime("%Y-%m-%d %H:%M:%S")
-            values = read_dht11_sensor()
-            if values[0]:
-                update_gspread_sheet_data(sheet_name, [ count + 1, [t_time, values[0], values[1]]])
-            count += 1
-            time.sleep(2)        
-        except Exception as e:
-            print(str(e))
+    # 작업 시간과 상관없이 2초 간격의 절대 시각에 맞춰 측정
+    sampler = PeriodicSampler(2)
+    manager = DHTReadManager(read_dht11_sensor, DHT_MIN_INTERVAL, cache_max_age=DHT_CACHE_MAX_AGE)
+    try:
+        while True:
+            try:
+                sampler.wait()
+                now = datetime.datetime.now()
+                t_time = now.strftime("%Y-%m-%d %H:%M:%S")
+                # 재시도는 다음 샘플 시각을 늦추지 않는 범위에서만 수행
+                # 샘플 예정 시각이 2초 간격이면 읽기 전에 기다리지 않으므로 읽는 시각이 밀리지 않음
+                deadline = sampler.next_deadline()
+                reading = manager.read(deadline=deadline, scheduled=deadline - sampler.period)
+                if reading.temperature is None:
+                    continue
+                if reading.fresh:
+                    uploader.put([t_time, reading.temperature, reading.humidity])
+                else:
+                    print(f"마지막 정상값 사용 ({reading.age:.1f}초 전): {reading.temperature}, {reading.humidity}")
+                    if UPLOAD_CACHED:
+                        uploader.put([t_time, reading.temperature, reading.humidity])
+            except Exception as e:
+                print(str(e))
+    finally:
+        uploader.close()
+        if fanin is not None:
+            fanin.close()
+        if spool is not None:
+            spool.close()
+        print(sampler.report())
+        print(manager.report())
         
     
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+import time
+import collections
+
+
+# DHT 센서의 최소 읽기 간격 (초). 이보다 빨리 읽으면 센서가 응답하지 않거나 이전 값을 돌려줍니다.
+# DHT11 데이터시트는 1초이지만 adafruit_dht 는 모델과 상관없이 2초 안의 재호출에 이전 값을 돌려주므로 2초
+DHT11_MIN_INTERVAL = 2.0
+DHT22_MIN_INTERVAL = 2.0
+
+DHT_MAX_ATTEMPTS   = 3     # 샘플 하나당 최대 읽기 시도 수
+DHT_BACKOFF        = 1.5   # 실패할 때마다 다음 시도까지의 간격을 늘리는 배수
+DHT_MAX_BACKOFF    = 3.0   # 재시도 간격의 상한 (초)
+DHT_CACHE_MAX_AGE  = 30.0  # 이보다 오래된 마지막 정상값은 돌려주지 않음 (초)
+DHT_DEADLINE_SLACK = 0.05  # 재시도 때문에 다음 샘플이 이만큼까지 늦어지는 것은 허용 (초)
+
+
+# fresh: 이번에 새로 읽은 값이면 True, 마지막 정상값(캐시)이면 False
+# age: 값을 읽은 뒤 지난 시간 (초), attempts: 이번 호출에서 실제로 센서를 읽은 횟수
+DHTReading = collections.namedtuple('DHTReading', ['temperature', 'humidity', 'age', 'fresh', 'attempts'])
+
+
+class DHTReadManager:
+    """
+    DHT 센서 읽기를 관리합니다.
+
+    - 마지막 읽기 시도를 시작한 뒤 min_interval 이 지나기 전에는 센서를 읽지 않습니다.
+      read(scheduled=...) 로 샘플의 예정 시각을 주면, 예정 시각끼리 min_interval 이상 떨어져 있을 때는
+      (고정 주기 샘플러) 기다리지 않고 바로 읽으므로 읽는 시각이 샘플마다 밀리지 않습니다.
+    - 읽기에 실패하면 min_interval 뒤에 재시도하고, 이후 간격을 DHT_BACKOFF 배씩 늘립니다.
+      재시도 때문에 deadline(다음 샘플 시각)의 읽기가 늦어진다면 재시도하지 않습니다.
+    - 새 값을 읽지 못하면 마지막 정상값을 나이(age)와 함께 돌려줍니다.
+
+    read_fn() 은 (온도, 습도) 를 반환하며, 실패하면 (None, None) 을 반환하거나 RuntimeError 를 냅니다.
+    """
+
+    def __init__(self, read_fn, min_interval=DHT11_MIN_INTERVAL, max_attempts=DHT_MAX_ATTEMPTS,
+                 backoff=DHT_BACKOFF, max_backoff=DHT_MAX_BACKOFF, cache_max_age=DHT_CACHE_MAX_AGE,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.read_fn = read_fn
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cache_max_age = cache_max_age
+        self.clock = clock
+        self.sleep = sleep
+
+        # 마지막 읽기 시도를 시작한 시각 / 그 읽기의 예정 시각
+        self.last_attempt = None
+        self.last_scheduled = None
+        self.last_good = None
+        self.last_good_time = None
+
+        self.reads = 0
+        self.failures = 0
+        self.recovered = 0
+        self.cached = 0
+        self.missing = 0
+
+    def _attempt(self):
+        # 라이브러리의 최소 간격도 읽기를 시작한 시각부터 재므로 같은 기준을 사용
+        self.last_attempt = self.clock()
+        self.reads += 1
+        try:
+            temperature, humidity = self.read_fn()
+        except RuntimeError as error:
+            print(f"센서 읽기 오류: {error.args[0]}")
+            return None
+        if temperature is None or humidity is None:
+            return None
+        return temperature, humidity
+
+    def read(self, deadline=None, scheduled=None):
+        """
+        DHTReading 을 반환합니다. 새 값도 쓸 수 있는 캐시도 없으면 온도 / 습도가 None 입니다.
+        deadline 은 clock() 기준 시각이며, 이 시각을 넘겨서 재시도하지 않습니다.
+        scheduled 는 이번 샘플의 예정 시각입니다. (PeriodicSampler 의 마감 시각)
+        """
+        interval = self.min_interval
+        attempts = 0
+        while attempts < self.max_attempts:
+            now = self.clock()
+            if self.last_attempt is None:
+                ready = now
+            elif (not attempts and scheduled is not None and self.last_scheduled is not None
+                    and scheduled - self.last_scheduled >= self.min_interval):
+                # 이전 읽기와 예정 시각이 이미 min_interval 이상 떨어져 있으므로 기다리지 않음
+                ready = now
+            else:
+                ready = max(now, self.last_attempt + interval)
+            # 재시도 후에도 다음 샘플을 제시간에 읽을 수 있을 때만 재시도
+            # (재시도 시각 + 최소 간격이 deadline 안에 들어와야 다음 샘플이 이전 값을 돌려받지 않음)
+            if attempts and deadline is not None and ready + self.min_interval > deadline + DHT_DEADLINE_SLACK:
+                break
+            if ready > now:
+                self.sleep(ready - now)
+
+            attempts += 1
+            values = self._attempt()
+            # 재시도는 예정 시각 없이 시작한 시각이 기준
+            self.last_scheduled = scheduled if attempts == 1 and scheduled is not None else self.last_attempt
+            if values is not None:
+                if attempts > 1:
+                    self.recovered += 1
+                self.last_good = values
+                self.last_good_time = self.last_attempt
+                return DHTReading(values[0], values[1], 0.0, True, attempts)
+            self.failures += 1
+            if attempts > 1:
+                interval = min(interval * self.backoff, self.max_backoff)
+
+        if self.last_good is not None:
+            age = self.clock() - self.last_good_time
+            if self.cache_max_age is None or age <= self.cache_max_age:
+                self.cached += 1
+                return DHTReading(self.last_good[0], self.last_good[1], age, False, attempts)
+        self.missing += 1
+        return DHTReading(None, None, None, False, attempts)
+
+    def stats(self):
+        return {
+            'reads': self.reads,
+            'failures': self.failures,
+            'recovered': self.recovered,
+            'cached': self.cached,
+            'missing': self.missing,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"DHT 읽기 {s['reads']}회, 실패 {s['failures']}회, 재시도로 복구 {s['recovered']}회, "
+                f"캐시 사용 {s['cached']}회, 값 없음 {s['missing']}회")
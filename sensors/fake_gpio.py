@@ -0,0 +1,209 @@
+"""
+라즈베리파이 없이 HC-SR04 코드를 테스트하기 위한 RPi.GPIO 대체 모듈입니다.
+
+RPi.GPIO 와 같은 함수(setmode / setup / output / input / add_event_detect / wait_for_edge ...)를
+제공하며, attach_hc_sr04() 로 TRIG / ECHO 핀에 가상의 초음파 센서를 연결할 수 있습니다.
+TRIG 펄스가 끝나면 ECHO 핀이 ECHO_LEAD_SECONDS 뒤 HIGH 가 되고,
+거리에 해당하는 시간(2 * 거리 / 음속)만큼 유지된 뒤 LOW 가 됩니다.
+
+    import fake_gpio as GPIO
+    GPIO.attach_hc_sr04(27, 17, lambda: 120.0)
+"""
+import time
+import queue
+import threading
+
+
+BCM   = 11
+BOARD = 10
+OUT   = 0
+IN    = 1
+LOW   = 0
+HIGH  = 1
+RISING  = 31
+FALLING = 32
+BOTH    = 33
+PUD_OFF  = 20
+PUD_DOWN = 21
+PUD_UP   = 22
+
+# 가상 센서 설정
+SPEED_OF_SOUND    = 34300     # cm/s
+ECHO_LEAD_SECONDS = 0.0005    # TRIG 펄스 후 ECHO 가 HIGH 가 되기까지의 시간
+ECHO_NO_TARGET_SECONDS = 0.038  # 물체가 없을 때 ECHO 펄스 길이 (HC-SR04 사양)
+
+
+class _Sensor:
+    def __init__(self, trigger, echo, distance_fn):
+        self.trigger = trigger
+        self.echo = echo
+        self.distance_fn = distance_fn
+        # ECHO 가 HIGH 인 구간 (perf_counter 기준)
+        self.rise = None
+        self.fall = None
+
+
+_lock = threading.Lock()
+_mode = None
+_levels = {}
+_directions = {}
+_sensors = {}      # trigger 핀 -> _Sensor
+_echo_pins = {}    # echo 핀 -> _Sensor
+_callbacks = {}    # 핀 -> (edge, [callback, ...])
+_workers = {}      # 핀 -> 엣지 전달 스레드의 queue
+
+
+def setwarnings(flag):
+    pass
+
+
+def setmode(mode):
+    global _mode
+    _mode = mode
+
+
+def getmode():
+    return _mode
+
+
+def setup(channel, direction, pull_up_down=PUD_OFF, initial=LOW):
+    if _mode is None:
+        raise RuntimeError("Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or GPIO.setmode(GPIO.BCM)")
+    for pin in _channels(channel):
+        _directions[pin] = direction
+        _levels.setdefault(pin, initial if direction == OUT else LOW)
+
+
+def _channels(channel):
+    if isinstance(channel, (list, tuple)):
+        return list(channel)
+    return [channel]
+
+
+def output(channel, value):
+    for pin in _channels(channel):
+        if _directions.get(pin) != OUT:
+            raise RuntimeError("The GPIO channel has not been set up as an OUTPUT")
+        previous = _levels.get(pin, LOW)
+        _levels[pin] = HIGH if value else LOW
+        sensor = _sensors.get(pin)
+        # TRIG 펄스가 끝나는 순간(HIGH -> LOW) 초음파 발사
+        if sensor is not None and previous == HIGH and not value:
+            _fire(sensor)
+
+
+def _fire(sensor):
+    distance = sensor.distance_fn()
+    if distance is None:
+        width = ECHO_NO_TARGET_SECONDS
+    else:
+        width = 2 * float(distance) / SPEED_OF_SOUND
+    with _lock:
+        sensor.rise = time.perf_counter() + ECHO_LEAD_SECONDS
+        sensor.fall = sensor.rise + width
+    worker = _workers.get(sensor.echo)
+    if worker is not None:
+        worker.put((sensor, sensor.rise, sensor.fall))
+
+
+def _sleep_until(deadline):
+    remaining = deadline - time.perf_counter()
+    if remaining > 0.003:
+        time.sleep(remaining - 0.002)
+    # 마지막 2ms 는 정밀도를 위해 대기
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _deliver_edges(events):
+    # RPi.GPIO 처럼 핀마다 하나의 스레드에서 콜백을 순서대로 호출
+    while True:
+        item = events.get()
+        if item is None:
+            return
+        sensor, rise, fall = item
+        for when, kind in ((rise, RISING), (fall, FALLING)):
+            _sleep_until(when)
+            entry = _callbacks.get(sensor.echo)
+            if entry is None:
+                break
+            edge, callbacks = entry
+            if edge in (kind, BOTH):
+                for callback in list(callbacks):
+                    callback(sensor.echo)
+
+
+def input(channel):
+    sensor = _echo_pins.get(channel)
+    if sensor is not None:
+        with _lock:
+            rise, fall = sensor.rise, sensor.fall
+        if rise is None:
+            return LOW
+        return HIGH if rise <= time.perf_counter() < fall else LOW
+    return _levels.get(channel, LOW)
+
+
+def add_event_detect(channel, edge, callback=None, bouncetime=None):
+    if channel in _callbacks:
+        raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+    _callbacks[channel] = (edge, [callback] if callback else [])
+    events = queue.Queue()
+    threading.Thread(target=_deliver_edges, args=(events,), name=f"gpio-edge-{channel}", daemon=True).start()
+    _workers[channel] = events
+
+
+def add_event_callback(channel, callback):
+    if channel not in _callbacks:
+        raise RuntimeError("Add event detection using add_event_detect first before adding a callback")
+    _callbacks[channel][1].append(callback)
+
+
+def remove_event_detect(channel):
+    _callbacks.pop(channel, None)
+    events = _workers.pop(channel, None)
+    if events is not None:
+        events.put(None)
+
+
+def wait_for_edge(channel, edge, bouncetime=None, timeout=None):
+    """
+    RPi.GPIO 와 같이 timeout 은 밀리초 단위이며, 시간 안에 엣지가 없으면 None 을 반환합니다.
+    """
+    deadline = None if timeout is None else time.perf_counter() + timeout / 1000
+    previous = input(channel)
+    while deadline is None or time.perf_counter() < deadline:
+        level = input(channel)
+        if level != previous:
+            if edge == BOTH or (edge == RISING and level == HIGH) or (edge == FALLING and level == LOW):
+                return channel
+            previous = level
+        time.sleep(0.00005)
+    return None
+
+
+def cleanup(channel=None):
+    global _mode
+    pins = list(_levels) if channel is None else _channels(channel)
+    for pin in pins:
+        _levels.pop(pin, None)
+        _directions.pop(pin, None)
+        remove_event_detect(pin)
+    if channel is None:
+        _mode = None
+
+
+def attach_hc_sr04(trigger, echo, distance_fn):
+    """
+    trigger / echo 핀에 가상 HC-SR04 를 연결합니다.
+    distance_fn() 은 측정할 때마다 호출되며 거리(cm)를 반환합니다. (None 이면 물체 없음)
+    """
+    sensor = _Sensor(trigger, echo, distance_fn)
+    _sensors[trigger] = sensor
+    _echo_pins[echo] = sensor
+    return sensor
+
+
+def detach_all():
+    _sensors.clear()
+    _echo_pins.clear()
@@ -0,0 +1,353 @@
+import time
+import random
+import threading
+import collections
+
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range, absolute_range_name, rowcol_to_a1
+
+
+# 기본 워크시트 크기 (Google Sheets 새 시트 기본값)
+FAKE_DEFAULT_ROWS = 1000
+FAKE_DEFAULT_COLS = 26
+
+
+class FakeResponse:
+    """
+    gspread APIError 를 만들기 위한 최소한의 HTTP 응답 객체입니다.
+    """
+
+    def __init__(self, status_code, message, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = message
+        self._error = {'code': status_code, 'message': message, 'status': 'FAKE'}
+
+    def json(self):
+        return {'error': self._error}
+
+
+def make_api_error(status_code, message, retry_after=None):
+    headers = {}
+    if retry_after is not None:
+        headers['Retry-After'] = str(retry_after)
+    return APIError(FakeResponse(status_code, message, headers))
+
+
+class FakeStats:
+    """
+    fake client 가 처리한 요청 수를 집계합니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.reads = 0
+        self.writes = 0
+        self.errors = 0
+        self.rows_written = 0
+        self.cells_written = 0
+        self.by_method = collections.Counter()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'reads': self.reads,
+                'writes': self.writes,
+                'errors': self.errors,
+                'rows_written': self.rows_written,
+                'cells_written': self.cells_written,
+                'by_method': dict(self.by_method),
+            }
+
+
+class FakeClient:
+    """
+    gspread Client / Spreadsheet / Worksheet 를 메모리에서 흉내 내는 테스트용 client 입니다.
+
+    - latency: 요청마다 지연 시간 (초), jitter 만큼 무작위로 더해집니다.
+    - read_quota / write_quota: 분당 허용 요청 수. 넘으면 429 APIError (Retry-After 포함)
+    - error_rate: 요청이 503 으로 실패할 확률
+    - fail_next(): 다음 n 개의 요청을 지정한 상태 코드로 실패시킴
+
+    GspreadSession(client_factory=lambda: client) 형태로 주입해서 사용합니다.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, read_quota=None, write_quota=None,
+                 error_rate=0.0, seed=None, sheets=('dht11_sensor', 'hc_sr0_sensor'),
+                 auto_create=False):
+        self.latency = latency
+        self.jitter = jitter
+        self.read_quota = read_quota
+        self.write_quota = write_quota
+        self.error_rate = error_rate
+        self.auto_create = auto_create
+        self.random = random.Random(seed)
+        self.stats = FakeStats()
+        self.lock = threading.RLock()
+        self.spreadsheets = {}
+        self.initial_sheets = list(sheets)
+        self._read_times = collections.deque()
+        self._write_times = collections.deque()
+        self._forced_errors = collections.deque()
+
+    def fail_next(self, count=1, status_code=503, retry_after=None):
+        with self.lock:
+            for _ in range(count):
+                self._forced_errors.append((status_code, retry_after))
+
+    def _check_quota(self, times, quota, now):
+        while times and now - times[0] >= 60:
+            times.popleft()
+        if quota is not None and len(times) >= quota:
+            retry_after = max(1, int(60 - (now - times[0])) + 1)
+            raise make_api_error(429, 'Quota exceeded (fake)', retry_after)
+        times.append(now)
+
+    def request(self, method, write=False, rows=0, cells=0):
+        """
+        요청 하나를 처리합니다. 지연, 오류, 쿼터를 적용하고 통계를 기록합니다.
+        """
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        with self.lock, self.stats.lock:
+            self.stats.requests += 1
+            self.stats.by_method[method] += 1
+            try:
+                if self._forced_errors:
+                    status_code, retry_after = self._forced_errors.popleft()
+                    raise make_api_error(status_code, 'Injected error (fake)', retry_after)
+                if self.error_rate and self.random.random() < self.error_rate:
+                    raise make_api_error(503, 'Service unavailable (fake)')
+                now = time.monotonic()
+                if write:
+                    self._check_quota(self._write_times, self.write_quota, now)
+                else:
+                    self._check_quota(self._read_times, self.read_quota, now)
+            except APIError:
+                self.stats.errors += 1
+                raise
+            if write:
+                self.stats.writes += 1
+                self.stats.rows_written += rows
+                self.stats.cells_written += cells
+            else:
+                self.stats.reads += 1
+
+    def open_by_url(self, url):
+        self.request('open_by_url')
+        with self.lock:
+            doc = self.spreadsheets.get(url)
+            if doc is None:
+                doc = FakeSpreadsheet(self, url, self.initial_sheets)
+                self.spreadsheets[url] = doc
+            return doc
+
+
+class FakeSpreadsheet:
+
+    def __init__(self, client, url, sheets=()):
+        self.client = client
+        self.url = url
+        self.sheets = collections.OrderedDict()
+        self.next_sheet_id = 0
+        for title in sheets:
+            self._new_worksheet(title)
+
+    def _new_worksheet(self, title, rows=FAKE_DEFAULT_ROWS, cols=FAKE_DEFAULT_COLS):
+        worksheet = FakeWorksheet(self, title, rows, cols, sheet_id=self.next_sheet_id)
+        self.next_sheet_id += 1
+        self.sheets[title] = worksheet
+        return worksheet
+
+    def _lookup(self, range_name):
+        title, _, cells = range_name.rpartition('!')
+        title = title.strip("'").replace("''", "'")
+        worksheet = self.sheets.get(title)
+        if worksheet is None:
+            raise make_api_error(400, f'Unable to parse range: {range_name}')
+        return worksheet, cells
+
+    def worksheet(self, title):
+        self.client.request('worksheet')
+        with self.client.lock:
+            worksheet = self.sheets.get(title)
+            if worksheet is None:
+                if not self.client.auto_create:
+                    raise WorksheetNotFound(title)
+                worksheet = self._new_worksheet(title)
+            return worksheet
+
+    def worksheets(self):
+        self.client.request('worksheets')
+        with self.client.lock:
+            return list(self.sheets.values())
+
+    def add_worksheet(self, title, rows, cols, index=None):
+        self.client.request('add_worksheet', write=True)
+        with self.client.lock:
+            if title in self.sheets:
+                raise make_api_error(400, f'A sheet with the name "{title}" already exists.')
+            return self._new_worksheet(title, rows, cols)
+
+    def values_batch_update(self, body=None):
+        data = body.get('data', [])
+        rows = sum(len(item['values']) for item in data)
+        cells = sum(len(row) for item in data for row in item['values'])
+        self.client.request('values_batch_update', write=True, rows=rows, cells=cells)
+        with self.client.lock:
+            targets = []
+            # 범위 하나라도 잘못되면 아무것도 쓰지 않음
+            for item in data:
+                worksheet, cells_range = self._lookup(item['range'])
+                r1, c1, _, _ = worksheet._range(cells_range)
+                values = item['values']
+                worksheet._check_grid(r1 + len(values) - 1, c1 + max((len(row) for row in values), default=1) - 1)
+                targets.append((worksheet, r1, c1, values))
+            for worksheet, r1, c1, values in targets:
+                worksheet._write(r1, c1, values)
+        return {'totalUpdatedRows': rows, 'totalUpdatedCells': cells}
+
+    def values_batch_get(self, ranges, params=None):
+        self.client.request('values_batch_get')
+        value_ranges = []
+        with self.client.lock:
+            for range_name in ranges:
+                worksheet, cells_range = self._lookup(range_name)
+                values = worksheet._read(*worksheet._range(cells_range))
+                value_ranges.append({'range': range_name, 'values': values})
+        return {'valueRanges': value_ranges}
+
+    def batch_update(self, body):
+        self.client.request('batch_update', write=True)
+        with self.client.lock:
+            by_id = {worksheet.id: worksheet for worksheet in self.sheets.values()}
+            for request in body.get('requests', []):
+                if 'appendDimension' in request:
+                    spec = request['appendDimension']
+                    worksheet = by_id[spec['sheetId']]
+                    if spec.get('dimension', 'ROWS') == 'ROWS':
+                        worksheet.row_count += spec['length']
+                    else:
+                        worksheet.col_count += spec['length']
+                elif 'addSheet' in request:
+                    properties = request['addSheet']['properties']
+                    grid = properties.get('gridProperties', {})
+                    if properties['title'] not in self.sheets:
+                        self._new_worksheet(properties['title'],
+                                            grid.get('rowCount', FAKE_DEFAULT_ROWS),
+                                            grid.get('columnCount', FAKE_DEFAULT_COLS))
+                else:
+                    raise make_api_error(400, f'Unsupported request (fake): {list(request)}')
+        return {'replies': []}
+
+
+class FakeWorksheet:
+
+    def __init__(self, spreadsheet, title, rows=FAKE_DEFAULT_ROWS, cols=FAKE_DEFAULT_COLS, sheet_id=0):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.client = spreadsheet.client
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        # 실제 시트처럼 값은 문자열로 저장
+        self.cells = {}
+        self.max_row = 0
+        self.max_col = 0
+
+    def _range(self, range_name):
+        if '!' in range_name:
+            range_name = range_name.split('!', 1)[1]
+        grid = a1_range_to_grid_range(range_name)
+        r1 = grid.get('startRowIndex', 0) + 1
+        c1 = grid.get('startColumnIndex', 0) + 1
+        r2 = grid.get('endRowIndex', self.row_count)
+        c2 = grid.get('endColumnIndex', self.col_count)
+        return r1, c1, r2, c2
+
+    def _check_grid(self, row, col):
+        if row > self.row_count or col > self.col_count:
+            raise make_api_error(
+                400, f'Range exceeds grid limits. Max rows: {self.row_count}, max columns: {self.col_count}')
+
+    def _write(self, row, col, values):
+        for i, values_row in enumerate(values):
+            for j, value in enumerate(values_row):
+                text = '' if value is None else str(value)
+                if text:
+                    self.cells[(row + i, col + j)] = text
+                    self.max_row = max(self.max_row, row + i)
+                    self.max_col = max(self.max_col, col + j)
+                else:
+                    self.cells.pop((row + i, col + j), None)
+
+    def _read(self, r1, c1, r2, c2):
+        with self.client.lock:
+            last_row = min(r2, self.max_row)
+            last_col = min(c2, self.max_col)
+            values = [[self.cells.get((r, c), '') for c in range(c1, last_col + 1)]
+                      for r in range(r1, last_row + 1)]
+        # 실제 API 처럼 끝의 빈 행은 생략
+        while values and not any(values[-1]):
+            values.pop()
+        return values
+
+    def update_cell(self, row, col, value):
+        self.client.request('update_cell', write=True, rows=1, cells=1)
+        with self.client.lock:
+            self._check_grid(row, col)
+            self._write(row, col, [[value]])
+
+    def update(self, values, range_name=None, value_input_option=None, **kwargs):
+        cells = sum(len(row) for row in values)
+        self.client.request('update', write=True, rows=len(values), cells=cells)
+        r1, c1, _, _ = self._range(range_name or 'A1')
+        with self.client.lock:
+            self._check_grid(r1 + len(values) - 1, c1 + max((len(row) for row in values), default=1) - 1)
+            self._write(r1, c1, values)
+        return {'updatedRange': range_name, 'updatedCells': cells}
+
+    def append_rows(self, values, value_input_option=None, **kwargs):
+        cells = sum(len(row) for row in values)
+        self.client.request('append_rows', write=True, rows=len(values), cells=cells)
+        with self.client.lock:
+            start = self.max_row + 1
+            # append 는 시트 크기를 자동으로 늘림
+            self.row_count = max(self.row_count, start + len(values) - 1)
+            self._write(start, 1, values)
+        # 실제 values.append 응답처럼 기록된 범위를 돌려줌
+        width = max((len(row) for row in values), default=1)
+        updated = absolute_range_name(self.title, f'A{start}:{rowcol_to_a1(start + len(values) - 1, width)}')
+        return {'updates': {'updatedRange': updated, 'updatedRows': len(values), 'updatedCells': cells}}
+
+    def add_rows(self, rows):
+        self.client.request('add_rows', write=True)
+        with self.client.lock:
+            self.row_count += rows
+
+    def get_all_values(self, **kwargs):
+        self.client.request('get_all_values')
+        return self._read(1, 1, self.row_count, self.col_count)
+
+    def get(self, range_name=None, **kwargs):
+        self.client.request('get')
+        if range_name is None:
+            return self._read(1, 1, self.row_count, self.col_count)
+        return self._read(*self._range(range_name))
+
+    def col_values(self, col, **kwargs):
+        self.client.request('col_values')
+        return [row[0] if row else '' for row in self._read(1, col, self.row_count, col)]
+
+    def clear(self):
+        self.client.request('clear', write=True)
+        with self.client.lock:
+            self.cells.clear()
+            self.max_row = 0
+            self.max_col = 0
@@ -1,11 +1,16 @@
+import os
 import json
 import sys
 import time
 import datetime
+import threading
 
 import gspread
+from gspread.utils import rowcol_to_a1, a1_to_rowcol
 from oauth2client.service_account import ServiceAccountCredentials
 
+from gspread_scheduler import SheetsScheduler, CoalescingWriter, get_error_status
+
 
 
 GDOCS_OAUTH_JSON       = 'thermal-shuttle-462907-n3-67e56bbfe64c.json'
@@ -18,61 +23,238 @@ GDOCS_SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/1e5729Xo60oVCM6n
 FREQUENCY_SECONDS      = 30
 
 
-def get_gspread_sheet_data(sheet):
+# 토큰 만료(1시간) 전에 재인증하는 주기 (초)
+TOKEN_REFRESH_SECONDS  = 50 * 60
+
+# 버퍼 writer 가 flush 하는 기준 (행 수 / 초)
+BATCH_FLUSH_ROWS       = 30
+BATCH_FLUSH_SECONDS    = 60
+
+# 환경 변수 FAKE_GSPREAD=1 이면 인증키 없이 fake_gspread.FakeClient 로 업로드합니다. (에뮬레이터 실행용)
+# FAKE_GSPREAD_LATENCY: 가짜 요청 하나의 지연 시간 (초)
+FAKE_GSPREAD          = os.environ.get('FAKE_GSPREAD', '') not in ('', '0')
+FAKE_GSPREAD_LATENCY  = float(os.environ.get('FAKE_GSPREAD_LATENCY', '0.3'))
+
+GDOCS_SCOPE = [
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive',
+]
+
+
+def authorize_gspread_client(json_file_name=GDOCS_OAUTH_JSON, scope=GDOCS_SCOPE):
     """
-        get gspread_sheet_data
+        서비스 계정 JSON 으로 gspread client 를 인증하여 반환합니다.
     """
-    ret = False
-    ret_list = []
-
-    scope = [
-        'https://spreadsheets.google.com/feeds',
-        'https://www.googleapis.com/auth/drive',
-    ]
-    json_file_name = GDOCS_OAUTH_JSON
     credentials = ServiceAccountCredentials.from_json_keyfile_name(
         json_file_name, scope)
-    gc = gspread.authorize(credentials)
-    spreadsheet_url = GDOCS_SPREADSHEET_URL
+    return gspread.authorize(credentials)
+
+
+class GspreadSession:
+    """
+        한 번 인증한 client 와 Spreadsheet / Worksheet 객체를 재사용하는 세션입니다.
+
+        - 최초 호출 시에만 인증하고 open_by_url 을 수행합니다.
+        - Worksheet 는 이름별로 캐시합니다.
+        - TOKEN_REFRESH_SECONDS 가 지나면 토큰 만료 전에 다시 인증합니다.
+        - 401 (인증 오류) 응답을 받으면 재접속 후 한 번 재시도합니다.
+        - scheduler 가 있으면 모든 요청이 쿼터 스케줄러를 거칩니다.
+        - 잠금은 client / worksheet 캐시를 고칠 때만 잡으므로, 여러 스레드의 요청이 동시에 진행됩니다.
+    """
+
+    def __init__(self, spreadsheet_url=GDOCS_SPREADSHEET_URL,
+                 client_factory=authorize_gspread_client,
+                 refresh_seconds=TOKEN_REFRESH_SECONDS, scheduler=None):
+        self.spreadsheet_url = spreadsheet_url
+        self.client_factory = client_factory
+        self.refresh_seconds = refresh_seconds
+        self.scheduler = scheduler
+        self.lock = threading.RLock()
+        self._client = None
+        self._doc = None
+        self._worksheets = {}
+        self._authorized_at = 0.0
+        self._coalescing = None
+
+    def reset(self):
+        """
+            캐시된 client / spreadsheet / worksheet 를 모두 버립니다.
+        """
+        with self.lock:
+            self._client = None
+            self._doc = None
+            self._worksheets = {}
+
+    def _token_expiring(self):
+        if time.monotonic() - self._authorized_at >= self.refresh_seconds:
+            return True
+        credentials = getattr(self._client, 'auth', None)
+        return getattr(credentials, 'access_token_expired', False) is True
+
+    def client(self):
+        with self.lock:
+            if self._client is None or self._token_expiring():
+                self.reset()
+                self._client = self.client_factory()
+                self._authorized_at = time.monotonic()
+            return self._client
+
+    def spreadsheet(self):
+        with self.lock:
+            client = self.client()
+            if self._doc is None:
+                self._doc = client.open_by_url(self.spreadsheet_url)
+            return self._doc
+
+    def worksheet(self, sheet):
+        with self.lock:
+            doc = self.spreadsheet()
+            worksheet = self._worksheets.get(sheet)
+            if worksheet is None:
+                worksheet = doc.worksheet(sheet)
+                self._worksheets[sheet] = worksheet
+            return worksheet
+
+    def forget_worksheet(self, sheet):
+        with self.lock:
+            self._worksheets.pop(sheet, None)
+
+    def coalescing_writer(self):
+        """
+            업로더들이 함께 쓰는 CoalescingWriter 를 반환합니다. (처음 호출할 때 만듦)
+        """
+        with self.lock:
+            if self._coalescing is None:
+                self._coalescing = CoalescingWriter(self)
+            return self._coalescing
 
-    doc = gc.open_by_url(spreadsheet_url)
+    def call(self, sheet, func, write=False, acquired=False, idempotent=True):
+        """
+            func(worksheet) 를 실행합니다. 인증 오류가 나면 재접속 후 한 번 재시도합니다.
+            write 는 쓰기 요청 여부 (쿼터 구분), acquired 는 이미 토큰을 얻었는지 여부,
+            idempotent 는 5xx 오류에서 다시 보내도 되는 요청인지 여부입니다. (append 는 False)
+        """
+        return self._scheduled(lambda: func(self.worksheet(sheet)), write, acquired, idempotent)
 
-    worksheet = doc.worksheet(sheet)
+    def call_spreadsheet(self, func, write=False, acquired=False, idempotent=True):
+        """
+            func(spreadsheet) 를 실행합니다. (여러 워크시트에 걸친 batch 요청용)
+        """
+        return self._scheduled(lambda: func(self.spreadsheet()), write, acquired, idempotent)
 
-    # range
-    # range_list = worksheet.range('A1:j2')
+    def _scheduled(self, func, write, acquired, idempotent):
+        if self.scheduler is None:
+            return self._call(func)
+        return self.scheduler.execute(lambda: self._call(func), write, acquired, idempotent)
+
+    def _call(self, func):
+        # func 안에서 worksheet() / spreadsheet() 가 캐시를 읽을 때만 잠그고, HTTP 요청 중에는 잠그지 않음
+        try:
+            return func()
+        except gspread.exceptions.APIError as e:
+            if get_error_status(e) != 401:
+                raise
+            self.reset()
+            return func()
+
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def get_gspread_session():
+    """
+        프로세스 전체에서 공유하는 기본 GspreadSession 을 반환합니다.
+    """
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            if FAKE_GSPREAD:
+                from fake_gspread import FakeClient
+                client = FakeClient(latency=FAKE_GSPREAD_LATENCY, jitter=FAKE_GSPREAD_LATENCY / 2,
+                                    read_quota=60, write_quota=60, auto_create=True)
+                _default_session = GspreadSession(client_factory=lambda: client, scheduler=SheetsScheduler())
+            else:
+                _default_session = GspreadSession(scheduler=SheetsScheduler())
+        return _default_session
+
+
+def set_gspread_session(session):
+    """
+        기본 GspreadSession 을 교체합니다. (다른 spreadsheet, 테스트용 client 등)
+    """
+    global _default_session
+    with _default_session_lock:
+        _default_session = session
+
+
+def get_gspread_sheet_data(sheet, range_name=None, session=None):
+    """
+        get gspread_sheet_data
+
+        range_name (예: 'A101:C') 을 주면 해당 범위만 읽고, 없으면 시트 전체를 읽습니다.
+    """
+    ret = False
+    ret_list = []
+    session = session or get_gspread_session()
+
+    def _get(worksheet):
+        if range_name is None:
+            # all list
+            return worksheet.get_all_values()
+        # range
+        return list(worksheet.get(range_name))
 
-    # all list
     try:
-        ret_list = worksheet.get_all_values()
+        ret_list = session.call(sheet, _get)
         ret = True
     except Exception as e:
         print('Error : ' + str(e))
     return ret, ret_list
 
-def delete_gspread_sheet_data(sheet):
+def ensure_gspread_worksheet(sheet, rows=1000, cols=10, header=None, session=None):
     """
-        get gspread_sheet_data
+        워크시트가 없으면 만들고, header 가 있으면 첫 행에 기록합니다.
     """
     ret = False
     ret_list = []
+    session = session or get_gspread_session()
 
-    scope = [
-        'https://spreadsheets.google.com/feeds',
-        'https://www.googleapis.com/auth/drive',
-    ]
-    json_file_name = GDOCS_OAUTH_JSON
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(
-        json_file_name, scope)
-    gc = gspread.authorize(credentials)
-    spreadsheet_url = GDOCS_SPREADSHEET_URL
+    try:
+        session.call(sheet, lambda worksheet: worksheet)
+        ret = True
+    except gspread.exceptions.WorksheetNotFound:
+        try:
+            session.call_spreadsheet(lambda doc: doc.add_worksheet(sheet, rows, cols), write=True)
+            ret = True
+            if header:
+                ret, ret_list = append_gspread_sheet_rows(sheet, [header], session=session)
+        except Exception as e:
+            print('Error : ' + str(e))
+    except Exception as e:
+        print('Error : ' + str(e))
+    return ret, ret_list
 
-    doc = gc.open_by_url(spreadsheet_url)
+def get_gspread_last_row(sheet, session=None):
+    """
+        A 열만 읽어서 마지막으로 채워진 행 번호를 반환합니다. (빈 시트는 0, 실패하면 None)
+        시트 전체를 읽는 대신 열 하나만 읽으므로 재시작 시 이어 쓰기 위치를 싸게 찾을 수 있습니다.
+    """
+    ret, ret_list = get_gspread_sheet_data(sheet, range_name='A:A', session=session)
+    if not ret:
+        return None
+    return len(ret_list)
 
-    worksheet = doc.worksheet(sheet)
+def delete_gspread_sheet_data(sheet, session=None):
+    """
+        clear gspread_sheet_data
+    """
+    ret = False
+    ret_list = []
+    session = session or get_gspread_session()
 
     try:
-        worksheet.clear()
+        session.call(sheet, lambda worksheet: worksheet.clear(), write=True)
         ret = True
     except Exception as e:
         print('Error : ' + str(e))
@@ -80,39 +262,131 @@ def delete_gspread_sheet_data(sheet):
 
 
 
-def update_gspread_sheet_data(sheet, data):
+def update_gspread_sheet_data(sheet, data, session=None):
     """
-        get gspread_sheet_data
+        update gspread_sheet_data
+
+        data = [row, [col1, col2, ...]] 한 행을 한 번의 range update 로 기록합니다.
+    """
+    return update_gspread_sheet_rows(sheet, data[0], [data[1]], session=session)
+
+
+def update_gspread_sheet_rows(sheet, start_row, rows, session=None):
+    """
+        start_row 부터 여러 행을 한 번의 range update 요청으로 기록합니다.
     """
     ret = False
     ret_list = []
+    session = session or get_gspread_session()
+    if not rows:
+        return True, ret_list
 
-    scope = [
-        'https://spreadsheets.google.com/feeds',
-        'https://www.googleapis.com/auth/drive',
-    ]
-    json_file_name = GDOCS_OAUTH_JSON
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(
-        json_file_name, scope)
-    gc = gspread.authorize(credentials)
-    spreadsheet_url = GDOCS_SPREADSHEET_URL
+    width = max(len(row) for row in rows)
+    range_name = '%s:%s' % (rowcol_to_a1(start_row, 1),
+                            rowcol_to_a1(start_row + len(rows) - 1, width))
+
+    try:
+        session.call(sheet, lambda worksheet: worksheet.update(
+            values=rows, range_name=range_name, value_input_option='USER_ENTERED'), write=True)
+        ret = True
+    except Exception as e:
+        print('Error : ' + str(e))
+    return ret, ret_list
+
+
+def get_updated_rows(response):
+    """
+        append 응답의 updatedRange (예: 'sheet'!A5:E7) 에서 (첫 행, 마지막 행) 번호를 반환합니다. (없으면 None)
+    """
+    updated = (response or {}).get('updates', {}).get('updatedRange')
+    if not updated:
+        return None
+    cells = updated.rsplit('!', 1)[-1].split(':')
+    first = a1_to_rowcol(cells[0])[0]
+    last = a1_to_rowcol(cells[-1])[0]
+    return first, last
 
-    doc = gc.open_by_url(spreadsheet_url)
 
-    worksheet = doc.worksheet(sheet)
+def append_gspread_sheet_rows(sheet, rows, session=None):
+    """
+        여러 행을 append_rows 한 번의 요청으로 시트 끝에 추가합니다.
+        성공하면 ret_list 에 실제로 기록된 [첫 행, 마지막 행] 번호를 담습니다. (응답에 범위가 없으면 빈 목록)
+    """
+    ret = False
+    ret_list = []
+    session = session or get_gspread_session()
+    if not rows:
+        return True, ret_list
 
     try:
-        
-        # worksheet.update('A1:B2', [[1, 2], [3, 4]])
-        # worksheet.update_cell(1, 2, 'Gorio')
-        for i, x in enumerate(data[1]):
-            worksheet.update_cell(data[0], i+1, x)
+        # append 는 5xx 후 재시도하면 행이 중복될 수 있으므로 자동 재시도하지 않음
+        response = session.call(sheet, lambda worksheet: worksheet.append_rows(
+            rows, value_input_option='USER_ENTERED'), write=True, idempotent=False)
         ret = True
+        ret_list = list(get_updated_rows(response) or [])
     except Exception as e:
         print('Error : ' + str(e))
     return ret, ret_list
 
 
+def submit_gspread_sheet_rows(sheet, rows, session=None):
+    """
+        append_gspread_sheet_rows 와 같지만 세션의 CoalescingWriter 를 거쳐 보냅니다.
+        쓰기 토큰을 기다리는 동안 다른 스레드가 같은 워크시트로 보낸 행과 한 번의 요청으로 합쳐집니다.
+        기록된 행 번호는 알 수 없으므로 ret_list 는 항상 빈 목록입니다.
+    """
+    session = session or get_gspread_session()
+    if not rows:
+        return True, []
+    ret = session.coalescing_writer().submit(sheet, rows).wait() is True
+    return ret, []
+
+
+class BufferedSheetWriter:
+    """
+        행을 모아 두었다가 flush_rows 개가 쌓이거나 flush_seconds 가 지나면
+        append_gspread_sheet_rows 한 번으로 업로드합니다.
+        업로드에 실패한 행은 버퍼에 남겨 두고 다음 flush 때 다시 보냅니다.
+    """
+
+    def __init__(self, sheet, flush_rows=BATCH_FLUSH_ROWS,
+                 flush_seconds=BATCH_FLUSH_SECONDS, session=None):
+        self.sheet = sheet
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.session = session
+        self.rows = []
+        self.last_flush = time.monotonic()
+
+    def add(self, row):
+        self.rows.append(list(row))
+        if self.due():
+            return self.flush()
+        return False
+
+    def due(self):
+        if not self.rows:
+            return False
+        if len(self.rows) >= self.flush_rows:
+            return True
+        return time.monotonic() - self.last_flush >= self.flush_seconds
+
+    def flush(self):
+        """
+            버퍼의 모든 행을 업로드합니다. 성공하면 True 를 반환합니다.
+        """
+        self.last_flush = time.monotonic()
+        if not self.rows:
+            return True
+        ret, _ = append_gspread_sheet_rows(self.sheet, self.rows, session=self.session)
+        if ret:
+            self.rows = []
+        return ret
+
+    def close(self):
+        return self.flush()
+
+
 if __name__ == "__main__":
 
     # print(get_gspread_sheet_data('dht11_sensors'))
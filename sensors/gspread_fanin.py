@@ -0,0 +1,178 @@
+import time
+import threading
+import collections
+
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+from googlespreadsheet import get_gspread_session, BATCH_FLUSH_SECONDS
+
+
+# 시트 크기가 부족할 때 한 번에 늘리는 행 수
+FANIN_GROW_ROWS  = 1000
+# 시트별로 쌓아 둘 수 있는 최대 행 수 (넘으면 오래된 행부터 버림)
+FANIN_MAX_ROWS   = 10000
+
+
+def column_letter(col):
+    return rowcol_to_a1(1, col).rstrip('0123456789')
+
+
+class FanInChannel:
+    """
+    FanInWriter 의 워크시트 하나에 대한 put() / close() 인터페이스입니다.
+    BackgroundUploader / SpoolReplayer 자리에 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, writer, sheet):
+        self.writer = writer
+        self.sheet = sheet
+
+    def put(self, row):
+        return self.writer.put(self.sheet, row)
+
+    def close(self, timeout=None):
+        return self.writer.flush()
+
+
+class FanInWriter:
+    """
+    같은 spreadsheet 의 여러 워크시트로 가는 행을 모아서,
+    flush 마다 spreadsheet.values_batch_update 한 번으로 모두 기록하는 writer 입니다.
+
+    API 호출 수는 센서 수 × 열 수 × 샘플 수가 아니라 flush 횟수에 비례합니다.
+    - 워크시트별 다음 기록 위치는 처음 한 번만 values_batch_get 으로 A 열을 읽어 정합니다.
+    - 시트 크기가 부족하면 batch_update (appendDimension) 한 번으로 함께 늘립니다.
+    - 실패한 행은 버퍼 앞에 되돌려 다음 flush 때 다시 보냅니다.
+    - add_flush_hook() 으로 등록한 함수는 flush 마다 행을 기록하기 전에 flush 스레드에서 호출됩니다.
+      (예: 파티션 워크시트 생성 / 인덱스 갱신) 함수가 실패하면 이번 flush 는 건너뜁니다.
+    """
+
+    def __init__(self, flush_seconds=BATCH_FLUSH_SECONDS, grow_rows=FANIN_GROW_ROWS,
+                 max_rows=FANIN_MAX_ROWS, session=None, background=True):
+        self.flush_seconds = flush_seconds
+        self.grow_rows = grow_rows
+        self.max_rows = max_rows
+        self.session = session or get_gspread_session()
+
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.pending = collections.OrderedDict()
+        # 워크시트별 다음 기록 행 / 현재 시트 행 수 / sheetId
+        self.cursors = {}
+        self.row_counts = {}
+        self.sheet_ids = {}
+        self.flush_hooks = []
+
+        self.requests = 0
+        self.dropped = 0
+        self.closing = threading.Event()
+        self.thread = None
+        if background:
+            self.thread = threading.Thread(target=self._run, name="fanin-writer", daemon=True)
+            self.thread.start()
+
+    def channel(self, sheet):
+        return FanInChannel(self, sheet)
+
+    def add_flush_hook(self, hook):
+        self.flush_hooks.append(hook)
+
+    def put(self, sheet, row):
+        with self.lock:
+            rows = self.pending.setdefault(sheet, [])
+            rows.append(list(row))
+            if len(rows) > self.max_rows:
+                del rows[:len(rows) - self.max_rows]
+                self.dropped += 1
+        return True
+
+    def _load_metadata(self, sheets):
+        """
+        처음 보는 워크시트의 크기와 마지막 행을 읽습니다. (워크시트 목록 1회 + A 열 batch 읽기 1회)
+        """
+        unknown = [sheet for sheet in sheets if sheet not in self.cursors]
+        if not unknown:
+            return
+        worksheets = self.session.call_spreadsheet(lambda doc: doc.worksheets())
+        for worksheet in worksheets:
+            self.row_counts[worksheet.title] = worksheet.row_count
+            self.sheet_ids[worksheet.title] = worksheet.id
+        ranges = [absolute_range_name(sheet, 'A:A') for sheet in unknown]
+        response = self.session.call_spreadsheet(lambda doc: doc.values_batch_get(ranges))
+        self.requests += 2
+        for sheet, value_range in zip(unknown, response.get('valueRanges', [])):
+            self.cursors[sheet] = len(value_range.get('values', [])) + 1
+
+    def _grow(self, batch):
+        requests = []
+        for sheet, rows in batch.items():
+            needed = self.cursors[sheet] + len(rows) - 1
+            if needed > self.row_counts[sheet]:
+                length = max(self.grow_rows, needed - self.row_counts[sheet])
+                requests.append({'appendDimension': {
+                    'sheetId': self.sheet_ids[sheet], 'dimension': 'ROWS', 'length': length}})
+        if not requests:
+            return
+        self.session.call_spreadsheet(lambda doc: doc.batch_update({'requests': requests}), write=True)
+        self.requests += 1
+        for request in requests:
+            spec = request['appendDimension']
+            for sheet, sheet_id in self.sheet_ids.items():
+                if sheet_id == spec['sheetId']:
+                    self.row_counts[sheet] += spec['length']
+
+    def flush(self):
+        """
+        쌓인 모든 행을 values_batch_update 한 번으로 기록합니다. 성공하면 True 를 반환합니다.
+        """
+        with self.flush_lock:
+            try:
+                for hook in list(self.flush_hooks):
+                    hook()
+            except Exception as e:
+                print('Error : ' + str(e))
+                return False
+            with self.lock:
+                batch = self.pending
+                self.pending = collections.OrderedDict()
+            batch = collections.OrderedDict((sheet, rows) for sheet, rows in batch.items() if rows)
+            if not batch:
+                return True
+            try:
+                self._load_metadata(batch)
+                self._grow(batch)
+                data = []
+                for sheet, rows in batch.items():
+                    start = self.cursors[sheet]
+                    width = max(len(row) for row in rows)
+                    cells = f'A{start}:{column_letter(width)}{start + len(rows) - 1}'
+                    data.append({'range': absolute_range_name(sheet, cells), 'values': rows})
+                body = {'valueInputOption': 'USER_ENTERED', 'data': data}
+                self.session.call_spreadsheet(lambda doc: doc.values_batch_update(body), write=True)
+                self.requests += 1
+            except Exception as e:
+                print('Error : ' + str(e))
+                self._requeue(batch)
+                return False
+            for sheet, rows in batch.items():
+                self.cursors[sheet] += len(rows)
+            return True
+
+    def _requeue(self, batch):
+        with self.lock:
+            for sheet, rows in batch.items():
+                self.pending[sheet] = rows + self.pending.get(sheet, [])
+                overflow = len(self.pending[sheet]) - self.max_rows
+                if overflow > 0:
+                    del self.pending[sheet][:overflow]
+                    self.dropped += overflow
+
+    def _run(self):
+        while not self.closing.wait(self.flush_seconds):
+            self.flush()
+
+    def close(self, timeout=None):
+        self.closing.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return self.flush()
@@ -0,0 +1,259 @@
+import datetime
+import threading
+
+from gspread.utils import absolute_range_name
+
+from googlespreadsheet import (get_gspread_session, get_gspread_sheet_data,
+                               update_gspread_sheet_rows, append_gspread_sheet_rows)
+from gspread_fanin import FanInWriter
+
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 파티션 방식
+PARTITION_BY_DAY  = 'day'    # 하루에 워크시트 하나
+PARTITION_BY_ROWS = 'rows'   # N 행마다 워크시트 하나
+
+PARTITION_ROWS         = 50000   # rows 방식에서 파티션 하나의 최대 행 수
+PARTITION_INITIAL_ROWS = 1000    # 새 파티션 워크시트의 초기 행 수 (부족하면 자동으로 늘어남)
+PARTITION_COLS         = 10
+PARTITION_INDEX_SHEET  = 'partition_index'
+
+# 인덱스 시트 열: base, partition, start_time, end_time, rows
+INDEX_COLUMNS = ['base', 'partition', 'start_time', 'end_time', 'rows']
+
+
+def day_partition_name(base, when):
+    return f'{base}_{when:%Y%m%d}'
+
+
+def row_partition_name(base, number):
+    return f'{base}_p{number:04d}'
+
+
+class PartitionedSheetWriter:
+    """
+    하루 또는 N 행 단위로 새 워크시트(파티션)를 만들어 기록하는 writer 입니다.
+
+    - 다음 파티션은 미리 만들어 두어 넘어가는 순간에 시트 생성을 기다리지 않습니다.
+    - index 시트에 파티션별 시간 범위와 행 수를 기록하므로, read_partitions() 는
+      요청한 시간 범위에 걸친 파티션만 읽습니다.
+    - 데이터 기록은 FanInWriter 를 통해 flush 마다 한 번의 요청으로 처리됩니다.
+    - put() 은 메모리에서 파티션만 정하고 바로 반환합니다. 시트 생성과 인덱스 기록은
+      FanInWriter 의 flush 스레드에서 행을 기록하기 직전에 처리합니다.
+    - 인덱스 행 번호는 append 응답의 범위(updatedRange)로 정하므로, 다른 writer 나 다른 스크립트가
+      같은 인덱스 시트에 행을 추가해도 서로의 행을 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, base, mode=PARTITION_BY_DAY, rows_per_partition=PARTITION_ROWS,
+                 index_sheet=PARTITION_INDEX_SHEET, writer=None, session=None):
+        if mode not in (PARTITION_BY_DAY, PARTITION_BY_ROWS):
+            raise ValueError(f"알 수 없는 파티션 방식: {mode}")
+        self.base = base
+        self.mode = mode
+        self.rows_per_partition = rows_per_partition
+        self.index_sheet = index_sheet
+        self.session = session or get_gspread_session()
+        self.writer = writer or FanInWriter(session=self.session)
+        self.own_writer = writer is None
+        self.lock = threading.Lock()
+
+        self.titles = set()
+        # 현재 파티션 정보
+        self.partition = None
+        self.partition_number = 0
+        self.partition_rows = 0
+        self.partition_start = None
+        self.partition_end = None
+        # 파티션별 인덱스 행 번호, 아직 시트 / 인덱스에 반영하지 않은 파티션 전환과 그 파티션의 행
+        self.index_row = {}
+        self.transitions = []
+        self.held = []
+        self._load()
+        self.writer.add_flush_hook(self._sync)
+
+    def _load(self):
+        worksheets = self.session.call_spreadsheet(lambda doc: doc.worksheets())
+        self.titles = {worksheet.title for worksheet in worksheets}
+        if self.index_sheet not in self.titles:
+            self._create(self.index_sheet)
+            append_gspread_sheet_rows(self.index_sheet, [INDEX_COLUMNS], session=self.session)
+        ret, rows = get_gspread_sheet_data(self.index_sheet, session=self.session)
+        if not ret:
+            raise RuntimeError("파티션 인덱스를 읽지 못했습니다.")
+
+        # 마지막 파티션이 아직 열려 있으면 이어서 기록
+        for row_no, row in reversed(list(enumerate(rows, start=1))):
+            row = (list(row) + [''] * len(INDEX_COLUMNS))[:len(INDEX_COLUMNS)]
+            if row[0] != self.base:
+                continue
+            if not row[3]:
+                self.partition = row[1]
+                self.partition_start = row[2]
+                self.index_row[row[1]] = row_no
+                if self.mode == PARTITION_BY_ROWS:
+                    self.partition_number = int(row[1].rsplit('_p', 1)[1])
+                self._load_partition_tail()
+            break
+
+    def _load_partition_tail(self):
+        """
+        이어 쓰는 파티션의 행 수와 마지막 기록 시각을 파티션 시트의 A 열(시간)에서 복원합니다.
+        (인덱스에는 end_time 을 비워 두므로, 복원하지 않으면 다음 전환 때 end_time 이 start_time 으로 기록됨)
+        """
+        if self.partition not in self.titles:
+            return
+        ret, column = get_gspread_sheet_data(self.partition, range_name='A:A', session=self.session)
+        if not ret:
+            raise RuntimeError(f"파티션을 읽지 못했습니다: {self.partition}")
+        self.partition_rows = len(column)
+        times = [cells[0] for cells in column if cells and cells[0]]
+        if times:
+            self.partition_end = times[-1]
+
+    def _create(self, title):
+        if title in self.titles:
+            return
+        self.session.call_spreadsheet(
+            lambda doc: doc.add_worksheet(title, PARTITION_INITIAL_ROWS, PARTITION_COLS), write=True)
+        self.titles.add(title)
+
+    def _partition_for(self, when):
+        if self.mode == PARTITION_BY_DAY:
+            return day_partition_name(self.base, when), day_partition_name(self.base, when + datetime.timedelta(days=1))
+        number = self.partition_number
+        if self.partition is None or self.partition_rows >= self.rows_per_partition:
+            number += 1
+        return row_partition_name(self.base, number), row_partition_name(self.base, number + 1)
+
+    def _update_index(self, name, start, end, rows):
+        row_no = self.index_row.get(name)
+        if row_no is None:
+            return
+        ret, _ = update_gspread_sheet_rows(self.index_sheet, row_no, [[self.base, name, start, end, rows]],
+                                           session=self.session)
+        if not ret:
+            raise RuntimeError(f"파티션 인덱스를 갱신하지 못했습니다: {name}")
+
+    def _sync(self):
+        """
+        FanInWriter.flush() 가 행을 기록하기 전에 호출합니다. (flush 스레드)
+        쌓인 파티션 전환을 순서대로 시트 / 인덱스에 반영하고, 기다리던 행을 writer 로 넘깁니다.
+        실패하면 남은 전환은 다음 flush 때 다시 시도합니다.
+        """
+        while True:
+            with self.lock:
+                if not self.transitions:
+                    break
+                closed, name, next_name, start = self.transitions[0]
+            if closed is not None:
+                self._update_index(*closed)
+            self._create(name)
+            # 다음 파티션을 미리 생성
+            self._create(next_name)
+            if name not in self.index_row:
+                ret, rows = append_gspread_sheet_rows(self.index_sheet, [[self.base, name, start, '', 0]],
+                                                      session=self.session)
+                if not ret or not rows:
+                    raise RuntimeError(f"파티션 인덱스에 추가하지 못했습니다: {name}")
+                self.index_row[name] = rows[0]
+            with self.lock:
+                self.transitions.pop(0)
+                ready = [(sheet, row) for sheet, row in self.held if sheet == name]
+                self.held = [(sheet, row) for sheet, row in self.held if sheet != name]
+                for sheet, row in ready:
+                    self.writer.put(sheet, row)
+
+    def put(self, row, when=None):
+        """
+        행을 현재 시간(또는 when)에 해당하는 파티션에 기록합니다.
+        """
+        when = when or datetime.datetime.now()
+        with self.lock:
+            name, next_name = self._partition_for(when)
+            if name != self.partition:
+                closed = None
+                if self.partition is not None:
+                    closed = (self.partition, self.partition_start, self.partition_end or self.partition_start,
+                              self.partition_rows)
+                start = when.strftime(TIME_FORMAT)
+                self.transitions.append((closed, name, next_name, start))
+                self.partition = name
+                self.partition_start = start
+                self.partition_end = None
+                self.partition_rows = 0
+                if self.mode == PARTITION_BY_ROWS:
+                    self.partition_number = int(name.rsplit('_p', 1)[1])
+            if self.transitions:
+                # 시트 / 인덱스가 준비될 때까지 (다음 flush 까지) 보관
+                self.held.append((name, list(row)))
+            else:
+                self.writer.put(name, row)
+            self.partition_rows += 1
+            self.partition_end = when.strftime(TIME_FORMAT)
+        return True
+
+    def close(self, timeout=None):
+        # flush 스레드가 _sync 에서 self.lock 을 쓰므로 잠그지 않은 상태에서 flush
+        if self.own_writer:
+            self.writer.close(timeout)
+        else:
+            self.writer.flush()
+        with self.lock:
+            partition, start, rows = self.partition, self.partition_start, self.partition_rows
+            pending = len(self.held)
+        if pending:
+            print(f"{self.base}: 파티션을 만들지 못해 기록하지 못한 행 {pending}개가 남아 있습니다.")
+        # 인덱스에는 마지막 기록 시각과 행 수만 갱신 (종료 후에도 같은 파티션을 이어 쓸 수 있도록 end_time 은 비워 둠)
+        if partition is not None:
+            try:
+                self._update_index(partition, start, '', rows)
+            except RuntimeError as e:
+                print(str(e))
+
+
+def get_partitions(base, start=None, end=None, index_sheet=PARTITION_INDEX_SHEET, session=None):
+    """
+    start ~ end (datetime) 범위에 걸친 파티션 이름을 시간 순서로 반환합니다.
+    end_time 이 비어 있는 파티션은 아직 기록 중인 것으로 봅니다.
+    """
+    ret, rows = get_gspread_sheet_data(index_sheet, session=session)
+    if not ret:
+        return []
+    partitions = []
+    for row in rows[1:]:
+        row = (list(row) + [''] * len(INDEX_COLUMNS))[:len(INDEX_COLUMNS)]
+        if row[0] != base or not row[2]:
+            continue
+        p_start = datetime.datetime.strptime(row[2], TIME_FORMAT)
+        p_end = datetime.datetime.strptime(row[3], TIME_FORMAT) if row[3] else datetime.datetime.max
+        if end is not None and p_start > end:
+            continue
+        if start is not None and p_end < start:
+            continue
+        partitions.append(row[1])
+    return partitions
+
+
+def read_partitions(base, start=None, end=None, index_sheet=PARTITION_INDEX_SHEET, session=None):
+    """
+    시간 범위에 걸친 파티션만 읽어서, 첫 열의 시간이 범위 안에 있는 행을 반환합니다.
+    """
+    session = session or get_gspread_session()
+    partitions = get_partitions(base, start, end, index_sheet, session)
+    if not partitions:
+        return []
+    ranges = [absolute_range_name(name, 'A:Z') for name in partitions]
+    response = session.call_spreadsheet(lambda doc: doc.values_batch_get(ranges))
+    result = []
+    for value_range in response.get('valueRanges', []):
+        for row in value_range.get('values', []):
+            if not row or not row[0]:
+                continue
+            try:
+                when = datetime.datetime.strptime(row[0], TIME_FORMAT)
+            except ValueError:
+                continue
+            if (start is None or when >= start) and (end is None or when <= end):
+                result.append(row)
+    return result
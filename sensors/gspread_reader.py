@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+from googlespreadsheet import get_gspread_sheet_data
+
+
+# 시트별 열 구성 (업로드 스크립트가 기록하는 순서)
+DHT11_COLUMNS  = ('timestamp', 'temperature', 'humidity')
+HC_SR04_COLUMNS = ('timestamp', 'distance')
+
+# 한 번에 읽을 최대 행 수 (응답 크기 제한)
+READ_CHUNK_ROWS = 5000
+
+
+def rows_to_arrays(rows, columns, time_columns=('timestamp',)):
+    """
+    문자열 행 목록을 열별 NumPy 배열로 변환합니다.
+    시간 열은 datetime64[s] (ISO 형식이 아니면 NaT), 나머지 열은 float64 (빈 칸 / 변환 불가는 NaN) 입니다.
+    """
+    width = len(columns)
+    padded = [(list(row) + [''] * width)[:width] for row in rows]
+    table = np.array(padded, dtype=object).reshape(len(padded), width)
+
+    arrays = {}
+    for i, name in enumerate(columns):
+        col = table[:, i]
+        if name in time_columns:
+            # 숫자 열과 같이 변환할 수 없는 값(로캘 형식 날짜 등)은 NaT 로 처리해 폴링 전체가 실패하지 않도록 함
+            parsed = pd.to_datetime(pd.Series(col, dtype=object), format='ISO8601', errors='coerce')
+            arrays[name] = parsed.to_numpy(dtype='datetime64[s]')
+        else:
+            arrays[name] = pd.to_numeric(col, errors='coerce').astype(np.float64)
+    return arrays
+
+
+class IncrementalSheetReader:
+    """
+    마지막으로 읽은 행을 기억해 두고, 다음 호출 때 그 이후의 새 행만 범위로 읽는 reader 입니다.
+
+    시트 전체(get_all_values)를 매번 내려받지 않으므로, 시트가 커져도
+    폴링 비용은 새로 추가된 행 수에만 비례합니다.
+    """
+
+    def __init__(self, sheet, columns=DHT11_COLUMNS, start_row=1,
+                 chunk_rows=READ_CHUNK_ROWS, session=None):
+        self.sheet = sheet
+        self.columns = tuple(columns)
+        self.next_row = start_row
+        self.chunk_rows = chunk_rows
+        self.session = session
+        self.last_col = rowcol_to_a1(1, len(self.columns)).rstrip('0123456789')
+
+    def fetch_rows(self):
+        """
+        새 행을 문자열 목록으로 반환합니다. 읽기에 실패하면 None 을 반환하며 위치는 그대로 둡니다.
+        """
+        rows = []
+        while True:
+            end_row = self.next_row + self.chunk_rows - 1
+            range_name = f'A{self.next_row}:{self.last_col}{end_row}'
+            ret, chunk = get_gspread_sheet_data(self.sheet, range_name=range_name, session=self.session)
+            if not ret:
+                return rows or None
+            # 중간의 빈 행까지 포함하여 위치를 옮겨야 같은 행을 다시 읽지 않음
+            self.next_row += len(chunk)
+            rows.extend(row for row in chunk if any(row))
+            if len(chunk) < self.chunk_rows:
+                return rows
+
+    def poll_arrays(self):
+        """
+        새 행을 {열 이름: NumPy 배열} 로 반환합니다.
+        """
+        rows = self.fetch_rows() or []
+        return rows_to_arrays(rows, self.columns)
+
+    def poll_dataframe(self):
+        """
+        새 행을 timestamp 가 datetime 으로 변환된 pandas DataFrame 으로 반환합니다.
+        """
+        return pd.DataFrame(self.poll_arrays(), columns=list(self.columns))
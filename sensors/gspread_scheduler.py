@@ -0,0 +1,254 @@
+import time
+import random
+import threading
+import collections
+import email.utils
+
+import gspread
+
+
+# Google Sheets API 사용자별 분당 쿼터 (읽기 / 쓰기 따로 계산)
+# 같은 계정으로 여러 스크립트를 돌린다면 각 스크립트에 쿼터를 나눠서 설정해야 합니다.
+SHEETS_READ_QUOTA_PER_MINUTE  = 60
+SHEETS_WRITE_QUOTA_PER_MINUTE = 60
+
+# 재시도 설정 (지수 백오프)
+RETRY_MAX_ATTEMPTS    = 6
+RETRY_BASE_SECONDS    = 1.0
+RETRY_MAX_SECONDS     = 64.0
+RETRYABLE_STATUS      = (429, 500, 502, 503, 504)
+
+
+def get_error_status(error):
+    """
+        gspread APIError 의 HTTP 상태 코드를 반환합니다. (없으면 None)
+    """
+    code = getattr(error, 'code', None)
+    if isinstance(code, int) and code > 0:
+        return code
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def get_retry_after(error):
+    """
+        응답의 Retry-After 헤더를 초 단위로 반환합니다. (없으면 None)
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_delay(attempt, base=RETRY_BASE_SECONDS, cap=RETRY_MAX_SECONDS, rng=random):
+    """
+        attempt 번째 재시도의 대기 시간 (full jitter 지수 백오프)
+    """
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """
+        분당 쿼터에 맞춘 토큰 버킷입니다.
+
+        capacity 만큼 순간적으로 몰아서 보낼 수 있고, 나머지는 일정한 속도로 채워집니다.
+        어느 60초 구간에서도 요청 수가 quota 를 넘지 않도록 채움 속도는
+        (quota - capacity) / 60 으로 잡습니다.
+    """
+
+    def __init__(self, quota_per_minute, capacity=None):
+        if capacity is None:
+            capacity = max(1, quota_per_minute // 10)
+        self.capacity = capacity
+        self.rate = max(quota_per_minute - capacity, 1) / 60.0
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.cond = threading.Condition()
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+            토큰을 얻을 때까지 대기합니다. timeout 안에 얻지 못하면 False 를 반환합니다.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                if now >= self.paused_until:
+                    self._refill(now)
+                    if self.tokens >= tokens:
+                        self.tokens -= tokens
+                        return True
+                    wait = (tokens - self.tokens) / self.rate
+                else:
+                    wait = self.paused_until - now
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = min(wait, deadline - now)
+                self.cond.wait(wait)
+
+    def pause(self, seconds):
+        """
+            Retry-After 등으로 seconds 동안 모든 요청을 멈추고 토큰을 비웁니다.
+        """
+        with self.cond:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+            self.updated = self.paused_until
+            self.cond.notify_all()
+
+
+class SheetsScheduler:
+    """
+        모든 Sheets 요청이 거쳐 가는 쿼터 스케줄러입니다.
+
+        - 읽기 / 쓰기 토큰 버킷으로 분당 쿼터 안에서 요청을 내보냅니다.
+        - 429 / 5xx 응답은 Retry-After 를 우선 따르고, 없으면 지수 백오프로 재시도합니다.
+          append 처럼 두 번 실행하면 결과가 달라지는 요청(idempotent=False)은 5xx 에서 재시도하지 않습니다.
+          (서버에서 이미 처리된 뒤 오류가 났을 수 있으므로, 재시도하면 행이 중복될 수 있음)
+        - 429 를 받으면 같은 버킷을 쓰는 모든 스레드가 함께 쉬므로 오류가 연달아 나지 않습니다.
+    """
+
+    def __init__(self, read_quota=SHEETS_READ_QUOTA_PER_MINUTE,
+                 write_quota=SHEETS_WRITE_QUOTA_PER_MINUTE,
+                 max_attempts=RETRY_MAX_ATTEMPTS, seed=None):
+        self.read_bucket = TokenBucket(read_quota)
+        self.write_bucket = TokenBucket(write_quota)
+        self.max_attempts = max_attempts
+        self.random = random.Random(seed)
+        self.retries = 0
+        self.throttled = 0
+
+    def bucket(self, write):
+        return self.write_bucket if write else self.read_bucket
+
+    def execute(self, func, write=False, acquired=False, idempotent=True):
+        """
+            토큰을 얻은 뒤 func() 를 실행하고, 재시도 가능한 오류면 다시 시도합니다.
+            이미 토큰을 얻은 경우 acquired=True 로 호출합니다.
+            idempotent=False 이면 요청이 처리되지 않은 것이 확실한 429 에서만 재시도합니다.
+        """
+        bucket = self.bucket(write)
+        attempt = 0
+        while True:
+            if not acquired:
+                bucket.acquire()
+            acquired = False
+            try:
+                return func()
+            except gspread.exceptions.APIError as e:
+                status = get_error_status(e)
+                if status not in RETRYABLE_STATUS or attempt + 1 >= self.max_attempts:
+                    raise
+                if not idempotent and status != 429:
+                    raise
+                delay = get_retry_after(e)
+                if delay is None:
+                    delay = backoff_delay(attempt, rng=self.random)
+                attempt += 1
+                self.retries += 1
+                if status == 429:
+                    self.throttled += 1
+                    bucket.pause(delay)
+                else:
+                    time.sleep(delay)
+
+
+class WriteTicket:
+    """
+        CoalescingWriter.submit() 의 결과입니다. wait() 로 업로드 완료를 기다릴 수 있습니다.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.error = None
+
+    def done(self, error=None):
+        self.error = error
+        self.event.set()
+
+    def wait(self, timeout=None):
+        """
+            업로드가 끝나면 성공 여부를 반환합니다. (timeout 이면 None)
+        """
+        if not self.event.wait(timeout):
+            return None
+        return self.error is None
+
+
+class CoalescingWriter:
+    """
+        여러 스레드가 보낸 append 요청을 워크시트별로 모아 한 번의 append_rows 로 보냅니다.
+
+        쓰기 토큰을 기다리는 동안 같은 워크시트에 쌓인 요청은 모두 하나로 합쳐지므로,
+        쿼터가 빠듯할수록 요청당 행 수가 늘어납니다.
+        BackgroundUploader / SpoolReplayer 는 GspreadSession.coalescing_writer() 로 하나를 함께 씁니다.
+    """
+
+    def __init__(self, session, scheduler=None):
+        self.session = session
+        # 스케줄러가 없으면 쿼터 제한 없이 바로 보냄
+        self.scheduler = scheduler if scheduler is not None else session.scheduler
+        self.cond = threading.Condition()
+        # sheet -> [(rows, ticket), ...], 먼저 들어온 워크시트부터 처리
+        self.pending = collections.OrderedDict()
+        self.closing = False
+        self.requests = 0
+        self.thread = threading.Thread(target=self._run, name="coalescing-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, sheet, rows):
+        ticket = WriteTicket()
+        with self.cond:
+            if self.closing:
+                raise RuntimeError("writer 가 이미 종료되었습니다.")
+            self.pending.setdefault(sheet, []).append(([list(row) for row in rows], ticket))
+            self.cond.notify_all()
+        return ticket
+
+    def _run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.pending or self.closing)
+                if not self.pending and self.closing:
+                    return
+            # 토큰을 기다리는 동안 들어온 요청도 함께 합쳐짐
+            if self.scheduler is not None:
+                self.scheduler.write_bucket.acquire()
+            with self.cond:
+                sheet, entries = self.pending.popitem(last=False)
+            rows = [row for entry_rows, _ in entries for row in entry_rows]
+            error = None
+            try:
+                self.session.call(sheet, lambda worksheet: worksheet.append_rows(
+                    rows, value_input_option='USER_ENTERED'), write=True,
+                    acquired=self.scheduler is not None, idempotent=False)
+                self.requests += 1
+            except Exception as e:
+                print('Error : ' + str(e))
+                error = e
+            for _, ticket in entries:
+                ticket.done(error)
+
+    def close(self, timeout=None):
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.thread.join(timeout)
@@ -0,0 +1,223 @@
+import json
+import time
+import sqlite3
+import threading
+
+from googlespreadsheet import submit_gspread_sheet_rows, BATCH_FLUSH_ROWS, BATCH_FLUSH_SECONDS
+
+
+# 오프라인 동안 쌓인 행을 한 번에 올리는 최대 행 수
+SPOOL_BATCH_ROWS      = 1000
+# 업로드 실패 후 다시 시도하는 주기 (초)
+SPOOL_RETRY_SECONDS   = 10
+# 확인(confirmed)된 행을 지우기 전까지 보관하는 최대 개수 (id 기준)
+SPOOL_KEEP_CONFIRMED  = 10000
+# 이만큼 행이 쌓이면 한 번의 트랜잭션으로 커밋 (전원이 꺼지면 커밋 전의 행은 잃을 수 있음)
+SPOOL_COMMIT_ROWS     = 10
+
+
+class SampleSpool:
+    """
+    모든 측정값을 업로드 전에 먼저 기록하는 SQLite 기반 로컬 스풀입니다.
+
+    put() 은 행을 메모리에 모았다가 commit_rows 개마다 (또는 업로더가 읽기 전에) 한 번의
+    트랜잭션으로 커밋하므로, 측정 루프에서 행마다 디스크 동기화를 기다리지 않습니다.
+    WAL + synchronous=NORMAL 이므로 프로세스가 죽어도 커밋된 행은 남아 있으며,
+    전원이 꺼지면 마지막 몇 개의 커밋과 커밋 전의 행(최대 commit_rows - 1 개)을 잃을 수 있습니다.
+    업로드가 확인된 행은 confirmed = 1 로 표시됩니다.
+    """
+
+    def __init__(self, path, commit_rows=SPOOL_COMMIT_ROWS):
+        self.path = path
+        self.commit_rows = commit_rows
+        self.lock = threading.Lock()
+        # 커밋 전의 행 [(sheet, row 문자열, 시각), ...] 은 DB 잠금과 따로 보호
+        self.buffer_lock = threading.Lock()
+        self.buffer = []
+        # 이번 실행에서 확인된 가장 큰 id (purge 기준)
+        self.last_confirmed = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS spool ('
+            ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' sheet TEXT NOT NULL,'
+            ' row TEXT NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' confirmed INTEGER NOT NULL DEFAULT 0)')
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS spool_pending ON spool (sheet, confirmed, id)')
+
+    def put(self, sheet, row):
+        """
+        행을 스풀에 추가합니다. commit_rows 개가 모이면 한꺼번에 커밋합니다.
+        """
+        with self.buffer_lock:
+            self.buffer.append((sheet, json.dumps(list(row)), time.time()))
+            full = len(self.buffer) >= self.commit_rows
+        if full:
+            self.commit()
+
+    def commit(self):
+        """
+        메모리에 모아 둔 행을 한 번의 트랜잭션으로 기록합니다.
+        """
+        with self.lock:
+            with self.buffer_lock:
+                rows, self.buffer = self.buffer, []
+            if not rows:
+                return
+            self.conn.execute('BEGIN')
+            try:
+                self.conn.executemany('INSERT INTO spool (sheet, row, created) VALUES (?, ?, ?)', rows)
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                with self.buffer_lock:
+                    self.buffer[:0] = rows
+                raise
+
+    def pending(self, sheet, limit=SPOOL_BATCH_ROWS):
+        """
+        아직 업로드가 확인되지 않은 행을 오래된 순서로 [(id, row), ...] 형태로 반환합니다.
+        """
+        self.commit()
+        with self.lock:
+            cur = self.conn.execute(
+                'SELECT id, row FROM spool WHERE sheet = ? AND confirmed = 0 ORDER BY id LIMIT ?',
+                (sheet, limit))
+            return [(row_id, json.loads(row)) for row_id, row in cur.fetchall()]
+
+    def count_pending(self, sheet):
+        self.commit()
+        with self.lock:
+            cur = self.conn.execute(
+                'SELECT COUNT(*) FROM spool WHERE sheet = ? AND confirmed = 0', (sheet,))
+            return cur.fetchone()[0]
+
+    def confirm(self, ids):
+        """
+        업로드가 확인된 행을 표시합니다.
+        """
+        if not ids:
+            return
+        with self.lock:
+            self.conn.execute('BEGIN')
+            try:
+                self.conn.executemany(
+                    'UPDATE spool SET confirmed = 1 WHERE id = ?', [(i,) for i in ids])
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.last_confirmed = max(self.last_confirmed, max(ids))
+
+    def purge(self, keep=SPOOL_KEEP_CONFIRMED):
+        """
+        마지막으로 확인된 행의 id 보다 keep 이상 오래된 확인된 행을 삭제합니다.
+        (id 범위로 지우므로 기본 키만 훑고, 업로더 스레드에서 호출합니다)
+        """
+        with self.lock:
+            if self.last_confirmed <= keep:
+                return
+            self.conn.execute('DELETE FROM spool WHERE id <= ? AND confirmed = 1',
+                              (self.last_confirmed - keep,))
+
+    def close(self):
+        self.commit()
+        with self.lock:
+            self.conn.close()
+
+
+class SpoolReplayer:
+    """
+    스풀에 쌓인 행을 Google Sheets 로 재전송하는 업로더입니다.
+
+    put() 은 행을 스풀에만 기록하고 바로 반환합니다. 별도 스레드가 flush_rows 개 또는
+    flush_seconds 마다 확인되지 않은 행을 최대 batch_rows 개씩 append_rows 한 번으로
+    올리고, 성공하면 confirmed 로 표시합니다.
+    네트워크가 끊긴 동안 쌓인 행은 연결이 복구되면 큰 묶음으로 한꺼번에 올라갑니다.
+    업로드 성공 직후 확인 기록 전에 종료되면 해당 묶음이 한 번 더 올라갈 수 있습니다.
+    """
+
+    def __init__(self, spool, sheet, batch_rows=SPOOL_BATCH_ROWS,
+                 flush_rows=BATCH_FLUSH_ROWS, flush_seconds=BATCH_FLUSH_SECONDS,
+                 retry_seconds=SPOOL_RETRY_SECONDS, session=None):
+        self.spool = spool
+        self.sheet = sheet
+        self.batch_rows = batch_rows
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.retry_seconds = retry_seconds
+        self.session = session
+
+        self.cond = threading.Condition()
+        self.closing = False
+        self.new_rows = 0
+        self.uploaded = 0
+        self.failures = 0
+
+        self.thread = threading.Thread(target=self._run, name=f"spool-{sheet}", daemon=True)
+        self.thread.start()
+
+    def put(self, row):
+        self.spool.put(self.sheet, row)
+        with self.cond:
+            self.new_rows += 1
+            if self.new_rows >= self.flush_rows:
+                self.cond.notify_all()
+        return True
+
+    def replay(self):
+        """
+        확인되지 않은 행을 모두 올립니다. 실패하면 False 를 반환합니다.
+        """
+        while True:
+            pending = self.spool.pending(self.sheet, self.batch_rows)
+            if not pending:
+                return True
+            ids = [row_id for row_id, _ in pending]
+            rows = [row for _, row in pending]
+            ret, _ = submit_gspread_sheet_rows(self.sheet, rows, session=self.session)
+            if not ret:
+                self.failures += 1
+                return False
+            self.spool.confirm(ids)
+            self.uploaded += len(rows)
+            if len(pending) < self.batch_rows:
+                return True
+
+    def _run(self):
+        ok = True
+        while True:
+            with self.cond:
+                if not self.closing:
+                    if ok:
+                        self.cond.wait_for(
+                            lambda: self.closing or self.new_rows >= self.flush_rows,
+                            self.flush_seconds)
+                    else:
+                        # 실패 후에는 새 행이 들어와도 retry_seconds 동안 재시도하지 않음
+                        self.cond.wait_for(lambda: self.closing, self.retry_seconds)
+                closing = self.closing
+                self.new_rows = 0
+            ok = self.replay()
+            if ok:
+                self.spool.purge()
+            if closing:
+                return
+
+    def close(self, timeout=None):
+        """
+        남은 행을 한 번 더 올려 보고 스레드를 종료합니다. 확인되지 않은 행 수를 반환합니다.
+        남은 행은 스풀에 보존되어 다음 실행 때 올라갑니다.
+        """
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.thread.join(timeout)
+        remaining = self.spool.count_pending(self.sheet)
+        if remaining:
+            print(f"스풀에 업로드되지 않은 행 {remaining}개가 남아 있습니다. 다음 실행 때 전송됩니다.")
+        return remaining
@@ -0,0 +1,180 @@
+import time
+import threading
+import collections
+
+from googlespreadsheet import submit_gspread_sheet_rows, BATCH_FLUSH_ROWS, BATCH_FLUSH_SECONDS
+from gspread_spool import SpoolReplayer
+from gspread_partition import PartitionedSheetWriter
+
+
+# 큐가 가득 찼을 때의 처리 방식
+BLOCK       = 'block'        # 자리가 날 때까지 센서 루프를 대기시킴
+DROP_OLDEST = 'drop_oldest'  # 가장 오래된 행을 버림
+AGGREGATE   = 'aggregate'    # 새 행을 마지막 행에 평균으로 합침
+
+UPLOAD_QUEUE_SIZE    = 1000
+UPLOAD_RETRY_SECONDS = 5
+
+
+def merge_rows(old_row, new_row, count):
+    """
+    count 개가 합쳐진 old_row 에 new_row 를 합칩니다.
+    숫자 열은 평균을, 그 외의 열(시간 등)은 새 값을 사용합니다.
+    """
+    merged = []
+    for old, new in zip(old_row, new_row):
+        if (isinstance(old, (int, float)) and isinstance(new, (int, float))
+                and not isinstance(old, bool) and not isinstance(new, bool)):
+            merged.append((old * count + new) / (count + 1))
+        else:
+            merged.append(new)
+    return merged
+
+
+class BackgroundUploader:
+    """
+    센서 루프(생산자)와 Google Sheets 업로드(소비자)를 분리하는 업로더입니다.
+
+    put() 은 행을 제한된 크기의 큐에 넣고 바로 반환하며, 별도 스레드가
+    batch_rows 개 또는 flush_seconds 마다 큐를 비워 append_rows 한 번으로 업로드합니다.
+    업로드에 실패하면 행을 큐 앞에 되돌리고 retry_seconds 후에 다시 시도합니다.
+    """
+
+    def __init__(self, sheet, maxsize=UPLOAD_QUEUE_SIZE, policy=BLOCK,
+                 batch_rows=BATCH_FLUSH_ROWS, flush_seconds=BATCH_FLUSH_SECONDS,
+                 retry_seconds=UPLOAD_RETRY_SECONDS, session=None):
+        if policy not in (BLOCK, DROP_OLDEST, AGGREGATE):
+            raise ValueError(f"알 수 없는 backpressure 정책: {policy}")
+        self.sheet = sheet
+        self.maxsize = maxsize
+        self.policy = policy
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.retry_seconds = retry_seconds
+        self.session = session
+
+        # (row, 합쳐진 샘플 수) 를 저장
+        self.queue = collections.deque()
+        self.cond = threading.Condition()
+        self.closing = False
+
+        self.uploaded = 0
+        self.dropped = 0
+        self.aggregated = 0
+        self.failures = 0
+
+        self.thread = threading.Thread(target=self._run, name=f"uploader-{sheet}", daemon=True)
+        self.thread.start()
+
+    def put(self, row, timeout=None):
+        """
+        행을 업로드 큐에 넣습니다. BLOCK 정책에서 timeout 안에 자리가 나지 않으면 False 를 반환합니다.
+        """
+        row = list(row)
+        with self.cond:
+            if self.closing:
+                raise RuntimeError("업로더가 이미 종료되었습니다.")
+            if len(self.queue) >= self.maxsize:
+                if self.policy == BLOCK:
+                    if not self.cond.wait_for(lambda: len(self.queue) < self.maxsize or self.closing, timeout):
+                        self.dropped += 1
+                        return False
+                    # 기다리는 동안 close() 가 호출되었으면 더 넣지 않음
+                    if self.closing:
+                        raise RuntimeError("업로더가 이미 종료되었습니다.")
+                elif self.policy == DROP_OLDEST:
+                    self.queue.popleft()
+                    self.dropped += 1
+                else:
+                    last_row, count = self.queue[-1]
+                    self.queue[-1] = (merge_rows(last_row, row, count), count + 1)
+                    self.aggregated += 1
+                    return True
+            self.queue.append((row, 1))
+            if len(self.queue) >= self.batch_rows:
+                self.cond.notify_all()
+            return True
+
+    def pending(self):
+        with self.cond:
+            return len(self.queue)
+
+    def _take_batch(self, wait=True):
+        with self.cond:
+            deadline = time.monotonic() + self.flush_seconds
+            while wait and not self.closing and len(self.queue) < self.batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+            batch = []
+            while self.queue and len(batch) < self.batch_rows:
+                batch.append(self.queue.popleft()[0])
+            self.cond.notify_all()
+            return batch
+
+    def _requeue(self, batch):
+        with self.cond:
+            for row in reversed(batch):
+                self.queue.appendleft((row, 1))
+            # 재시도 중 큐가 넘치면 (BLOCK 이 아닐 때) 오래된 행부터 버림
+            while len(self.queue) > self.maxsize and self.policy != BLOCK:
+                self.queue.popleft()
+                self.dropped += 1
+
+    def _run(self):
+        retry = False
+        while True:
+            # 재시도할 때는 retry_seconds 만 기다리고 flush_seconds 주기는 다시 기다리지 않음
+            batch = self._take_batch(wait=not retry)
+            retry = False
+            if batch:
+                ret, _ = submit_gspread_sheet_rows(self.sheet, batch, session=self.session)
+                if ret:
+                    self.uploaded += len(batch)
+                else:
+                    self.failures += 1
+                    self._requeue(batch)
+                    with self.cond:
+                        if self.closing:
+                            return
+                        self.cond.wait(self.retry_seconds)
+                    retry = True
+                    continue
+            with self.cond:
+                if self.closing and not self.queue:
+                    return
+
+    def close(self, timeout=None):
+        """
+        남은 행을 업로드하고 스레드를 종료합니다. 업로드하지 못한 행 수를 반환합니다.
+        """
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.thread.join(timeout)
+        with self.cond:
+            if self.queue:
+                print(f"업로드하지 못한 행 {len(self.queue)}개가 남아 있습니다.")
+            return len(self.queue)
+
+
+def create_uploader(sheet, partition_mode=None, spool=None, policy=BLOCK, writer=None):
+    """
+    스크립트 설정에 맞는 업로더를 만듭니다. 모든 업로더는 put(row) / close() 를 제공합니다.
+
+    - partition_mode 가 있으면 PartitionedSheetWriter (날짜 / 행 수별 워크시트)
+      writer(FanInWriter) 를 주면 같은 인덱스 시트를 쓰는 파티션 writer 들이 한 flush 스레드에서
+      인덱스를 갱신하고 한 번의 요청으로 기록합니다. (writer 는 호출한 쪽에서 close() 합니다)
+    - spool(SampleSpool) 이 있으면 SpoolReplayer (로컬 스풀에 먼저 기록)
+      스풀은 여러 업로더가 함께 쓸 수 있으며, 업로더를 모두 닫은 뒤 호출한 쪽에서 close() 합니다.
+      스풀은 디스크에 모든 행을 보존하므로 큐가 가득 찰 일이 없어 policy 는 적용되지 않습니다.
+    - 둘 다 없으면 BackgroundUploader (메모리 큐)
+    """
+    if partition_mode:
+        return PartitionedSheetWriter(sheet, mode=partition_mode, writer=writer)
+    if spool is not None:
+        if policy != BLOCK:
+            print(f"{sheet}: 스풀을 사용하므로 업로드 정책 '{policy}' 는 적용되지 않습니다. (모든 행을 스풀에 보존)")
+        return SpoolReplayer(spool, sheet)
+    return BackgroundUploader(sheet, policy=policy)
@@ -3,7 +3,15 @@ import numpy as np
 import time
 import datetime
 
-from googlespreadsheet import update_gspread_sheet_data, delete_gspread_sheet_data
+from googlespreadsheet import delete_gspread_sheet_data, ensure_gspread_worksheet
+from gspread_uploader import create_uploader, DROP_OLDEST
+from gspread_spool import SampleSpool
+from gspread_fanin import FanInWriter
+from rollup import RollupStage, rollup_header
+from deadband import DeadbandStage
+from sampling import PeriodicSampler
+from hc_sr04_timing import HCSR04Ranger, EDGE, MEDIAN
+from timing_stats import TimingRecorder
 
 
 # GPIO 핀 설정 (BCM 모드)
@@ -12,11 +20,51 @@ from googlespreadsheet import update_gspread_sheet_data, delete_gspread_sheet_da
 GPIO_TRIGGER = 27  # TRIG 핀을 GPIO 27 (물리적 핀 13)에 연결
 GPIO_ECHO = 17     # ECHO 핀을 GPIO 17 (물리적 핀 11)에 전압 분배 후 연결
 
+# ECHO 펄스 측정 방식 (EDGE: 엣지 콜백으로 시각만 기록, POLL: GPIO.input() 반복 호출)
+# EDGE 는 측정하는 동안 CPU 를 거의 사용하지 않습니다.
+TIMING_BACKEND = EDGE
+
+# 설정하면 측정마다 초음파를 BURST_PINGS 번(60ms 간격) 보내고 중앙값을 거리로 사용합니다. (None 이면 한 번만 측정)
+# 유효한 초음파 비율이 BURST_MIN_QUALITY 보다 낮으면 측정 실패로 처리합니다.
+BURST_PINGS = None
+BURST_MIN_QUALITY = 0.6
+
+# True 이면 트리거→ECHO 지연, 펄스 길이, 대기 루프 수, 타임아웃 원인을 히스토그램으로 기록하고
+# 종료할 때 백분위수를 출력합니다. (스케줄링 지연이 측정에 섞이는지, 라즈베리파이가 과부하인지 확인용)
+TIMING_STATS = False
+
+# 기온(°C)을 알면 소리의 속도를 보정합니다. (None 이면 20°C 기준 34300 cm/s)
+AIR_TEMPERATURE = None
+
 # --- 시뮬레이션 모드 설정 ---
 # True로 설정하면 실제 HC-SR04 센서 없이 거리 데이터를 시뮬레이션합니다.
 # False로 설정하면 실제 HC-SR04 센서에서 데이터를 읽습니다.
 SIMULATION_MODE = False
 
+# 업로드 큐가 가득 찼을 때의 처리 방식 (BLOCK / DROP_OLDEST / AGGREGATE)
+UPLOAD_POLICY = DROP_OLDEST
+
+# True 이면 시작할 때 시트를 지우지 않고 마지막 행 다음부터 이어서 기록합니다.
+# False 이면 기존처럼 시작할 때 시트를 초기화합니다.
+RESUME_APPEND = True
+
+# 워크시트 파티션 방식 ('day': 하루에 시트 하나, 'rows': N 행마다 시트 하나, None: 고정 시트)
+# 장기간 실행하면 시트 하나가 계속 커지므로 파티션을 사용하는 것이 좋습니다.
+PARTITION_MODE = None
+
+# 설정하면 ROLLUP_SECONDS 구간별 min / mean / max / count 를 '<시트>_<초>s' 시트에 업로드합니다.
+# (None 이면 집계하지 않음) UPLOAD_RAW 가 False 이면 원본 행은 업로드하지 않습니다.
+ROLLUP_SECONDS = None
+UPLOAD_RAW = True
+
+# 원본 행을 값이 임계값보다 크게 바뀌었을 때만 업로드 (None 이면 모든 행 업로드)
+# 예: DEADBAND_THRESHOLDS = [1.0]  # [거리 cm]
+DEADBAND_THRESHOLDS = None
+
+# 측정값을 먼저 기록할 로컬 스풀 파일 (None 이면 스풀 없이 메모리 큐로 업로드)
+# 네트워크가 끊겨도 측정값이 보존되며, 복구되면 한꺼번에 업로드됩니다.
+SPOOL_PATH = 'hc_sr04_spool.db'
+
 # 시뮬레이션 모드에서 거리 변화를 위한 변수
 sim_current_distance = 150.0 # 초기 시뮬레이션 거리 (cm)
 sim_distance_change_step = 5.0 # 시뮬레이션에서 거리가 변하는 정도
@@ -25,12 +73,12 @@ SIM_ANOMALY_INTERVAL = 50 # 50번의 시뮬레이션마다 이상치 발생 (조
 
 
 # GPIO 모드를 BCM으로 설정합니다. 이는 GPIO 핀 번호 체계를 의미합니다.
+# TRIG 핀은 출력, ECHO 핀은 입력으로 설정되며 ECHO 펄스 측정 방식은 TIMING_BACKEND 를 따릅니다.
+ranger = None
 if not SIMULATION_MODE: # 시뮬레이션 모드가 아닐 때만 GPIO 설정
-    GPIO.setmode(GPIO.BCM)
-    # TRIG 핀을 출력으로 설정하여 초음파 펄스를 보냅니다.
-    GPIO.setup(GPIO_TRIGGER, GPIO.OUT)
-    # ECHO 핀을 입력으로 설정하여 반사된 초음파를 받습니다.
-    GPIO.setup(GPIO_ECHO, GPIO.IN)
+    recorder = TimingRecorder('hc_sr0_sensor').print_at_exit() if TIMING_STATS else None
+    ranger = HCSR04Ranger(GPIO_TRIGGER, GPIO_ECHO, backend=TIMING_BACKEND, gpio=GPIO,
+                          recorder=recorder).open()
 
 def get_distance():
     """
@@ -41,47 +89,13 @@ def get_distance():
     if SIMULATION_MODE:
         return simulate_distance()
     else:
-        # TRIG 핀을 잠시 LOW로 설정하여 센서를 초기화합니다.
-        GPIO.output(GPIO_TRIGGER, False)
-        time.sleep(0.000002) # 2 마이크로초 대기
-
-        # TRIG 핀에 10us(마이크로초)의 HIGH 펄스를 발생시킵니다.
-        # 이 펄스가 센서가 초음파를 방출하도록 트리거합니다.
-        GPIO.output(GPIO_TRIGGER, True)
-        time.sleep(0.00001) # 10 마이크로초 동안 HIGH 유지
-        GPIO.output(GPIO_TRIGGER, False)
-
-        start_time = time.time()
-        end_time = time.time()
-
-        # ECHO 핀이 HIGH가 될 때까지 대기합니다 (초음파 발사 시작).
-        # 타임아웃을 추가하여 센서가 반응하지 않을 때 무한 루프에 빠지는 것을 방지합니다.
-        timeout_start = time.time()
-        while GPIO.input(GPIO_ECHO) == 0:
-            start_time = time.time()
-            if time.time() - timeout_start > 0.1: # 0.1초 이상 대기하면 타임아웃
-                return None # 오류 처리 또는 무한 루프 방지
-                
-        # ECHO 핀이 LOW가 될 때까지 대기합니다 (초음파 수신 완료).
-        timeout_end = time.time()
-        while GPIO.input(GPIO_ECHO) == 1:
-            end_time = time.time()
-            if time.time() - timeout_end > 0.1: # 0.1초 이상 대기하면 타임아웃
-                return None # 오류 처리 또는 무한 루프 방지
-
-        # 펄스 지속 시간 (초음파가 왕복하는 데 걸린 시간)을 계산합니다.
-        pulse_duration = end_time - start_time
-
-        # 거리 계산: (시간 * 소리의 속도) / 2
-        # 소리의 속도는 약 34300 cm/s (20°C 기준)
-        # 왕복 거리이므로 2로 나눕니다.
-        distance = (pulse_duration * 34300) / 2
-        
-        # HC-SR04의 유효 측정 범위(2cm ~ 400cm)를 벗어나는 값은 필터링합니다.
-        if 2 <= distance <= 400:
-            return distance
-        else:
+        # 거리 계산: (펄스 시간 * 소리의 속도) / 2, 유효 범위(2cm ~ 400cm)를 벗어나면 None
+        if not BURST_PINGS:
+            return ranger.get_distance(AIR_TEMPERATURE)
+        result = ranger.burst(BURST_PINGS, AIR_TEMPERATURE, MEDIAN)
+        if result.quality < BURST_MIN_QUALITY:
             return None
+        return result.distance
 
 def simulate_distance():
     """
@@ -112,26 +126,62 @@ def simulate_distance():
     return sim_current_distance
 
 
+# 스풀은 원본 / 집계 업로더가 함께 사용하며, 종료할 때 업로더를 멈춘 뒤 닫음
+spool = SampleSpool(SPOOL_PATH) if SPOOL_PATH and not PARTITION_MODE else None
+# 파티션 모드에서는 원본 / 집계 writer 가 FanInWriter 하나를 함께 써서 인덱스 시트를 한 곳에서 갱신
+fanin = FanInWriter() if PARTITION_MODE else None
+# 설정 중에 중단되어도 finally 에서 만든 것만 순서대로 닫을 수 있도록 미리 None 으로 둠
+raw_uploader = None
+uploader = None
+sampler = None
 try:
     sheet_name = 'hc_sr0_sensor'
-    # Sheet 초기화
-    delete_gspread_sheet_data(sheet_name)
-    count = 0 
+    # RESUME_APPEND 이면 시트를 그대로 둠 (업로드는 append_rows 이므로 서버가 마지막 행 다음에 추가함)
+    if not PARTITION_MODE and not RESUME_APPEND:
+        # Sheet 초기화
+        delete_gspread_sheet_data(sheet_name)
+    # 업로드는 별도 스레드에서 처리하여 센서 측정 주기가 네트워크에 밀리지 않도록 함
+    if not ROLLUP_SECONDS or UPLOAD_RAW:
+        raw_uploader = create_uploader(sheet_name, PARTITION_MODE, spool, UPLOAD_POLICY, fanin)
+        if DEADBAND_THRESHOLDS:
+            raw_uploader = DeadbandStage(raw_uploader, DEADBAND_THRESHOLDS)
+    uploader = raw_uploader
+    if ROLLUP_SECONDS:
+        # 센서 값과 업로더 사이에서 구간 집계
+        rollup_sheet = f'{sheet_name}_{ROLLUP_SECONDS}s'
+        # 파티션 모드에서는 파티션 시트에만 기록하므로 기본 집계 시트를 만들지 않음
+        if not PARTITION_MODE:
+            ensure_gspread_worksheet(rollup_sheet, header=rollup_header(['distance']))
+        rollup_uploader = create_uploader(rollup_sheet, PARTITION_MODE, spool, UPLOAD_POLICY, fanin)
+        uploader = RollupStage({ROLLUP_SECONDS: rollup_uploader}, raw_uploader, num_values=1)
     
+    # 작업 시간과 상관없이 1초 간격의 절대 시각에 맞춰 측정
+    sampler = PeriodicSampler(1)
     while True:
+        sampler.wait()
         distance = get_distance()
         if distance is not None:
             now = datetime.datetime.now()
             t_time = now.strftime("%Y-%m-%d %H:%M:%S")
-            update_gspread_sheet_data(sheet_name, [ count + 1, [t_time, distance]])
-            count += 1
+            uploader.put([t_time, distance])
             print(f"거리: {distance:.2f} cm")
 
         else:
             print("거리 측정 실패 (센서 오류 또는 타임아웃)")
-        time.sleep(1) # 1초마다 측정
 
 except KeyboardInterrupt:
     print("프로그램 종료")
+finally:
+    # 업로더(스레드) -> fan-in writer -> 스풀 순서로 닫음 (스레드가 멈춘 뒤 SQLite 연결을 닫음)
+    if uploader is not None:
+        uploader.close()
+    elif raw_uploader is not None:
+        raw_uploader.close()
+    if fanin is not None:
+        fanin.close()
+    if spool is not None:
+        spool.close()
+    if sampler is not None:
+        print(sampler.report())
     if not SIMULATION_MODE:
         GPIO.cleanup() # GPIO 핀 초기화
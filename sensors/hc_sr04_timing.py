@@ -0,0 +1,283 @@
+import time
+import threading
+import collections
+
+import numpy as np
+
+from timing_stats import NO_RISE, NO_FALL, OUT_OF_RANGE
+
+
+# ECHO 펄스 측정 방식
+POLL = 'poll'   # GPIO.input() 을 반복 호출하며 대기 (CPU 한 코어를 계속 사용)
+EDGE = 'edge'   # add_event_detect 콜백으로 엣지 시각만 기록하고 스레드는 대기
+
+# 측정 타임아웃 (초). 물체가 없으면 HC-SR04 의 ECHO 펄스는 약 38ms 입니다.
+ECHO_TIMEOUT = 0.1
+
+# 소리의 속도 (cm/s, 20°C 기준)
+SPEED_OF_SOUND = 34300
+
+# 버스트 측정 설정
+BURST_PINGS    = 5      # 한 번의 버스트에서 보내는 초음파 수
+PING_INTERVAL  = 0.06   # 초음파 사이의 최소 간격 (데이터시트 권장 60ms, 이전 초음파의 잔향 방지)
+TRIM_FRACTION  = 0.2    # trimmed mean 에서 양쪽 끝에서 버리는 비율
+
+# 버스트 결과를 하나의 거리로 합치는 방식
+MEDIAN  = 'median'
+TRIMMED = 'trimmed'
+
+# HC-SR04의 유효 측정 범위 (cm)
+MIN_DISTANCE = 2
+MAX_DISTANCE = 400
+
+
+def send_trigger(gpio, trigger):
+    """
+    TRIG 핀에 10us(마이크로초)의 HIGH 펄스를 발생시킵니다.
+    """
+    gpio.output(trigger, True)
+    time.sleep(0.00001)
+    gpio.output(trigger, False)
+
+
+def measure_echo_poll(gpio, trigger, echo, timeout=ECHO_TIMEOUT, recorder=None):
+    """
+    ECHO 핀을 반복해서 읽어 펄스 길이(초)를 측정합니다. 타임아웃이면 None
+    recorder(TimingRecorder) 를 주면 지연 시간, 펄스 길이, 루프 수, 타임아웃 원인을 기록합니다.
+    """
+    send_trigger(gpio, trigger)
+    timeout_ns = int(timeout * 1e9)
+    start_ns = time.perf_counter_ns()
+    rise_loops = 0
+    while gpio.input(echo) == 0:
+        rise_loops += 1
+        if time.perf_counter_ns() - start_ns > timeout_ns:
+            if recorder is not None:
+                recorder.record_timeout(NO_RISE)
+            return None
+    rise_ns = time.perf_counter_ns()
+    fall_loops = 0
+    while gpio.input(echo) == 1:
+        fall_loops += 1
+        if time.perf_counter_ns() - rise_ns > timeout_ns:
+            if recorder is not None:
+                recorder.record_timeout(NO_FALL)
+            return None
+    pulse_ns = time.perf_counter_ns() - rise_ns
+    if recorder is not None:
+        recorder.record(rise_ns - start_ns, pulse_ns, rise_loops, fall_loops)
+    return pulse_ns / 1e9
+
+
+class EdgeEchoTimer:
+    """
+    ECHO 핀의 엣지 콜백에서 time.perf_counter_ns() 시각만 기록하는 측정기입니다.
+
+    엣지의 종류는 도착 순서가 아니라 콜백에서 읽은 핀 레벨로 정합니다. (HIGH: 상승, LOW: 하강)
+    상승 엣지 없이 온 하강 엣지(타임아웃된 이전 초음파의 늦은 엣지 등)는 무시하며,
+    측정하는 스레드는 하강 엣지까지 Event 로 대기하므로 CPU 를 사용하지 않습니다.
+    """
+
+    def __init__(self, gpio, echo):
+        self.gpio = gpio
+        self.echo = echo
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.rise_ns = None
+        self.fall_ns = None
+        gpio.add_event_detect(echo, gpio.BOTH, callback=self._on_edge)
+
+    def _on_edge(self, channel):
+        now = time.perf_counter_ns()
+        level = self.gpio.input(channel)
+        with self.lock:
+            if self.fall_ns is not None:
+                return
+            if level:
+                self.rise_ns = now
+            elif self.rise_ns is not None:
+                self.fall_ns = now
+                self.done.set()
+
+    def measure(self, trigger, timeout=ECHO_TIMEOUT, recorder=None):
+        """
+        트리거 펄스를 보내고 ECHO 펄스 길이(초)를 반환합니다. 타임아웃이면 None
+        """
+        with self.lock:
+            self.rise_ns = None
+            self.fall_ns = None
+            self.done.clear()
+        send_trigger(self.gpio, trigger)
+        trigger_ns = time.perf_counter_ns()
+        if not self.done.wait(timeout):
+            if recorder is not None:
+                with self.lock:
+                    recorder.record_timeout(NO_RISE if self.rise_ns is None else NO_FALL)
+            return None
+        with self.lock:
+            pulse_ns = self.fall_ns - self.rise_ns
+            latency_ns = self.rise_ns - trigger_ns
+        if recorder is not None:
+            recorder.record(latency_ns, pulse_ns)
+        return pulse_ns / 1e9
+
+    def close(self):
+        self.gpio.remove_event_detect(self.echo)
+
+
+def speed_of_sound(temperature_c=None):
+    """
+    기온(°C)에 따른 소리의 속도(cm/s)를 반환합니다. 기온을 모르면 20°C 기준값을 사용합니다.
+    """
+    if temperature_c is None:
+        return SPEED_OF_SOUND
+    return 33130 + 60.6 * temperature_c
+
+
+# distance: 필터링된 거리 (cm, 유효한 값이 없으면 None)
+# spread: 유효한 값들의 중앙값 절대 편차 (cm, 작을수록 안정적)
+# valid: 유효 범위 안에 든 초음파 수, quality: valid / pings
+BurstResult = collections.namedtuple('BurstResult', ['distance', 'spread', 'valid', 'pings', 'quality'])
+
+
+def pulse_to_distance(pulse_duration, speed_of_sound=SPEED_OF_SOUND):
+    """
+    펄스 길이(초)를 거리(cm)로 바꿉니다. 유효 범위를 벗어나면 None
+    """
+    if pulse_duration is None:
+        return None
+    # 왕복 거리이므로 2로 나눕니다.
+    distance = (pulse_duration * speed_of_sound) / 2
+    if MIN_DISTANCE <= distance <= MAX_DISTANCE:
+        return distance
+    return None
+
+
+class HCSR04Ranger:
+    """
+    HC-SR04 거리 측정기입니다. backend 로 POLL / EDGE 측정 방식을 고르며
+    어느 방식이든 measure_pulse() / get_distance() / burst() 로 같은 방식으로 사용합니다.
+
+    gpio 에 RPi.GPIO 대신 fake_gpio 를 넘기면 라즈베리파이 없이 테스트할 수 있습니다.
+    recorder 에 timing_stats.TimingRecorder 를 넘기면 측정 타이밍을 히스토그램으로 기록합니다.
+    """
+
+    def __init__(self, trigger, echo, backend=EDGE, gpio=None, timeout=ECHO_TIMEOUT, recorder=None):
+        if backend not in (POLL, EDGE):
+            raise ValueError(f"알 수 없는 측정 방식: {backend}")
+        self.trigger = trigger
+        self.echo = echo
+        self.backend = backend
+        self.gpio = gpio
+        self.timeout = timeout
+        self.recorder = recorder
+        self.timer = None
+        # burst() 용 배열 (처음 사용할 때 할당하고 재사용)
+        self.pulses = None
+        self.distances = None
+
+    def open(self):
+        if self.gpio is None:
+            import RPi.GPIO as GPIO
+            self.gpio = GPIO
+        gpio = self.gpio
+        if gpio.getmode() is None:
+            gpio.setmode(gpio.BCM)
+        gpio.setup(self.trigger, gpio.OUT)
+        gpio.setup(self.echo, gpio.IN)
+        gpio.output(self.trigger, False)
+        if self.backend == EDGE:
+            self.timer = EdgeEchoTimer(gpio, self.echo)
+        return self
+
+    def measure_pulse(self):
+        if self.timer is not None:
+            return self.timer.measure(self.trigger, self.timeout, self.recorder)
+        return measure_echo_poll(self.gpio, self.trigger, self.echo, self.timeout, self.recorder)
+
+    def get_distance(self, temperature_c=None):
+        pulse = self.measure_pulse()
+        distance = pulse_to_distance(pulse, speed_of_sound(temperature_c))
+        if distance is None and pulse is not None and self.recorder is not None:
+            self.recorder.record_timeout(OUT_OF_RANGE)
+        return distance
+
+    def burst(self, pings=BURST_PINGS, temperature_c=None, method=MEDIAN, interval=PING_INTERVAL):
+        """
+        초음파를 interval 간격으로 pings 번 보내고, 유효 범위 안의 값들을
+        중앙값(MEDIAN) 또는 trimmed mean(TRIMMED) 으로 합친 BurstResult 를 반환합니다.
+
+        측정 루프에서는 미리 할당한 배열에 펄스 길이만 기록하고,
+        거리 변환과 필터링은 버스트가 끝난 뒤 NumPy 로 한 번에 계산합니다.
+        """
+        if method not in (MEDIAN, TRIMMED):
+            raise ValueError(f"알 수 없는 방식: {method}")
+        if self.pulses is None or len(self.pulses) < pings:
+            self.pulses = np.empty(pings)
+            self.distances = np.empty(pings)
+        pulses = self.pulses[:pings]
+        distances = self.distances[:pings]
+
+        deadline = time.perf_counter()
+        for i in range(pings):
+            now = time.perf_counter()
+            if now < deadline:
+                time.sleep(deadline - now)
+            deadline += interval
+            pulse = self.measure_pulse()
+            pulses[i] = np.nan if pulse is None else pulse
+
+        np.multiply(pulses, speed_of_sound(temperature_c) / 2, out=distances)
+        with np.errstate(invalid='ignore'):
+            valid = distances[(distances >= MIN_DISTANCE) & (distances <= MAX_DISTANCE)]
+        count = len(valid)
+        if self.recorder is not None:
+            for _ in range(int(np.count_nonzero(~np.isnan(pulses))) - count):
+                self.recorder.record_timeout(OUT_OF_RANGE)
+        if count == 0:
+            return BurstResult(None, None, 0, pings, 0.0)
+
+        median = float(np.median(valid))
+        spread = float(np.median(np.abs(valid - median)))
+        if method == MEDIAN:
+            distance = median
+        else:
+            valid.sort()
+            trim = int(count * TRIM_FRACTION)
+            distance = float(valid[trim:count - trim].mean())
+        return BurstResult(distance, spread, count, pings, count / pings)
+
+    def close(self):
+        if self.timer is not None:
+            self.timer.close()
+            self.timer = None
+        if self.gpio is not None:
+            self.gpio.cleanup((self.trigger, self.echo))
+
+
+def main():
+    """
+    fake_gpio 로 두 측정 방식의 CPU 사용 시간과 측정 속도, 타이밍 분포를 비교합니다.
+    """
+    import fake_gpio
+    from timing_stats import TimingRecorder
+
+    count = 50
+    fake_gpio.attach_hc_sr04(27, 17, lambda: 300.0)
+    for backend in (POLL, EDGE):
+        recorder = TimingRecorder(backend)
+        ranger = HCSR04Ranger(27, 17, backend=backend, gpio=fake_gpio, recorder=recorder).open()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        distances = [ranger.get_distance() for _ in range(count)]
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        ranger.close()
+        ok = [d for d in distances if d is not None]
+        print(f"{backend:>4}: {count / wall:6.1f} 회/s, CPU {cpu / wall * 100:5.1f}%, "
+              f"평균 거리 {sum(ok) / max(len(ok), 1):.2f} cm ({len(ok)}/{count})")
+        print(recorder.report())
+
+
+if __name__ == '__main__':
+    main()
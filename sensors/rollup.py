@@ -0,0 +1,124 @@
+import math
+import datetime
+
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 기본 집계 구간 (초)
+ROLLUP_SECONDS = 60
+
+
+def rollup_header(names):
+    """
+    rollup 행의 열 이름 목록을 반환합니다.
+    """
+    columns = ['window_start', 'count']
+    for name in names:
+        columns += [f'{name}_min', f'{name}_mean', f'{name}_max']
+    return columns
+
+
+class WindowAggregator:
+    """
+    고정 길이 구간(tumbling window)별로 각 값의 min / mean / max / count 를 계산합니다.
+
+    샘플마다 합계, 최솟값, 최댓값만 갱신하므로 샘플 하나당 O(1) 이며,
+    구간이 끝나면 rollup 행 하나를 돌려줍니다.
+    rollup 행: [구간 시작 시각, count, 값1_min, 값1_mean, 값1_max, 값2_min, ...]
+    """
+
+    def __init__(self, window_seconds=ROLLUP_SECONDS, num_values=2, digits=2):
+        self.window_seconds = window_seconds
+        self.num_values = num_values
+        self.digits = digits
+        self.window_start = None
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.sums = [0.0] * self.num_values
+        self.counts = [0] * self.num_values
+        self.mins = [math.inf] * self.num_values
+        self.maxs = [-math.inf] * self.num_values
+
+    def _window_of(self, when):
+        seconds = when.timestamp()
+        start = seconds - seconds % self.window_seconds
+        return datetime.datetime.fromtimestamp(start)
+
+    def add(self, values, when=None):
+        """
+        샘플 하나를 더합니다. 이전 구간이 끝났으면 그 rollup 행을, 아니면 None 을 반환합니다.
+        None 인 값은 count 에만 포함되고 통계에서는 빠집니다.
+        """
+        when = when or datetime.datetime.now()
+        window = self._window_of(when)
+        finished = None
+        if self.window_start is not None and window != self.window_start:
+            finished = self.flush()
+        self.window_start = window
+
+        self.count += 1
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            value = float(value)
+            self.sums[i] += value
+            self.counts[i] += 1
+            if value < self.mins[i]:
+                self.mins[i] = value
+            if value > self.maxs[i]:
+                self.maxs[i] = value
+        return finished
+
+    def flush(self):
+        """
+        현재 구간의 rollup 행을 반환하고 구간을 비웁니다. (샘플이 없으면 None)
+        """
+        if self.window_start is None or self.count == 0:
+            return None
+        row = [self.window_start.strftime(TIME_FORMAT), self.count]
+        for i in range(self.num_values):
+            if self.counts[i]:
+                row += [self.mins[i], round(self.sums[i] / self.counts[i], self.digits), self.maxs[i]]
+            else:
+                row += ['', '', '']
+        self._reset()
+        return row
+
+
+class RollupStage:
+    """
+    센서 값과 업로더 사이에 두는 집계 단계입니다. put() / close() 를 제공하므로
+    업로더 자리에 그대로 쓸 수 있습니다.
+
+    - rollup_uploaders: {구간(초): 업로더} 구간별 rollup 행을 해당 업로더로 보냅니다.
+    - raw_uploader: 있으면 원본 행도 함께 보냅니다. (None 이면 rollup 만 업로드)
+    """
+
+    def __init__(self, rollup_uploaders, raw_uploader=None, num_values=2):
+        self.raw_uploader = raw_uploader
+        self.stages = [(WindowAggregator(window, num_values), uploader)
+                       for window, uploader in rollup_uploaders.items()]
+
+    def put(self, row, when=None):
+        """
+        row = [시간 문자열, 값1, 값2, ...]
+        """
+        when = when or datetime.datetime.now()
+        if self.raw_uploader is not None:
+            self.raw_uploader.put(row)
+        for aggregator, uploader in self.stages:
+            finished = aggregator.add(row[1:], when)
+            if finished is not None:
+                uploader.put(finished)
+        return True
+
+    def close(self, timeout=None):
+        for aggregator, uploader in self.stages:
+            finished = aggregator.flush()
+            if finished is not None:
+                uploader.put(finished)
+            uploader.close(timeout)
+        if self.raw_uploader is not None:
+            self.raw_uploader.close(timeout)
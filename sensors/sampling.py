@@ -0,0 +1,90 @@
+import time
+
+
+# 마감 시각을 놓쳤을 때의 처리 방식
+SKIP     = 'skip'      # 놓친 샘플은 건너뛰고 다음 정규 시각에 맞춤 (주기 유지)
+CATCH_UP = 'catch_up'  # 놓친 샘플을 지연 없이 연달아 실행 (샘플 수 유지)
+
+
+class PeriodicSampler:
+    """
+    time.monotonic() 기준의 절대 마감 시각(start + k * period)에 맞춰 깨어나는 샘플링 스케줄러입니다.
+
+    작업 후 time.sleep(N) 을 하는 방식은 실제 주기가 N + 작업 시간이 되어 계속 밀리지만,
+    이 스케줄러는 작업 시간과 상관없이 정확히 period 간격을 유지합니다.
+    마감 시각보다 늦게 깨어난 정도(lateness)와 놓친 마감 수(missed)를 기록합니다.
+    (missed: SKIP 은 건너뛴 마감 수, CATCH_UP 은 한 주기 이상 늦게 실행된 샘플 수)
+
+        sampler = PeriodicSampler(2.0)
+        while True:
+            sampler.wait()
+            ... 센서 읽기 / 업로드 ...
+    """
+
+    def __init__(self, period, policy=SKIP, clock=time.monotonic, sleep=time.sleep):
+        if policy not in (SKIP, CATCH_UP):
+            raise ValueError(f"알 수 없는 정책: {policy}")
+        self.period = period
+        self.policy = policy
+        self.clock = clock
+        self.sleep = sleep
+        self.start = None
+        self.index = 0
+
+        self.ticks = 0
+        self.missed = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def next_deadline(self):
+        if self.start is None:
+            return self.clock()
+        return self.start + self.index * self.period
+
+    def wait(self):
+        """
+        다음 마감 시각까지 대기하고, 늦어진 시간(초)을 반환합니다.
+        """
+        if self.start is None:
+            self.start = self.clock()
+        deadline = self.start + self.index * self.period
+        now = self.clock()
+        while now < deadline:
+            self.sleep(deadline - now)
+            now = self.clock()
+
+        lateness = now - deadline
+        self.ticks += 1
+        self.total_lateness += lateness
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+
+        self.index += 1
+        if self.policy == SKIP:
+            # 이미 지나간 마감 시각은 건너뜀
+            behind = int((now - self.start) // self.period) + 1 - self.index
+            if behind > 0:
+                self.missed += behind
+                self.index += behind
+        elif lateness >= self.period:
+            self.missed += 1
+        return lateness
+
+    def __iter__(self):
+        while True:
+            self.wait()
+            yield self.ticks
+
+    def stats(self):
+        return {
+            'period': self.period,
+            'ticks': self.ticks,
+            'missed': self.missed,
+            'mean_lateness': self.total_lateness / self.ticks if self.ticks else 0.0,
+            'max_lateness': self.max_lateness,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"샘플링 주기 {s['period']}s: 실행 {s['ticks']}회, 놓친 마감 {s['missed']}회, "
+                f"평균 지연 {s['mean_lateness'] * 1000:.1f} ms, 최대 지연 {s['max_lateness'] * 1000:.1f} ms")
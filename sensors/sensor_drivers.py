@@ -0,0 +1,120 @@
+import abc
+
+from hc_sr04_timing import HCSR04Ranger, EDGE, ECHO_TIMEOUT
+
+
+class SensorDriver(abc.ABC):
+    """
+    센서 드라이버 인터페이스입니다.
+
+    - open(): 장치 초기화 (GPIO 설정 등)
+    - read(): 측정값을 {이름: 값} 딕셔너리로 반환, 실패하면 None
+    - close(): 장치 해제
+    - min_interval: 연속된 두 read() 사이의 최소 간격 (초)
+    """
+
+    min_interval = 0.0
+    fields = ()
+
+    def __init__(self, name):
+        self.name = name
+
+    def open(self):
+        pass
+
+    @abc.abstractmethod
+    def read(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+class DHTDriver(SensorDriver):
+    """
+    DHT11 / DHT22 온습도 센서 드라이버입니다. (adafruit_dht 사용)
+    """
+
+    # 최소 측정 간격 (초). 데이터시트상 DHT11 은 1초지만, adafruit_dht 는 모델과 상관없이
+    # 2초 안에 다시 읽으면 센서를 읽지 않고 이전 값을 돌려주므로 둘 다 2초
+    MIN_INTERVAL = {'DHT11': 2.0, 'DHT22': 2.0}
+    fields = ('temperature', 'humidity')
+
+    def __init__(self, model='DHT11', pin='D4', name=None):
+        if model not in self.MIN_INTERVAL:
+            raise ValueError(f"지원하지 않는 DHT 모델: {model}")
+        super().__init__(name or f"{model.lower()}_{pin}")
+        self.model = model
+        self.pin = pin
+        self.min_interval = self.MIN_INTERVAL[model]
+        self.device = None
+
+    def open(self):
+        import board
+        import adafruit_dht
+        self.device = getattr(adafruit_dht, self.model)(getattr(board, self.pin))
+
+    def read(self):
+        if self.device is None:
+            return None
+        try:
+            temperature_c = self.device.temperature
+            humidity = self.device.humidity
+        except RuntimeError as error:
+            # DHT 센서는 가끔 읽기 오류가 발생할 수 있습니다.
+            print(f"[{self.name}] 센서 읽기 오류: {error.args[0]}")
+            return None
+        if temperature_c is None or humidity is None:
+            return None
+        return {'temperature': float(temperature_c), 'humidity': float(humidity)}
+
+    def close(self):
+        if self.device is not None:
+            self.device.exit()
+            self.device = None
+
+
+class HCSR04Driver(SensorDriver):
+    """
+    HC-SR04 초음파 거리 센서 드라이버입니다. (RPi.GPIO, BCM 핀 번호)
+    backend 로 ECHO 펄스 측정 방식(EDGE / POLL)을 고릅니다.
+    pings 가 1 보다 크면 버스트 측정의 중앙값을 사용하며, temperature_c 로 음속을 보정합니다.
+    """
+
+    # 데이터시트 권장 측정 주기 60ms (이전 초음파의 잔향 방지)
+    min_interval = 0.06
+    fields = ('distance',)
+
+    def __init__(self, trigger=27, echo=17, name=None, backend=EDGE, timeout=ECHO_TIMEOUT, gpio=None,
+                 pings=1, temperature_c=None, min_quality=0.6):
+        super().__init__(name or f"hc_sr04_{trigger}_{echo}")
+        self.ranger = HCSR04Ranger(trigger, echo, backend=backend, gpio=gpio, timeout=timeout)
+        self.pings = pings
+        self.temperature_c = temperature_c
+        self.min_quality = min_quality
+        self.min_interval = HCSR04Driver.min_interval * pings
+        self.opened = False
+
+    def open(self):
+        self.ranger.open()
+        self.opened = True
+
+    def read(self):
+        if not self.opened:
+            return None
+        if self.pings > 1:
+            result = self.ranger.burst(self.pings, self.temperature_c, interval=HCSR04Driver.min_interval)
+            distance = result.distance if result.quality >= self.min_quality else None
+        else:
+            distance = self.ranger.get_distance(self.temperature_c)
+        if distance is None:
+            return None
+        return {'distance': distance}
+
+    def close(self):
+        if self.opened:
+            self.ranger.close()
+            self.opened = False
@@ -0,0 +1,198 @@
+import time
+import heapq
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sensor_drivers import DHTDriver, HCSR04Driver
+
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SensorTask:
+    """
+    SensorRuntime 에 등록된 센서 하나의 주기 / 통계 정보입니다.
+    """
+
+    def __init__(self, driver, period, callback):
+        # 드라이버의 최소 측정 간격보다 짧은 주기는 허용하지 않음
+        self.driver = driver
+        self.period = max(period, driver.min_interval)
+        self.callback = callback
+        self.start = None
+        self.index = 0
+        self.busy = False
+
+        self.reads = 0
+        self.failures = 0
+        self.missed = 0
+        self.max_read_seconds = 0.0
+
+    def next_deadline(self):
+        return self.start + self.index * self.period
+
+    def report(self):
+        return (f"{self.driver.name}: 주기 {self.period}s, 읽기 {self.reads}회, 실패 {self.failures}회, "
+                f"놓친 주기 {self.missed}회, 최대 읽기 시간 {self.max_read_seconds * 1000:.1f} ms")
+
+
+class SensorRuntime:
+    """
+    여러 센서를 각자의 주기로 동시에 읽는 런타임입니다.
+
+    - 스케줄러 스레드 하나가 센서별 절대 마감 시각(start + k * period)을 힙으로 관리하고,
+      마감이 된 센서의 read() 를 스레드 풀에 넘깁니다.
+    - 센서마다 풀 스레드를 하나씩 쓸 수 있으므로 느린 DHT 읽기가 초음파 읽기를 늦추지 않습니다.
+    - 같은 센서의 이전 read() 가 아직 끝나지 않았으면 그 주기는 건너뜁니다. (missed 로 기록)
+
+        runtime = SensorRuntime(on_reading=print)
+        runtime.add(DHTDriver('DHT11', 'D4'), 2.0)
+        runtime.add(HCSR04Driver(27, 17), 1.0)
+        runtime.start()
+    """
+
+    def __init__(self, on_reading=None, max_workers=None):
+        self.on_reading = on_reading
+        self.max_workers = max_workers
+        self.tasks = []
+        self.executor = None
+        self.thread = None
+        self.wakeup = threading.Condition()
+        self.closing = False
+
+    def add(self, driver, period=None, callback=None):
+        """
+        센서를 등록합니다. callback(driver, when, values) 가 없으면 on_reading 을 사용합니다.
+        """
+        if self.thread is not None:
+            raise RuntimeError("start() 이후에는 센서를 추가할 수 없습니다.")
+        task = SensorTask(driver, period or driver.min_interval, callback or self.on_reading)
+        self.tasks.append(task)
+        return task
+
+    def start(self):
+        for task in self.tasks:
+            task.driver.open()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers or max(1, len(self.tasks)),
+                                           thread_name_prefix="sensor")
+        self.thread = threading.Thread(target=self._run, name="sensor-runtime", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        now = time.monotonic()
+        heap = []
+        for i, task in enumerate(self.tasks):
+            task.start = now
+            heapq.heappush(heap, (now, i))
+
+        if not heap:
+            # 등록된 센서가 없으면 stop() 까지 대기
+            with self.wakeup:
+                self.wakeup.wait_for(lambda: self.closing)
+            return
+
+        while True:
+            with self.wakeup:
+                if self.closing:
+                    return
+                deadline, i = heap[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self.wakeup.wait(delay)
+                    continue
+            heapq.heappop(heap)
+            task = self.tasks[i]
+            if task.busy:
+                task.missed += 1
+            else:
+                task.busy = True
+                self.executor.submit(self._read, task)
+
+            # 다음 마감 시각 (이미 지나간 마감은 건너뜀)
+            task.index += 1
+            behind = int((time.monotonic() - task.start) // task.period) + 1 - task.index
+            if behind > 0:
+                task.missed += behind
+                task.index += behind
+            heapq.heappush(heap, (task.next_deadline(), i))
+
+    def _read(self, task):
+        started = time.monotonic()
+        try:
+            values = task.driver.read()
+        except Exception as e:
+            print(f'[{task.driver.name}] Error : ' + str(e))
+            values = None
+        finally:
+            elapsed = time.monotonic() - started
+            if elapsed > task.max_read_seconds:
+                task.max_read_seconds = elapsed
+            task.busy = False
+
+        if values is None:
+            task.failures += 1
+            return
+        task.reads += 1
+        if task.callback is not None:
+            try:
+                task.callback(task.driver, datetime.datetime.now(), values)
+            except Exception as e:
+                print(f'[{task.driver.name}] Error : ' + str(e))
+
+    def stop(self, timeout=None):
+        with self.wakeup:
+            self.closing = True
+            self.wakeup.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        for task in self.tasks:
+            try:
+                task.driver.close()
+            except Exception as e:
+                print(f'[{task.driver.name}] Error : ' + str(e))
+
+    def report(self):
+        return "\n".join(task.report() for task in self.tasks)
+
+
+# 한 대의 라즈베리파이에 연결된 센서 목록: (드라이버, 읽기 주기(초), 워크시트 이름)
+SENSORS = [
+    (DHTDriver('DHT11', 'D4', name='dht11_sensor'), 2.0, 'dht11_sensor'),
+    (HCSR04Driver(trigger=27, echo=17, name='hc_sr0_sensor'), 1.0, 'hc_sr0_sensor'),
+]
+
+
+def main():
+    from gspread_fanin import FanInWriter
+
+    # 모든 센서의 행을 하나의 FanInWriter 로 모아 flush 마다 한 번에 업로드
+    writer = FanInWriter()
+
+    def on_reading(driver, when, values):
+        row = [when.strftime(TIME_FORMAT)] + [values[field] for field in driver.fields]
+        print(f"{row[0]} {driver.name}: {values}")
+        writer.put(sheets[driver.name], row)
+
+    sheets = {}
+    runtime = SensorRuntime(on_reading=on_reading)
+    for driver, period, sheet in SENSORS:
+        sheets[driver.name] = sheet
+        runtime.add(driver, period)
+
+    runtime.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("프로그램을 종료합니다.")
+    finally:
+        runtime.stop()
+        writer.close()
+        print(runtime.report())
+
+
+if __name__ == '__main__':
+    main()
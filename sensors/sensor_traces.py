@@ -0,0 +1,140 @@
+import time
+import datetime
+
+import numpy as np
+
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 하루 주기 (초)
+DAY_SECONDS = 24 * 60 * 60
+
+
+def _rng(seed):
+    return np.random.default_rng(seed)
+
+
+def _timestamps(n, period, start):
+    start = np.datetime64(start or datetime.datetime.now().replace(microsecond=0), 's')
+    offsets = np.round(np.arange(n) * period * 1000).astype('timedelta64[ms]')
+    return (start + offsets).astype('datetime64[s]')
+
+
+def _anomalies(rng, n, rate, length, magnitude_low, magnitude_high):
+    """
+    이상치 구간의 오프셋 배열과 정답 레이블(bool)을 반환합니다.
+    각 샘플에서 rate 확률로 이상치가 시작되어 length 샘플 동안 유지되며, 크기와 부호는 무작위입니다.
+    """
+    starts = rng.random(n) < rate
+    magnitude = rng.uniform(magnitude_low, magnitude_high, n) * rng.choice((-1.0, 1.0), n)
+    offsets = np.where(starts, magnitude, 0.0)
+    if length > 1:
+        kernel = np.ones(length)
+        offsets = np.convolve(offsets, kernel)[:n]
+        labels = np.convolve(starts.astype(np.float64), kernel)[:n] > 0
+    else:
+        labels = starts
+    return offsets, labels
+
+
+def generate_dht11_trace(duration_seconds, period=2.0, start=None, seed=None,
+                         temperature_base=22.0, temperature_amplitude=5.0,
+                         humidity_base=55.0, humidity_amplitude=10.0, cycle_seconds=DAY_SECONDS,
+                         noise_std=(0.3, 1.0), drift_per_hour=(0.0, 0.0),
+                         dropout_rate=0.0, anomaly_rate=0.0, anomaly_length=1,
+                         anomaly_magnitude=(8.0, 15.0), quantize=True):
+    """
+    DHT11 온습도 시계열을 한 번에 생성합니다.
+
+    - 온도는 cycle_seconds 주기의 사인파, 습도는 온도와 반대로 움직이는 코사인파를 따릅니다.
+    - noise_std / drift_per_hour: (온도, 습도) 가우시안 노이즈의 표준편차와 시간당 드리프트
+    - dropout_rate: 읽기 실패 확률 (해당 샘플은 NaN)
+    - anomaly_rate / anomaly_length / anomaly_magnitude: 이상치 시작 확률, 길이(샘플), 크기 범위
+    - quantize: DHT11 분해능(1 단위)에 맞춰 반올림
+
+    반환값은 gspread_reader.rows_to_arrays 와 같은 {열 이름: 배열} 형식이며,
+    'anomaly' / 'dropout' 열에 정답 레이블(bool)이 들어 있습니다.
+    """
+    rng = _rng(seed)
+    n = int(duration_seconds // period)
+    t = np.arange(n) * period
+    phase = 2 * np.pi * t / cycle_seconds
+
+    temperature = (temperature_base + temperature_amplitude * np.sin(phase)
+                   + drift_per_hour[0] * t / 3600 + rng.normal(0, noise_std[0], n))
+    humidity = (humidity_base - humidity_amplitude * np.sin(phase)
+                + drift_per_hour[1] * t / 3600 + rng.normal(0, noise_std[1], n))
+
+    offsets, anomaly = _anomalies(rng, n, anomaly_rate, anomaly_length, *anomaly_magnitude)
+    temperature += offsets
+    humidity = np.clip(humidity, 0, 100)
+    if quantize:
+        temperature = np.round(temperature)
+        humidity = np.round(humidity)
+
+    dropout = rng.random(n) < dropout_rate
+    temperature[dropout] = np.nan
+    humidity[dropout] = np.nan
+    return {
+        'timestamp': _timestamps(n, period, start),
+        'temperature': temperature,
+        'humidity': humidity,
+        'anomaly': anomaly & ~dropout,
+        'dropout': dropout,
+    }
+
+
+def generate_hc_sr04_trace(duration_seconds, period=1.0, start=None, seed=None,
+                           distance_base=150.0, walk_std=0.5, noise_std=2.0, drift_per_hour=0.0,
+                           dropout_rate=0.0, anomaly_rate=0.0, anomaly_length=1,
+                           anomaly_magnitude=(50.0, 150.0)):
+    """
+    HC-SR04 거리 시계열을 한 번에 생성합니다.
+
+    - 거리는 distance_base 에서 시작하는 랜덤 워크(walk_std) + 측정 노이즈(noise_std) 입니다.
+    - 이상치는 simulate_distance() 처럼 50~150cm 의 급격한 거리 변화이며 anomaly_length 샘플 동안 유지됩니다.
+    - 값은 유효 측정 범위(2 ~ 400cm)로 잘리고, dropout 샘플은 NaN 입니다.
+    """
+    rng = _rng(seed)
+    n = int(duration_seconds // period)
+    t = np.arange(n) * period
+
+    distance = (distance_base + np.cumsum(rng.normal(0, walk_std, n))
+                + drift_per_hour * t / 3600 + rng.normal(0, noise_std, n))
+    offsets, anomaly = _anomalies(rng, n, anomaly_rate, anomaly_length, *anomaly_magnitude)
+    distance = np.clip(distance + offsets, 2, 400)
+
+    dropout = rng.random(n) < dropout_rate
+    distance[dropout] = np.nan
+    return {
+        'timestamp': _timestamps(n, period, start),
+        'distance': distance,
+        'anomaly': anomaly & ~dropout,
+        'dropout': dropout,
+    }
+
+
+def trace_rows(trace, value_columns, digits=2):
+    """
+    생성한 시계열을 업로드 행 목록 [[시간 문자열, 값1, ...], ...] 으로 바꿉니다. (dropout 샘플은 제외)
+    """
+    keep = ~trace['dropout']
+    times = np.datetime_as_string(trace['timestamp'][keep], unit='s')
+    values = np.round(np.column_stack([trace[name][keep] for name in value_columns]), digits)
+    return [[when.replace('T', ' ')] + row for when, row in zip(times.tolist(), values.tolist())]
+
+
+def replay(rows, uploader, period, speedup=1000.0, clock=time.monotonic, sleep=time.sleep):
+    """
+    rows 를 실제 시간의 speedup 배 속도로 uploader.put() 에 넣습니다. (speedup=None 이면 대기 없이)
+    업로더 / 분석 코드의 부하 테스트에 사용하며, 넣은 행 수와 걸린 시간(초)을 반환합니다.
+    """
+    start = clock()
+    interval = None if not speedup else period / speedup
+    for i, row in enumerate(rows):
+        if interval is not None:
+            delay = start + i * interval - clock()
+            if delay > 0:
+                sleep(delay)
+        uploader.put(row)
+    return len(rows), clock() - start
@@ -0,0 +1,143 @@
+import atexit
+import threading
+
+
+# 히스토그램 정밀도: 2 ** HISTOGRAM_BITS 개의 하위 구간 (상대 오차 약 1.6% 이내)
+HISTOGRAM_BITS    = 7
+# 기록할 수 있는 최대값 (ns). 이보다 큰 값은 최대값으로 기록
+HISTOGRAM_HIGHEST = 10 * 10**9
+
+# 기본으로 보고하는 백분위수
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+
+# 타임아웃 / 실패 원인
+NO_RISE      = 'no_rise'       # 트리거 후 ECHO 가 HIGH 가 되지 않음
+NO_FALL      = 'no_fall'       # ECHO 가 HIGH 에서 내려오지 않음
+OUT_OF_RANGE = 'out_of_range'  # 펄스는 측정했지만 2 ~ 400cm 범위 밖
+
+
+class LogHistogram:
+    """
+    HDR 방식의 로그-선형 히스토그램입니다. (정수 값, 보통 ns)
+
+    값을 2의 거듭제곱 구간으로 나누고 각 구간을 2 ** bits 개의 같은 폭으로 다시 나누므로,
+    1us 부터 수 초까지 같은 상대 정밀도로 기록하면서도 기록은 O(1), 메모리는 고정 크기입니다.
+    """
+
+    def __init__(self, highest=HISTOGRAM_HIGHEST, bits=HISTOGRAM_BITS):
+        self.bits = bits
+        self.sub_count = 1 << bits
+        self.half = self.sub_count // 2
+        self.highest = highest
+        self.counts = [0] * (self._index(highest) + 1)
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        shift = max(0, value.bit_length() - self.bits)
+        return shift * self.half + (value >> shift)
+
+    def _value_at(self, index):
+        # 구간의 가운데 값
+        if index < self.sub_count:
+            return index
+        shift = (index - self.half) // self.half
+        mantissa = index - shift * self.half
+        return (mantissa << shift) + (1 << shift) // 2
+
+    def record(self, value):
+        value = min(max(int(value), 0), self.highest)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        if self.total == 0:
+            return None
+        target = max(1, int(round(self.total * p / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(max(self._value_at(index), self.min), self.max)
+        return self.max
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.min = None
+        self.max = None
+
+
+class TimingRecorder:
+    """
+    HC-SR04 측정 경로의 타이밍을 기록합니다. (HCSR04Ranger(recorder=...) 로 사용)
+
+    - latency: 트리거 펄스가 끝난 뒤 ECHO 상승 엣지까지의 시간 (ns)
+    - pulse: ECHO 펄스 길이 (ns)
+    - rise_loops / fall_loops: POLL 방식에서 상승 / 하강 엣지를 기다리며 돈 루프 수
+    - timeouts: 실패 원인별 횟수 (NO_RISE / NO_FALL / OUT_OF_RANGE)
+
+    latency 의 꼬리(p99)가 커지면 스케줄링 지연이 측정에 섞이고 있다는 뜻이고,
+    rise_loops 가 줄어들면 CPU 가 다른 작업에 빼앗기고 있다는 뜻입니다.
+    """
+
+    def __init__(self, name='hc_sr04'):
+        self.name = name
+        self.lock = threading.Lock()
+        self.histograms = {
+            'latency': LogHistogram(),
+            'pulse': LogHistogram(),
+            'rise_loops': LogHistogram(),
+            'fall_loops': LogHistogram(),
+        }
+        self.readings = 0
+        self.timeouts = {NO_RISE: 0, NO_FALL: 0, OUT_OF_RANGE: 0}
+
+    def record(self, latency_ns, pulse_ns, rise_loops=None, fall_loops=None):
+        with self.lock:
+            self.readings += 1
+            self.histograms['latency'].record(latency_ns)
+            self.histograms['pulse'].record(pulse_ns)
+            if rise_loops is not None:
+                self.histograms['rise_loops'].record(rise_loops)
+                self.histograms['fall_loops'].record(fall_loops)
+
+    def record_timeout(self, cause):
+        with self.lock:
+            # OUT_OF_RANGE 는 record() 로 이미 센 측정의 결과이므로 측정 수에 더하지 않음
+            if cause != OUT_OF_RANGE:
+                self.readings += 1
+            self.timeouts[cause] = self.timeouts.get(cause, 0) + 1
+
+    def stats(self, percentiles=REPORT_PERCENTILES):
+        with self.lock:
+            result = {'readings': self.readings, 'timeouts': dict(self.timeouts)}
+            for key, histogram in self.histograms.items():
+                result[key] = {f'p{p:g}': histogram.percentile(p) for p in percentiles}
+                result[key]['max'] = histogram.max
+        return result
+
+    def report(self, percentiles=REPORT_PERCENTILES):
+        s = self.stats(percentiles)
+        lines = [f"[{self.name}] 측정 {s['readings']}회, 실패 " +
+                 ", ".join(f"{cause} {count}회" for cause, count in s['timeouts'].items())]
+        for key, unit, scale in (('latency', 'us', 1e3), ('pulse', 'us', 1e3),
+                                 ('rise_loops', '회', 1), ('fall_loops', '회', 1)):
+            values = s[key]
+            if values['max'] is None:
+                continue
+            text = ", ".join(f"{name} {value / scale:.1f}" for name, value in values.items())
+            lines.append(f"  {key} ({unit}): {text}")
+        return "\n".join(lines)
+
+    def print_at_exit(self):
+        """
+        프로그램이 종료될 때 report() 를 출력하도록 등록합니다.
+        """
+        atexit.register(lambda: print(self.report()))
+        return self
@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'sensors'))
+sys.path.insert(0, os.path.join(ROOT, 'samples'))
+
+from fake_gspread import FakeClient
+from googlespreadsheet import GspreadSession, set_gspread_session
+from gspread_scheduler import SheetsScheduler
+
+# 라즈베리파이에서 직접 실행하는 센서 확인 스크립트 (import 하면 무한 루프로 측정을 시작함)
+collect_ignore = ['dht_test.py', 'hc_test.py', 'old_dht_test.py', 'old_hc_test.py']
+
+
+@pytest.fixture
+def client():
+    return FakeClient(auto_create=True, seed=0)
+
+
+@pytest.fixture
+def session(client):
+    """
+    FakeClient 를 쓰는 세션입니다. 쿼터는 테스트가 토큰을 기다리지 않을 만큼 넉넉하게 잡습니다.
+    기본 세션도 이 세션으로 바꿔서, session 을 넘기지 않는 코드도 가짜 client 를 쓰게 합니다.
+    """
+    session = GspreadSession(client_factory=lambda: client,
+                             scheduler=SheetsScheduler(read_quota=6000, write_quota=6000, seed=0))
+    set_gspread_session(session)
+    yield session
+    set_gspread_session(None)
+
+
+def sheet_rows(session, sheet):
+    return session.worksheet(sheet).get_all_values()
+
+
+def wait_until(predicate, timeout=5.0):
+    """
+    백그라운드 스레드의 재시도를 기다립니다. (close() 는 실패한 묶음을 다시 시도하지 않고 종료함)
+    """
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
@@ -0,0 +1,63 @@
+import datetime
+
+import numpy as np
+
+from deadband import DeadbandEncoder, reconstruct, reconstruct_arrays
+
+T0 = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+
+def encode(values, thresholds, period_seconds=2, heartbeat_seconds=300):
+    encoder = DeadbandEncoder(thresholds, heartbeat_seconds)
+    times = [T0 + datetime.timedelta(seconds=i * period_seconds) for i in range(len(values))]
+    kept = [i for i, (row, when) in enumerate(zip(values, times)) if encoder.should_emit(row, when)]
+    return encoder, np.array(times, dtype='datetime64[ms]'), kept
+
+
+def test_reconstruction_error_is_within_threshold():
+    rng = np.random.default_rng(0)
+    values = np.cumsum(rng.normal(0, 0.3, size=(500, 2)), axis=0) + [25.0, 50.0]
+    thresholds = [0.5, 1.0]
+    encoder, times, kept = encode(values.tolist(), thresholds)
+    assert 0 < encoder.emitted < len(values)
+    assert encoder.emitted + encoder.suppressed == len(values)
+
+    restored = reconstruct(times[kept], values[kept], times)
+    assert np.all(np.abs(restored - values) <= np.array(thresholds) + 1e-9)
+
+
+def test_heartbeat_emits_unchanged_values():
+    encoder, times, kept = encode([[20.0]] * 301, [0.5], heartbeat_seconds=60)
+    # 2 초 주기, 60 초마다 한 번
+    assert kept == list(range(0, 301, 30))
+
+
+def test_none_values_are_ignored():
+    encoder = DeadbandEncoder([0.5, 0.5])
+    assert encoder.should_emit([20.0, None], T0)
+    assert not encoder.should_emit([20.2, None], T0 + datetime.timedelta(seconds=2))
+    assert encoder.should_emit([20.2, 40.0], T0 + datetime.timedelta(seconds=4))
+
+
+def test_gap_longer_than_heartbeat_is_nan():
+    times = np.array(['2024-01-01T12:00:00', '2024-01-01T12:05:00', '2024-01-01T12:30:00'],
+                     dtype='datetime64[s]')
+    grid = np.array(['2024-01-01T11:59:00', '2024-01-01T12:04:00', '2024-01-01T12:20:00',
+                     '2024-01-01T12:30:00'], dtype='datetime64[s]')
+    restored = reconstruct(times, [1.0, 2.0, 3.0], grid, max_hold_seconds=310)
+    assert np.isnan(restored[0])
+    assert restored[1] == 1.0
+    assert np.isnan(restored[2])
+    assert restored[3] == 3.0
+    # None 이면 다음 행까지 계속 유지
+    assert reconstruct(times, [1.0, 2.0, 3.0], grid, max_hold_seconds=None)[2] == 2.0
+
+
+def test_reconstruct_arrays_builds_regular_grid():
+    arrays = {
+        'timestamp': np.array(['2024-01-01T12:00:00', '2024-01-01T12:00:10'], dtype='datetime64[s]'),
+        'temperature': np.array([20.0, 21.0]),
+    }
+    restored = reconstruct_arrays(arrays, 2, ['temperature'])
+    assert len(restored['timestamp']) == 6
+    assert restored['temperature'].tolist() == [20.0] * 5 + [21.0]
@@ -0,0 +1,75 @@
+import datetime
+
+from conftest import sheet_rows
+from gspread_fanin import FanInWriter
+from gspread_partition import (PartitionedSheetWriter, PARTITION_BY_DAY, PARTITION_BY_ROWS,
+                               TIME_FORMAT, get_partitions, read_partitions)
+
+T0 = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+
+def make_writer(session, **kwargs):
+    # 백그라운드 flush 없이 flush() / close() 때만 기록
+    writer = FanInWriter(session=session, background=False)
+    return PartitionedSheetWriter('dht', writer=writer, session=session, **kwargs)
+
+
+def put_rows(writer, start, count, step_seconds=60):
+    for i in range(start, start + count):
+        when = T0 + datetime.timedelta(seconds=i * step_seconds)
+        writer.put([when.strftime(TIME_FORMAT), i], when)
+
+
+def index_rows(session):
+    return sheet_rows(session, 'partition_index')[1:]
+
+
+def test_rows_mode_rolls_over_and_closes_index(session):
+    writer = make_writer(session, mode=PARTITION_BY_ROWS, rows_per_partition=3)
+    put_rows(writer, 0, 7)
+    writer.close()
+
+    assert [len(sheet_rows(session, f'dht_p000{n}')) for n in (1, 2, 3)] == [3, 3, 1]
+    # 다음 파티션은 미리 만들어 둠
+    assert session.worksheet('dht_p0004').get_all_values() == []
+    index = index_rows(session)
+    assert [row[1] for row in index] == ['dht_p0001', 'dht_p0002', 'dht_p0003']
+    first = index[0]
+    assert first[2] == T0.strftime(TIME_FORMAT)
+    assert first[3] == (T0 + datetime.timedelta(minutes=2)).strftime(TIME_FORMAT)
+    assert first[4] == '3'
+    # 마지막 파티션은 이어 쓸 수 있도록 end_time 을 비워 둠
+    assert index[-1][3:] == ['', '1']
+
+
+def test_restart_continues_open_partition(session):
+    writer = make_writer(session, mode=PARTITION_BY_ROWS, rows_per_partition=3)
+    put_rows(writer, 0, 4)
+    writer.close()
+
+    writer = make_writer(session, mode=PARTITION_BY_ROWS, rows_per_partition=3)
+    assert writer.partition == 'dht_p0002'
+    assert writer.partition_rows == 1
+    put_rows(writer, 4, 3)
+    writer.close()
+
+    assert [row[1] for row in sheet_rows(session, 'dht_p0002')] == ['3', '4', '5']
+    index = index_rows(session)
+    assert [row[1] for row in index] == ['dht_p0001', 'dht_p0002', 'dht_p0003']
+    # 재시작 전에 기록한 행까지 포함한 행 수와 마지막 시각
+    assert index[1][3] == (T0 + datetime.timedelta(minutes=5)).strftime(TIME_FORMAT)
+    assert index[1][4] == '3'
+
+
+def test_read_partitions_only_reads_overlapping_days(session):
+    writer = make_writer(session, mode=PARTITION_BY_DAY)
+    # 6 시간 간격으로 3 일치
+    put_rows(writer, 0, 12, step_seconds=6 * 3600)
+    writer.close()
+
+    assert get_partitions('dht', session=session) == ['dht_20240101', 'dht_20240102', 'dht_20240103',
+                                                      'dht_20240104']
+    start = datetime.datetime(2024, 1, 2, 6, 0, 0)
+    end = datetime.datetime(2024, 1, 2, 23, 0, 0)
+    assert get_partitions('dht', start, end, session=session) == ['dht_20240102']
+    assert [row[1] for row in read_partitions('dht', start, end, session=session)] == ['3', '4', '5']
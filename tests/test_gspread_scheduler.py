@@ -0,0 +1,93 @@
+import time
+import email.utils
+
+import pytest
+from gspread.exceptions import APIError
+
+from fake_gspread import make_api_error
+from gspread_scheduler import SheetsScheduler, TokenBucket, get_retry_after, get_error_status
+
+
+def failing(errors, result='ok'):
+    """
+    errors 의 오류를 차례로 던진 뒤 result 를 반환하는 함수와 호출 횟수 목록을 만듭니다.
+    """
+    calls = []
+
+    def func():
+        calls.append(time.monotonic())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return func, calls
+
+
+def test_get_retry_after_parses_seconds_and_http_date():
+    assert get_retry_after(make_api_error(429, 'x', 3)) == 3.0
+    assert get_retry_after(make_api_error(429, 'x')) is None
+    assert get_retry_after(make_api_error(429, 'x', 'soon')) is None
+    later = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 28 <= get_retry_after(make_api_error(429, 'x', later)) <= 30
+    assert get_error_status(make_api_error(503, 'x')) == 503
+
+
+def test_429_waits_retry_after_and_pauses_bucket():
+    scheduler = SheetsScheduler(read_quota=6000, write_quota=6000, seed=0)
+    func, calls = failing([make_api_error(429, 'quota', 0.2)])
+    assert scheduler.execute(func, write=True, idempotent=False) == 'ok'
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+    assert scheduler.throttled == 1
+    assert scheduler.retries == 1
+
+
+def test_5xx_is_retried_only_when_idempotent():
+    scheduler = SheetsScheduler(read_quota=6000, write_quota=6000, seed=0)
+    func, calls = failing([make_api_error(503, 'unavailable', 0)])
+    assert scheduler.execute(func) == 'ok'
+    assert scheduler.retries == 1
+    assert scheduler.throttled == 0
+
+    # append 는 서버에서 이미 처리됐을 수 있으므로 5xx 에서 재시도하지 않음
+    func, calls = failing([make_api_error(503, 'unavailable', 0)])
+    with pytest.raises(APIError):
+        scheduler.execute(func, write=True, idempotent=False)
+    assert len(calls) == 1
+
+
+def test_non_retryable_status_and_max_attempts():
+    scheduler = SheetsScheduler(read_quota=6000, write_quota=6000, max_attempts=3, seed=0)
+    func, calls = failing([make_api_error(400, 'bad request')])
+    with pytest.raises(APIError):
+        scheduler.execute(func)
+    assert len(calls) == 1
+
+    func, calls = failing([make_api_error(500, 'error', 0)] * 5)
+    with pytest.raises(APIError):
+        scheduler.execute(func)
+    assert len(calls) == 3
+
+
+def test_session_retries_fake_429(session, client):
+    client.fail_next(1, 429, retry_after=0.1)
+    session.call('s', lambda worksheet: worksheet.append_rows([[1]]), write=True, idempotent=False)
+    assert session.worksheet('s').get_all_values() == [['1']]
+    assert session.scheduler.throttled == 1
+
+
+def test_token_bucket_burst_then_rate():
+    # capacity 2, 채움 속도 (62 - 2) / 60 = 초당 1 개
+    bucket = TokenBucket(62, capacity=2)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0.05)
+    assert bucket.acquire(timeout=2)
+
+
+def test_token_bucket_pause_blocks_all_requests():
+    bucket = TokenBucket(6000)
+    bucket.pause(0.2)
+    start = time.monotonic()
+    assert not bucket.acquire(timeout=0.1)
+    assert bucket.acquire(timeout=1)
+    assert time.monotonic() - start >= 0.2
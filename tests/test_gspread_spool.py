@@ -0,0 +1,60 @@
+from conftest import sheet_rows, wait_until
+from gspread_spool import SampleSpool, SpoolReplayer
+
+
+def test_rows_survive_reopen(tmp_path):
+    path = str(tmp_path / 'spool.db')
+    spool = SampleSpool(path, commit_rows=100)
+    for i in range(5):
+        spool.put('s', [i])
+    # commit_rows 에 못 미친 행도 close() 에서 커밋됨
+    spool.close()
+
+    spool = SampleSpool(path)
+    assert [row for _, row in spool.pending('s')] == [[i] for i in range(5)]
+    spool.close()
+
+
+def test_confirm_and_purge_by_id_range(tmp_path):
+    spool = SampleSpool(str(tmp_path / 'spool.db'))
+    for i in range(30):
+        spool.put('s', [i])
+    ids = [row_id for row_id, _ in spool.pending('s')]
+    spool.confirm(ids[:20])
+    assert spool.count_pending('s') == 10
+
+    spool.purge(keep=5)
+    remaining = [row_id for (row_id,) in spool.conn.execute('SELECT id FROM spool ORDER BY id')]
+    # 확인된 행은 마지막 확인 id 기준 최근 5 개만, 확인되지 않은 행은 모두 남음
+    assert remaining == ids[15:]
+    spool.close()
+
+
+def test_replayer_uploads_after_outage(session, client, tmp_path):
+    spool = SampleSpool(str(tmp_path / 'spool.db'))
+    client.fail_next(1, 503)
+    replayer = SpoolReplayer(spool, 'sp', flush_rows=1, flush_seconds=0.05, retry_seconds=0.05,
+                             session=session)
+    for i in range(4):
+        replayer.put([i])
+    assert wait_until(lambda: spool.count_pending('sp') == 0)
+    assert replayer.close(timeout=5) == 0
+    assert replayer.failures >= 1
+    assert sheet_rows(session, 'sp') == [['0'], ['1'], ['2'], ['3']]
+    assert spool.count_pending('sp') == 0
+    spool.close()
+
+
+def test_replay_on_restart_sends_left_over_rows(session, tmp_path):
+    path = str(tmp_path / 'spool.db')
+    spool = SampleSpool(path)
+    for i in range(3):
+        spool.put('sp', [i])
+    spool.close()
+
+    # 다음 실행: 새 행 없이도 남아 있던 행을 올림
+    spool = SampleSpool(path)
+    replayer = SpoolReplayer(spool, 'sp', flush_seconds=0.05, session=session)
+    assert replayer.close(timeout=5) == 0
+    assert sheet_rows(session, 'sp') == [['0'], ['1'], ['2']]
+    spool.close()
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from conftest import sheet_rows, wait_until
+from gspread_uploader import BackgroundUploader, BLOCK, DROP_OLDEST, AGGREGATE, merge_rows
+
+
+def idle_uploader(session, policy, maxsize=3):
+    # flush 주기와 batch 크기를 크게 잡아 close() 전까지는 업로드하지 않음
+    return BackgroundUploader('up', maxsize=maxsize, policy=policy, batch_rows=100,
+                              flush_seconds=60, retry_seconds=0.05, session=session)
+
+
+def test_merge_rows_averages_numbers_and_keeps_new_text():
+    assert merge_rows(['t1', 10.0, 20.0], ['t2', 20.0, 40.0], 1) == ['t2', 15.0, 30.0]
+    assert merge_rows(['t1', 10.0], ['t2', 40.0], 3) == ['t2', 17.5]
+
+
+def test_uploads_all_rows_in_order(session):
+    uploader = BackgroundUploader('up', batch_rows=5, flush_seconds=0.05, session=session)
+    for i in range(12):
+        assert uploader.put([f't{i}', i])
+    assert uploader.close(timeout=5) == 0
+    assert sheet_rows(session, 'up') == [[f't{i}', str(i)] for i in range(12)]
+    assert uploader.uploaded == 12
+
+
+def test_drop_oldest_keeps_newest_rows(session):
+    uploader = idle_uploader(session, DROP_OLDEST)
+    for i in range(5):
+        uploader.put([i])
+    assert uploader.dropped == 2
+    uploader.close(timeout=5)
+    assert sheet_rows(session, 'up') == [['2'], ['3'], ['4']]
+
+
+def test_aggregate_merges_into_last_row(session):
+    uploader = idle_uploader(session, AGGREGATE)
+    for i in range(5):
+        uploader.put(['t', float(i)])
+    assert uploader.aggregated == 2
+    uploader.close(timeout=5)
+    # 마지막 행은 2, 3, 4 의 평균
+    assert sheet_rows(session, 'up') == [['t', '0.0'], ['t', '1.0'], ['t', '3.0']]
+
+
+def test_block_times_out_when_full(session):
+    uploader = idle_uploader(session, BLOCK, maxsize=2)
+    uploader.put([1])
+    uploader.put([2])
+    assert uploader.put([3], timeout=0.05) is False
+    assert uploader.dropped == 1
+    uploader.close(timeout=5)
+    assert sheet_rows(session, 'up') == [['1'], ['2']]
+
+
+def test_block_wait_interrupted_by_close_does_not_append(session, client):
+    client.fail_next(100, 503)
+    uploader = idle_uploader(session, BLOCK, maxsize=1)
+    uploader.put([1])
+    errors = []
+
+    def blocked_put():
+        try:
+            uploader.put([2])
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=blocked_put)
+    thread.start()
+    thread.join(0.1)
+    uploader.close(timeout=1)
+    thread.join(1)
+    assert errors
+    assert [row for row, _ in uploader.queue] == [[1]]
+
+
+def test_failed_batch_is_requeued_and_retried(session, client):
+    # append 는 5xx 에서 스케줄러가 재시도하지 않으므로 업로더가 행을 되돌려 다시 보냄
+    client.fail_next(1, 503)
+    uploader = BackgroundUploader('up', batch_rows=3, flush_seconds=0.05, retry_seconds=0.05,
+                                  session=session)
+    for i in range(3):
+        uploader.put([i])
+    assert wait_until(lambda: uploader.uploaded == 3)
+    assert uploader.close(timeout=5) == 0
+    assert uploader.failures == 1
+    assert sheet_rows(session, 'up') == [['0'], ['1'], ['2']]
+
+
+def test_unknown_policy_is_rejected(session):
+    with pytest.raises(ValueError):
+        BackgroundUploader('up', policy='nope', session=session)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from online_regression import OnlineLinearRegression
+
+
+def batch_fit(X, y, weights=None):
+    """
+    평균을 뺀 (가중) 최소제곱의 최소 노름 해 (LinearRegression().fit 과 같은 계수)
+    """
+    weights = np.ones(len(y)) if weights is None else weights
+    mean_x = weights @ X / weights.sum()
+    mean_y = weights @ y / weights.sum()
+    root = np.sqrt(weights)[:, None]
+    coef = np.linalg.lstsq(root * (X - mean_x), root[:, 0] * (y - mean_y), rcond=None)[0]
+    return coef, mean_y - mean_x @ coef
+
+
+def make_data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(25, 3, size=(n, 2))
+    y = X @ [0.8, -0.3] + 4.0 + rng.normal(0, 0.1, n)
+    return X, y
+
+
+def fit(model, X, y):
+    for x_row, y_value in zip(X, y):
+        model.update(x_row, y_value)
+    model.predict(X[:1])
+    return model
+
+
+def test_matches_batch_lstsq():
+    X, y = make_data()
+    model = fit(OnlineLinearRegression(2), X, y)
+    coef, intercept = batch_fit(X, y)
+    np.testing.assert_allclose(model.coef_, coef, rtol=1e-8)
+    assert model.intercept_ == pytest.approx(intercept, rel=1e-8)
+    assert len(model) == len(y)
+
+
+def test_window_matches_batch_on_recent_samples():
+    X, y = make_data(250)
+    # 윈도우를 여러 바퀴 돌고 중간에서 끝남
+    model = fit(OnlineLinearRegression(2, window=60), X, y)
+    coef, intercept = batch_fit(X[-60:], y[-60:])
+    np.testing.assert_allclose(model.coef_, coef, rtol=1e-8)
+    assert model.intercept_ == pytest.approx(intercept, rel=1e-8)
+    assert len(model) == 60
+
+
+def test_forgetting_matches_weighted_lstsq():
+    X, y = make_data()
+    model = fit(OnlineLinearRegression(2, forgetting=0.95), X, y)
+    weights = 0.95 ** np.arange(len(y) - 1, -1, -1)
+    coef, intercept = batch_fit(X, y, weights)
+    np.testing.assert_allclose(model.coef_, coef, rtol=1e-8)
+    assert model.intercept_ == pytest.approx(intercept, rel=1e-8)
+
+
+def test_collinear_features_give_min_norm_solution():
+    # DHT11 처럼 두 특성이 한동안 같은 값을 가질 때
+    x = np.repeat(np.arange(20.0, 30.0), 5)
+    X = np.column_stack([x, x])
+    y = 2 * x + 1
+    model = fit(OnlineLinearRegression(2), X, y)
+    np.testing.assert_allclose(model.coef_, [1.0, 1.0], rtol=1e-8)
+    np.testing.assert_allclose(model.predict(X), y, rtol=1e-10)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        OnlineLinearRegression(2, forgetting=0)
+    with pytest.raises(ValueError):
+        OnlineLinearRegression(2, forgetting=0.9, window=10)
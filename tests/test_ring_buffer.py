@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from ring_buffer import ColumnarRingBuffer
+
+
+def test_keeps_most_recent_samples_in_order():
+    buffer = ColumnarRingBuffer(5, ['t', 'v'])
+    for i in range(12):
+        buffer.append([i, i * 10])
+    assert len(buffer) == 5
+    assert buffer.total == 12
+    assert buffer.column('t').tolist() == [7, 8, 9, 10, 11]
+    assert buffer.column('v', 2).tolist() == [100, 110]
+    assert buffer.sample_numbers(3).tolist() == [9, 10, 11]
+    window = buffer.window(4)
+    assert window['t'].tolist() == [8, 9, 10, 11]
+
+
+def test_column_is_a_view():
+    buffer = ColumnarRingBuffer(4, ['t'])
+    for i in range(6):
+        buffer.append(t=i)
+    assert np.shares_memory(buffer.column('t'), buffer.data)
+
+
+def test_named_append_fills_missing_columns():
+    buffer = ColumnarRingBuffer(3, ['t', 'v', 'next'])
+    buffer.append(t=1.0, v=2.0)
+    assert np.isnan(buffer.column('next')[-1])
+    buffer.set('next', 5.0)
+    assert buffer.column('next').tolist() == [5.0]
+
+
+def test_set_by_age_after_wraparound():
+    buffer = ColumnarRingBuffer(3, ['t', 'next'])
+    for i in range(5):
+        buffer.append(t=i)
+    buffer.set('next', 40.0, age=3)
+    assert buffer.column('next')[0] == 40.0
+    assert buffer.column('t').tolist() == [2, 3, 4]
+    with pytest.raises(IndexError):
+        buffer.set('next', 1.0, age=4)
+
+
+def test_partial_fill():
+    buffer = ColumnarRingBuffer(10, ['t'])
+    buffer.append([1.0])
+    buffer.append([2.0])
+    assert buffer.column('t', 5).tolist() == [1.0, 2.0]
+    assert buffer.sample_numbers().tolist() == [0, 1]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        ColumnarRingBuffer(0, ['t'])
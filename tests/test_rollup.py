@@ -0,0 +1,47 @@
+import datetime
+
+import numpy as np
+
+from rollup import WindowAggregator, rollup_header, TIME_FORMAT
+
+T0 = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+
+def test_rollup_header():
+    assert rollup_header(['t']) == ['window_start', 'count', 't_min', 't_mean', 't_max']
+
+
+def test_windows_match_numpy():
+    rng = np.random.default_rng(0)
+    values = rng.normal(25, 3, size=(300, 2))
+    times = [T0 + datetime.timedelta(seconds=2 * i) for i in range(len(values))]
+    aggregator = WindowAggregator(60, num_values=2)
+    rows = [row for row in (aggregator.add(v, t) for v, t in zip(values.tolist(), times)) if row]
+    rows.append(aggregator.flush())
+
+    # 2 초 주기 샘플 300 개 = 60 초 구간 10 개, 구간마다 30 개
+    assert len(rows) == 10
+    for k, row in enumerate(rows):
+        chunk = values[30 * k:30 * (k + 1)]
+        assert row[0] == (T0 + datetime.timedelta(minutes=k)).strftime(TIME_FORMAT)
+        assert row[1] == 30
+        expected = []
+        for column in chunk.T:
+            expected += [column.min(), round(column.mean(), 2), column.max()]
+        np.testing.assert_allclose(row[2:], expected)
+    assert aggregator.flush() is None
+
+
+def test_window_boundary_is_aligned():
+    aggregator = WindowAggregator(60, num_values=1)
+    assert aggregator.add([1.0], T0 + datetime.timedelta(seconds=30)) is None
+    assert aggregator.add([3.0], T0 + datetime.timedelta(seconds=59)) is None
+    row = aggregator.add([5.0], T0 + datetime.timedelta(seconds=60))
+    assert row == [T0.strftime(TIME_FORMAT), 2, 1.0, 2.0, 3.0]
+
+
+def test_none_values_count_but_are_not_aggregated():
+    aggregator = WindowAggregator(60, num_values=2)
+    aggregator.add([1.0, None], T0)
+    aggregator.add([3.0, None], T0)
+    assert aggregator.flush() == [T0.strftime(TIME_FORMAT), 2, 1.0, 2.0, 3.0, '', '', '']
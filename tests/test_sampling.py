@@ -0,0 +1,69 @@
+import pytest
+
+from sampling import PeriodicSampler, SKIP, CATCH_UP
+
+
+class FakeClock:
+    """
+    sleep 하면 그만큼 시간이 흐르는 가짜 시계입니다. work() 로 작업 시간을 흉내 냅니다.
+    """
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    work = sleep
+
+
+def make_sampler(period, policy=SKIP):
+    clock = FakeClock()
+    return PeriodicSampler(period, policy, clock=clock, sleep=clock.sleep), clock
+
+
+def test_deadlines_do_not_drift_with_work_time():
+    sampler, clock = make_sampler(2.0)
+    wakeups = []
+    for _ in range(10):
+        sampler.wait()
+        wakeups.append(clock.now)
+        clock.work(0.7)
+    # 작업 시간과 상관없이 start + k * period 에 깨어남
+    assert wakeups == [100.0 + 2.0 * k for k in range(10)]
+    stats = sampler.stats()
+    assert stats['ticks'] == 10
+    assert stats['missed'] == 0
+    assert stats['max_lateness'] == 0.0
+
+
+def test_skip_jumps_to_next_deadline():
+    sampler, clock = make_sampler(1.0)
+    sampler.wait()
+    clock.work(3.5)
+    # 101, 102, 103 은 놓치고 104 까지 기다리지 않고 바로 실행된 뒤 다음은 105
+    assert sampler.wait() == pytest.approx(2.5)
+    assert sampler.missed == 2
+    assert sampler.next_deadline() == 104.0
+    sampler.wait()
+    assert clock.now == 104.0
+
+
+def test_catch_up_runs_missed_samples_back_to_back():
+    sampler, clock = make_sampler(1.0, CATCH_UP)
+    sampler.wait()
+    clock.work(3.5)
+    lateness = [sampler.wait() for _ in range(4)]
+    assert lateness == pytest.approx([2.5, 1.5, 0.5, 0.0])
+    assert clock.now == 104.0
+    assert sampler.ticks == 5
+    # 한 주기 이상 늦게 실행된 샘플 수
+    assert sampler.missed == 2
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        PeriodicSampler(1.0, 'later')